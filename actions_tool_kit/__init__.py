@@ -10,9 +10,9 @@ except Exception:
 # Safe import of context and client factory
 try:
     from .context import context
-    from .github_client import get_github_client
+    from .github_client import get_github_client, get_shared_github_client
 
-    __all__ += ["context", "get_github_client"]
+    __all__ += ["context", "get_github_client", "get_shared_github_client"]
 except ImportError:
     # Allow unit tests to run even if GitHub context/client aren't needed
     pass
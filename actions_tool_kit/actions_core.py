@@ -4,9 +4,77 @@
 from __future__ import annotations
 
 import os
+import re
 import sys
+import tempfile
+import threading
 from contextlib import contextmanager
-from typing import Any, ContextManager, Iterable, Optional, Union
+from contextvars import ContextVar
+from typing import Any, Callable, ContextManager, Dict, Iterable, Iterator, Optional, Protocol, Union
+
+from .runner_env import RunnerEnvironment, runner_env
+
+# Task buffers are kept in memory up to this size, then spilled to a temp file.
+TASK_LOG_MEMORY_LIMIT = 1024 * 1024
+
+_stdout_lock = threading.Lock()
+
+# Name of the open top-level ``::group::``, for tools that tag work by step section.
+_current_group: Optional[str] = None
+
+# Optional ``(command, message, props) -> bool`` gate for log commands (see ``log_limits``).
+_log_filter: Optional[Callable[[str, str, Dict[str, Any]], bool]] = None
+
+
+class _Spill(Protocol):
+    """Hook that moves oversized outputs and summaries to files (see ``spill.SpillOver``)."""
+
+    def output(self, name: str, value: str) -> str: ...
+
+    def summary(self, body: str, path: Optional[str]) -> str: ...
+
+
+# Optional spill-over consulted by ``set_output`` and ``append_summary`` (see ``spill``).
+_spill: Optional[_Spill] = None
+
+
+class _TaskLog:
+    """Output buffered for one ``task_log`` scope."""
+
+    def __init__(self, name: str, max_memory: int) -> None:
+        self.name = name
+        self.lock = threading.Lock()
+        self.file = tempfile.SpooledTemporaryFile(
+            max_size=max_memory, mode="w+", encoding="utf-8", newline=""
+        )
+        self.empty = True
+        self.newline = True
+
+    def write(self, text: str) -> None:
+        if not text:
+            return
+        with self.lock:
+            self.file.write(text)
+            self.empty = False
+            self.newline = text.endswith("\n")
+
+
+_task_log: ContextVar[Optional[_TaskLog]] = ContextVar("actions_task_log", default=None)
+
+
+def _write(text: str) -> None:
+    """Write log text to the current task buffer, or atomically to stdout.
+
+    Args:
+        text: Text to write, including its trailing newline.
+    """
+    buffer = _task_log.get()
+    if buffer is not None:
+        buffer.write(text)
+        return
+    with _stdout_lock:
+        sys.stdout.write(text)
+        sys.stdout.flush()
 
 
 def _file_from_env(var: str) -> Optional[str]:
@@ -80,10 +148,9 @@ def _cmd(command: str, message: str = "", **props: Any) -> None:
         message: Optional message body.
         **props: Optional command properties such as title=, file=, line=.
     """
-    sys.stdout.write(
-        f"::{command}{_serialize_props(**props)}::{_escape_msg(message)}\n"
-    )
-    sys.stdout.flush()
+    if _log_filter is not None and not _log_filter(command, message, props):
+        return
+    _write(f"::{command}{_serialize_props(**props)}::{_escape_msg(message)}\n")
 
 
 # ---------- inputs ----------
@@ -153,6 +220,8 @@ def set_output(name: str, value: Union[str, int, float, bool]) -> None:
         value: Output value; will be stringified.
     """
     v = str(value)
+    if _spill is not None:
+        v = _spill.output(name, v)
     path: Optional[str] = _file_from_env("GITHUB_OUTPUT")
     if not path:
         _cmd("set-output", f"{name}={v}")  # legacy/local fallback
@@ -223,13 +292,48 @@ def get_state(name: str) -> str:
     return os.getenv(f"STATE_{name}", "")
 
 
+_secrets: set[str] = set()
+_mask_pattern: Optional[re.Pattern[str]] = None
+
+
 def set_secret(secret: str) -> None:
     """Mask a secret in the logs using 'add-mask' command.
 
+    The value (and each of its lines) is also remembered so toolkit helpers can
+    mask text that does not pass through the runner, such as captured output.
+    The command always goes straight to stdout, even inside a ``task_log``
+    scope, so the runner masks the secret before any buffered line reaches it.
+
     Args:
         secret: The sensitive string to mask.
     """
-    _cmd("add-mask", secret)
+    global _mask_pattern
+    with _stdout_lock:
+        sys.stdout.write(f"::add-mask::{_escape_msg(secret)}\n")
+        sys.stdout.flush()
+    parts = {secret, *secret.splitlines()} - {""}
+    if not parts <= _secrets:
+        _secrets.update(parts)
+        _mask_pattern = None
+
+
+def _mask(text: str) -> str:
+    """Replace every registered secret in text with '***', as the runner does.
+
+    Args:
+        text: Text to mask.
+
+    Returns:
+        The masked text.
+    """
+    global _mask_pattern
+    if not _secrets:
+        return text
+    pattern = _mask_pattern
+    if pattern is None:
+        alternatives = sorted(_secrets, key=len, reverse=True)
+        pattern = _mask_pattern = re.compile("|".join(map(re.escape, alternatives)))
+    return pattern.sub("***", text)
 
 
 def append_summary(markdown: Union[str, Iterable[str]]) -> None:
@@ -244,22 +348,63 @@ def append_summary(markdown: Union[str, Iterable[str]]) -> None:
     """
     body: str = "".join(markdown) if not isinstance(markdown, str) else markdown
     path: Optional[str] = _file_from_env("GITHUB_STEP_SUMMARY")
+    if _spill is not None:
+        body = _spill.summary(body, path)
     if not path:
-        sys.stdout.write(
+        _write(
             "\n--- STEP SUMMARY (local) ---\n"
             + body
             + "\n----------------------------\n"
         )
-        sys.stdout.flush()
         return
     with open(path, "a", encoding="utf-8") as f:
         f.write(body)
 
 
 # ---------- logging / annotations ----------
-def debug(message: Union[str, Any]) -> None:
-    """Emit a debug annotation (visible when step debug is enabled)."""
-    _cmd("debug", str(message))
+def info(message: Union[str, Any]) -> None:
+    """Write a plain log line (captured by an enclosing ``task_log``)."""
+    if _log_filter is not None and not _log_filter("info", str(message), {}):
+        return
+    _write(f"{message}\n")
+
+
+def _read_debug_flag(env: Optional[RunnerEnvironment] = None) -> bool:
+    # The runner sets RUNNER_DEBUG=1 when step debug logging is on and discards
+    # ::debug:: lines otherwise; outside Actions nothing filters them.
+    env = env or RunnerEnvironment.from_environ()
+    return env.debug or not env.is_actions
+
+
+_debug_enabled: bool = _read_debug_flag(runner_env())
+
+
+def is_debug() -> bool:
+    """Return True if debug output is shown (``RUNNER_DEBUG=1``, or a local run).
+
+    Note:
+        The environment is read once, at import.
+    """
+    return _debug_enabled
+
+
+def debug(message: Union[str, Any], *args: Any) -> None:
+    """Emit a debug annotation (visible when step debug is enabled).
+
+    When debug output is off the call returns after one check, so expensive
+    messages should be passed lazily: as a callable, or as a ``%``-format
+    string with ``args`` (``debug("state: %r", big)``); neither is evaluated.
+
+    Args:
+        message: Message, ``%``-format string, or zero-argument callable returning the message.
+        *args: Values interpolated into ``message`` with ``%``.
+    """
+    if not _debug_enabled:
+        return
+    if callable(message):
+        message = message()
+    text = str(message) % args if args else str(message)
+    _cmd("debug", text)
 
 
 def notice(
@@ -335,13 +480,59 @@ def fail_action(message: Union[str, Any]) -> None:
     raise SystemExit(1)
 
 # ---------- groups ----------
+def _write_group(name: str, chunks: Iterable[str]) -> None:
+    """Write a complete group block (a heading inside a ``task_log`` scope).
+
+    The body is written chunk by chunk while holding the stdout lock, so it
+    stays contiguous without being joined into one string first.
+
+    Args:
+        name: Group title.
+        chunks: Group content.
+    """
+    buffer = _task_log.get()
+    if buffer is not None:
+        buffer.write(f"\u25b6 {name}\n")
+        last = "\n"
+        for chunk in chunks:
+            if chunk:
+                buffer.write(chunk)
+                last = chunk
+        if not last.endswith("\n"):
+            buffer.write("\n")
+        return
+    with _stdout_lock:
+        sys.stdout.write(f"::group::{_escape_msg(name)}\n")
+        last = "\n"
+        for chunk in chunks:
+            if chunk:
+                sys.stdout.write(chunk)
+                last = chunk
+        sys.stdout.write(("" if last.endswith("\n") else "\n") + "::endgroup::\n")
+        sys.stdout.flush()
+
+
 def start_group(name: str) -> None:
-    """Start a collapsible log group with the given name."""
+    """Start a collapsible log group with the given name.
+
+    Note:
+        The runner does not nest groups, so inside a ``task_log`` scope (which
+        is itself flushed as a group) this writes a plain heading line.
+    """
+    global _current_group
+    if _task_log.get() is not None:
+        _write(f"\u25b6 {name}\n")
+        return
+    _current_group = name
     _cmd("group", name)
 
 
 def end_group() -> None:
     """End the current collapsible log group."""
+    global _current_group
+    if _task_log.get() is not None:
+        return
+    _current_group = None
     _cmd("endgroup")
 
 
@@ -360,6 +551,65 @@ def group(name: str) -> ContextManager[None]:
         end_group()
 
 
+@contextmanager
+def task_log(name: str, *, max_memory: int = TASK_LOG_MEMORY_LIMIT) -> Iterator[None]:
+    """Buffer this thread's or asyncio task's log output and flush it as one group.
+
+    Every emitter in this module (``info``, ``debug``, ``notice``, ``group`` ...)
+    called inside the scope writes to a buffer bound to the current context
+    instead of stdout. When the scope ends the buffer is written as a single
+    ``::group::name`` block while holding the stdout lock, so output from
+    parallel tasks never interleaves. Buffers larger than ``max_memory`` bytes
+    spill to a temporary file. A nested scope is flushed into its parent
+    under a heading line.
+
+    Note:
+        Plain ``print`` calls are not captured; use ``info`` instead. Threads do
+        not inherit the scope, so open one inside each worker.
+
+    Example:
+        async def check(pkg):
+            with task_log(f"check {pkg}"):
+                info("running")
+                ...
+
+    Args:
+        name: Group title used when the buffer is flushed.
+        max_memory: Bytes kept in memory before spilling to disk.
+    """
+    buffer = _TaskLog(name, max_memory)
+    token = _task_log.set(buffer)
+    try:
+        yield
+    finally:
+        _task_log.reset(token)
+        _flush_task_log(buffer)
+
+
+def _flush_task_log(buffer: _TaskLog) -> None:
+    """Write a finished task buffer to its parent scope or, atomically, to stdout."""
+    f = buffer.file
+    with buffer.lock:
+        f.seek(0)
+        parent = _task_log.get()
+        if parent is not None:
+            if not buffer.empty:
+                # Groups do not nest; mark the inner scope with a heading, as ``group`` does.
+                parent.write(f"\u25b6 {buffer.name}\n")
+                for chunk in iter(lambda: f.read(65536), ""):
+                    parent.write(chunk)
+                if not buffer.newline:
+                    parent.write("\n")
+        elif not buffer.empty:
+            with _stdout_lock:
+                sys.stdout.write(f"::group::{_escape_msg(buffer.name)}\n")
+                for chunk in iter(lambda: f.read(65536), ""):
+                    sys.stdout.write(chunk)
+                sys.stdout.write(("" if buffer.newline else "\n") + "::endgroup::\n")
+                sys.stdout.flush()
+        f.close()
+
+
 __all__ = [
     "get_input",
     "get_boolean_input",
@@ -370,6 +620,8 @@ __all__ = [
     "get_state",
     "set_secret",
     "append_summary",
+    "info",
+    "is_debug",
     "debug",
     "notice",
     "warning",
@@ -379,4 +631,5 @@ __all__ = [
     "start_group",
     "end_group",
     "group",
+    "task_log",
 ]
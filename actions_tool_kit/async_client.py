@@ -0,0 +1,264 @@
+import asyncio
+import functools
+import weakref
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, AsyncIterator, Deque, Dict, List, Optional, Union
+from urllib.parse import parse_qs, urlparse
+
+import requests
+from requests.adapters import BaseAdapter
+from github import Consts, GithubException
+
+from .coalesce import RequestMemo
+from .github_client import adapter_wrappers
+from .http_cache import DiskCache
+from .rate_limit import RateLimitScheduler
+from .runner_env import runner_env
+
+
+class AsyncGitHubClient:
+    """
+    Minimal asyncio client for the GitHub REST API.
+
+    Requests go through a pooled ``requests.Session`` on a dedicated thread
+    pool, so the toolkit needs no extra HTTP dependency while callers still get
+    coroutines and concurrent page fetches. The ``http_cache``, ``rate_limit``
+    and ``memoize`` options install the same transport layers as
+    ``get_github_client``.
+
+    Use as an async context manager, or call ``close()`` when done.
+
+    Attributes:
+        base_url (str): REST API root.
+        per_page (int): Default page size for ``paginate``.
+        max_concurrency (int): Maximum number of requests in flight.
+    """
+
+    def __init__(
+        self,
+        token: str,
+        *,
+        base_url: str = Consts.DEFAULT_BASE_URL,
+        per_page: int = 100,
+        max_concurrency: int = 8,
+        timeout: float = Consts.DEFAULT_TIMEOUT,
+        user_agent: str = Consts.DEFAULT_USER_AGENT,
+        http_cache: Union[bool, str, DiskCache, None] = None,
+        rate_limit: Union[bool, RateLimitScheduler, None] = None,
+        memoize: Union[bool, RequestMemo, None] = None,
+    ) -> None:
+        self.base_url = base_url.rstrip("/")
+        self.per_page = per_page
+        self.max_concurrency = max_concurrency
+        self._timeout = timeout
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_concurrency, thread_name_prefix="gh-async"
+        )
+        # One semaphore per event loop: asyncio primitives bind to the loop that first waits on them.
+        self._semaphores: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]" = (
+            weakref.WeakKeyDictionary()
+        )
+
+        self._session = requests.Session()
+        self._session.headers.update(
+            {
+                "Authorization": f"token {token}",
+                "Accept": "application/vnd.github+json",
+                "User-Agent": user_agent,
+            }
+        )
+        adapter: BaseAdapter = requests.adapters.HTTPAdapter(
+            pool_connections=max_concurrency, pool_maxsize=max_concurrency
+        )
+        wrappers = adapter_wrappers(
+            http_cache=http_cache, rate_limit=rate_limit, memoize=memoize
+        )
+        for wrap in wrappers:
+            adapter = wrap(adapter)
+        prefix = f"{urlparse(self.base_url).scheme}://"
+        self._session.mount(prefix, adapter)
+
+    async def __aenter__(self) -> "AsyncGitHubClient":
+        return self
+
+    async def __aexit__(self, *exc: Any) -> None:
+        await self.close()
+
+    async def close(self) -> None:
+        """Close the HTTP session and the worker threads."""
+        self._session.close()
+        self._executor.shutdown(wait=False)
+
+    def _limit(self) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        semaphore = self._semaphores.get(loop)
+        if semaphore is None:
+            semaphore = self._semaphores[loop] = asyncio.Semaphore(self.max_concurrency)
+        return semaphore
+
+    def _url(self, path: str) -> str:
+        return path if "://" in path else f"{self.base_url}/{path.lstrip('/')}"
+
+    async def request(
+        self,
+        method: str,
+        path: str,
+        *,
+        params: Optional[Dict[str, Any]] = None,
+        json: Any = None,
+    ) -> requests.Response:
+        """
+        Send one request, bounded by ``max_concurrency``.
+
+        Args:
+            method (str): HTTP verb.
+            path (str): API path (``/repos/o/r``) or absolute URL.
+            params (Dict[str, Any] | None): Query parameters.
+            json (Any): JSON request body.
+
+        Returns:
+            requests.Response: The successful response.
+
+        Raises:
+            GithubException: If the API answers with a 4xx/5xx status.
+        """
+        call = functools.partial(
+            self._session.request,
+            method,
+            self._url(path),
+            params=params,
+            json=json,
+            timeout=self._timeout,
+        )
+        async with self._limit():
+            response = await asyncio.get_running_loop().run_in_executor(
+                self._executor, call
+            )
+        if response.status_code >= 400:
+            try:
+                data = response.json()
+            except ValueError:
+                data = response.text
+            raise GithubException(response.status_code, data, dict(response.headers))
+        return response
+
+    async def get(self, path: str, params: Optional[Dict[str, Any]] = None) -> Any:
+        """
+        GET a resource and return its decoded JSON body.
+
+        Args:
+            path (str): API path or absolute URL.
+            params (Dict[str, Any] | None): Query parameters.
+
+        Returns:
+            Any: Decoded JSON.
+        """
+        response = await self.request("GET", path, params=params)
+        return response.json()
+
+    @staticmethod
+    def _last_page(response: requests.Response) -> Optional[int]:
+        last = response.links.get("last", {}).get("url")
+        values = parse_qs(urlparse(last).query).get("page") if last else None
+        try:
+            return int(values[0]) if values else None
+        except ValueError:
+            return None  # cursor-paginated endpoints link to an opaque position
+
+    @staticmethod
+    def _items(response: requests.Response, item_key: Optional[str]) -> List[Any]:
+        data = response.json()
+        items: List[Any] = data[item_key] if item_key else data
+        return items
+
+    async def paginate(
+        self,
+        path: str,
+        params: Optional[Dict[str, Any]] = None,
+        *,
+        item_key: Optional[str] = None,
+    ) -> AsyncIterator[Any]:
+        """
+        Stream every item of a paginated list endpoint.
+
+        The first page is fetched alone; once its ``Link: rel="last"`` header
+        reveals the page count, the remaining pages are fetched concurrently
+        (at most ``2 * max_concurrency`` pages ahead of the consumer) and items
+        are yielded in page order. Endpoints without a numbered ``last`` link
+        (such as cursor-paginated ones) are followed sequentially through
+        ``rel="next"``.
+
+        Example:
+            async for f in client.paginate("/repos/o/r/pulls/1/files"):
+                print(f["filename"])
+
+        Args:
+            path (str): API path or absolute URL of the list endpoint.
+            params (Dict[str, Any] | None): Query parameters (``per_page`` defaults to ``self.per_page``).
+            item_key (str | None): Key holding the list for wrapped responses
+                (e.g. ``"items"`` for search, ``"workflow_runs"``).
+
+        Yields:
+            Any: Decoded items.
+        """
+        query: Dict[str, Any] = {"per_page": self.per_page, **(params or {})}
+        first = await self.request("GET", path, params=query)
+        for item in self._items(first, item_key):
+            yield item
+
+        last_page = self._last_page(first)
+        if last_page is None:
+            next_url = first.links.get("next", {}).get("url")
+            while next_url:
+                response = await self.request("GET", next_url)
+                for item in self._items(response, item_key):
+                    yield item
+                next_url = response.links.get("next", {}).get("url")
+            return
+
+        pages = iter(range(2, last_page + 1))
+        window: Deque["asyncio.Future[requests.Response]"] = deque()
+
+        def schedule() -> None:
+            while len(window) < 2 * self.max_concurrency:
+                page = next(pages, None)
+                if page is None:
+                    return
+                window.append(
+                    asyncio.ensure_future(
+                        self.request("GET", path, params={**query, "page": page})
+                    )
+                )
+
+        schedule()
+        try:
+            while window:
+                response = await window.popleft()
+                schedule()
+                for item in self._items(response, item_key):
+                    yield item
+        finally:
+            for task in window:
+                task.cancel()
+
+
+def get_async_github_client(token: str, **options: Any) -> AsyncGitHubClient:
+    """
+    Returns an authenticated asyncio GitHub client.
+
+    Required:
+        - token: GitHub token (PAT or GitHub Actions token)
+
+    Optional keyword arguments:
+        - base_url: str (defaults to ``GITHUB_API_URL``)
+        - per_page: int
+        - max_concurrency: int
+        - timeout: float
+        - user_agent: str
+        - http_cache: bool | str | DiskCache
+        - rate_limit: bool | RateLimitScheduler
+        - memoize: bool | RequestMemo
+    """
+    options.setdefault("base_url", runner_env().api_url)
+    return AsyncGitHubClient(token, **options)
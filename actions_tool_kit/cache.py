@@ -0,0 +1,679 @@
+import gzip
+import hashlib
+import importlib
+import json
+import lzma
+import os
+import stat
+import tempfile
+from abc import ABC, abstractmethod
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Callable, Deque, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+zstandard: Any
+try:
+    zstandard = importlib.import_module("zstandard")
+except ImportError:  # pragma: no cover - optional dependency
+    zstandard = None
+
+DEFAULT_CHUNK_SIZE = 8 * 1024 * 1024
+MANIFEST_VERSION = 1
+
+_LEVELS = {"gzip": 6, "lzma": 6, "zstd": 3, "none": 0}
+_EXTENSIONS = {"gzip": "gz", "lzma": "xz", "zstd": "zst", "none": "raw"}
+
+# Small files are packed together so one worker task moves roughly one chunk.
+_MAX_SEGMENTS_PER_TASK = 256
+
+_Segment = Tuple[Any, ...]
+
+
+@dataclass
+class CacheStats:
+    """
+    Outcome of a cache save or restore.
+
+    Attributes:
+        key (str): The saved key, or the key that was restored.
+        files (int): Regular files covered by the cache.
+        bytes (int): Uncompressed size of those files.
+        transferred_bytes (int): Compressed bytes written to (save) or read
+            from (restore) the backend.
+        reused_files (int): Save: files whose hashes were reused without
+            reading them. Restore: files already up to date on disk.
+    """
+
+    key: str
+    files: int = 0
+    bytes: int = 0
+    transferred_bytes: int = 0
+    reused_files: int = 0
+
+
+def available_codecs() -> List[str]:
+    """
+    Return the compression codecs usable in this environment.
+
+    Returns:
+        List[str]: ``gzip``, ``lzma`` and ``none``, plus ``zstd`` when the
+        ``zstandard`` package is installed.
+    """
+    codecs = ["gzip", "lzma", "none"]
+    if zstandard is not None:
+        codecs.insert(0, "zstd")
+    return codecs
+
+
+def default_codec() -> str:
+    """Return ``zstd`` when available, otherwise ``gzip``."""
+    return "zstd" if zstandard is not None else "gzip"
+
+
+def _check_codec(codec: str) -> None:
+    if codec not in _LEVELS:
+        raise ValueError(f"Unknown cache codec: {codec!r}")
+    if codec == "zstd" and zstandard is None:
+        raise RuntimeError("The zstd codec requires the 'zstandard' package")
+
+
+def _compress(codec: str, level: int, data: bytes) -> bytes:
+    if codec == "gzip":
+        return gzip.compress(data, compresslevel=level, mtime=0)
+    if codec == "lzma":
+        return lzma.compress(data, preset=level)
+    if codec == "zstd":
+        compressed: bytes = zstandard.ZstdCompressor(level=level).compress(data)
+        return compressed
+    return data
+
+
+def _decompress(codec: str, data: bytes) -> bytes:
+    if codec == "gzip":
+        return gzip.decompress(data)
+    if codec == "lzma":
+        return lzma.decompress(data)
+    if codec == "zstd":
+        decompressed: bytes = zstandard.ZstdDecompressor().decompress(data)
+        return decompressed
+    return data
+
+
+def _blob_name(digest: str, codec: str) -> str:
+    return f"{digest}.{_EXTENSIONS[codec]}"
+
+
+def _replace_atomically(path: str, data: bytes) -> None:
+    directory = os.path.dirname(path)
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+
+class CacheBackend(ABC):
+    """
+    Storage interface for ``save_cache`` / ``restore_cache``.
+
+    A backend stores immutable, content-addressed blobs and one manifest per
+    key. Blobs are read and written from worker processes, so implementations
+    must be picklable and safe to use from several processes at once.
+    """
+
+    @abstractmethod
+    def has_blob(self, name: str) -> bool:
+        """Return True if the blob ``name`` is stored."""
+
+    @abstractmethod
+    def read_blob(self, name: str) -> bytes:
+        """Return the stored bytes of blob ``name``."""
+
+    @abstractmethod
+    def write_blob(self, name: str, data: bytes) -> None:
+        """Store blob ``name`` (a no-op if it already exists)."""
+
+    @abstractmethod
+    def read_manifest(self, key: str) -> Optional[bytes]:
+        """Return the manifest stored under ``key``, or None."""
+
+    @abstractmethod
+    def write_manifest(self, key: str, data: bytes) -> None:
+        """Store the manifest for ``key``."""
+
+    @abstractmethod
+    def list_keys(self, prefix: str) -> List[str]:
+        """Return the keys starting with ``prefix``, most recently saved first."""
+
+
+def default_backend_dir() -> str:
+    """
+    Return the default directory of ``LocalDirectoryBackend``.
+
+    Returns:
+        str: ``$RUNNER_TOOL_CACHE/actions-cache`` (kept across jobs on
+        self-hosted runners), or a directory under the system temp dir.
+    """
+    base = os.getenv("RUNNER_TOOL_CACHE") or tempfile.gettempdir()
+    return os.path.join(base, "actions-cache")
+
+
+class LocalDirectoryBackend(CacheBackend):
+    """
+    Backend storing blobs and manifests in a local (or network-mounted) directory.
+
+    Layout: ``blobs/<ab>/<digest>.<ext>`` and ``manifests/<sha256(key)>.{json.gz,key}``.
+    All writes go through a temporary file and ``os.replace``, so concurrent
+    writers never expose partial files.
+
+    Attributes:
+        directory (str): Root directory of the store.
+    """
+
+    def __init__(self, directory: Optional[str] = None) -> None:
+        self.directory = directory or default_backend_dir()
+
+    def _blob_path(self, name: str) -> str:
+        return os.path.join(self.directory, "blobs", name[:2], name)
+
+    def _manifest_path(self, key: str, suffix: str) -> str:
+        digest = hashlib.sha256(key.encode("utf-8")).hexdigest()
+        return os.path.join(self.directory, "manifests", digest + suffix)
+
+    def has_blob(self, name: str) -> bool:
+        return os.path.exists(self._blob_path(name))
+
+    def read_blob(self, name: str) -> bytes:
+        with open(self._blob_path(name), "rb") as f:
+            return f.read()
+
+    def write_blob(self, name: str, data: bytes) -> None:
+        path = self._blob_path(name)
+        if not os.path.exists(path):
+            _replace_atomically(path, data)
+
+    def read_manifest(self, key: str) -> Optional[bytes]:
+        try:
+            with open(self._manifest_path(key, ".json.gz"), "rb") as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+
+    def write_manifest(self, key: str, data: bytes) -> None:
+        _replace_atomically(self._manifest_path(key, ".json.gz"), data)
+        # The key file is written last: it is what makes the entry discoverable.
+        _replace_atomically(self._manifest_path(key, ".key"), key.encode("utf-8"))
+
+    def list_keys(self, prefix: str) -> List[str]:
+        directory = os.path.join(self.directory, "manifests")
+        try:
+            names = [n for n in os.listdir(directory) if n.endswith(".key")]
+        except FileNotFoundError:
+            return []
+        found: List[Tuple[float, str]] = []
+        for name in names:
+            path = os.path.join(directory, name)
+            try:
+                with open(path, "rb") as f:
+                    key = f.read().decode("utf-8")
+                mtime = os.stat(path).st_mtime
+            except OSError:
+                continue
+            if key.startswith(prefix):
+                found.append((mtime, key))
+        return [key for _, key in sorted(found, reverse=True)]
+
+
+# ---------- manifests ----------
+
+
+def _version(paths: List[str]) -> str:
+    """Scope keys by the cached paths, like ``actions/cache`` does."""
+    digest = hashlib.sha256(json.dumps(paths).encode("utf-8")).hexdigest()
+    return digest[:16]
+
+
+def _encode_manifest(manifest: Dict[str, Any]) -> bytes:
+    data = json.dumps(manifest, separators=(",", ":")).encode("utf-8")
+    return gzip.compress(data, compresslevel=6, mtime=0)
+
+
+def _decode_manifest(data: bytes) -> Dict[str, Any]:
+    manifest: Dict[str, Any] = json.loads(gzip.decompress(data))
+    if manifest.get("version") != MANIFEST_VERSION:
+        raise ValueError(f"Unsupported cache manifest version: {manifest.get('version')!r}")
+    return manifest
+
+
+def _state_path(version: str) -> str:
+    """Local copy of the last manifest saved or restored for these paths in this job."""
+    base = os.getenv("RUNNER_TEMP") or tempfile.gettempdir()
+    return os.path.join(base, "actions-cache-state", version + ".json.gz")
+
+
+def _load_state(version: str) -> Optional[Dict[str, Any]]:
+    try:
+        with open(_state_path(version), "rb") as f:
+            return _decode_manifest(f.read())
+    except (OSError, ValueError):
+        return None
+
+
+def _root(path: str) -> str:
+    return os.path.expanduser(path)
+
+
+def _destination(paths: List[str], entry: Dict[str, Any]) -> str:
+    rel = entry["path"]
+    parts = rel.split("/") if rel else []
+    if rel.startswith("/") or ".." in parts:
+        raise ValueError(f"Refusing to restore unsafe path {rel!r}")
+    root = _root(paths[entry["root"]])
+    return os.path.join(root, *parts) if parts else root
+
+
+def _check_parent(paths: List[str], entry: Dict[str, Any], dest: str, checked: Optional[Set[str]] = None) -> None:
+    """
+    Refuse entries whose parent directory resolves, through symlinks on disk, outside their root.
+
+    Raises:
+        ValueError: If ``dest`` would be written outside its root.
+    """
+    if not entry["path"]:
+        return
+    parent = os.path.dirname(dest)
+    if checked is not None and parent in checked:
+        return
+    root = os.path.realpath(_root(paths[entry["root"]]))
+    real = os.path.realpath(parent)
+    if real != root and not real.startswith(root.rstrip(os.sep) + os.sep):
+        raise ValueError(f"Refusing to restore {entry['path']!r} through a symlink leaving {root}")
+    if checked is not None:
+        checked.add(parent)
+
+
+def _scan(paths: List[str]) -> Iterator[Tuple[Dict[str, Any], str]]:
+    """Yield ``(entry, absolute path)`` for everything under ``paths``, without following symlinks."""
+    for index, path in enumerate(paths):
+        top = _root(path)
+        try:
+            st = os.lstat(top)
+        except FileNotFoundError:
+            continue
+        if not stat.S_ISDIR(st.st_mode):
+            entry = _entry(index, "", top, st)
+            if entry is not None:
+                yield entry, top
+            continue
+
+        stack = [""]
+        while stack:
+            rel = stack.pop()
+            current = os.path.join(top, *rel.split("/")) if rel else top
+            yield {"root": index, "path": rel, "type": "dir"}, current
+            with os.scandir(current) as it:
+                children = sorted(it, key=lambda d: d.name)
+            for child in reversed(children):
+                child_rel = f"{rel}/{child.name}" if rel else child.name
+                child_st = child.stat(follow_symlinks=False)
+                if stat.S_ISDIR(child_st.st_mode):
+                    stack.append(child_rel)
+                    continue
+                entry = _entry(index, child_rel, child.path, child_st)
+                if entry is not None:
+                    yield entry, child.path
+
+
+def _entry(index: int, rel: str, path: str, st: os.stat_result) -> Optional[Dict[str, Any]]:
+    if stat.S_ISLNK(st.st_mode):
+        return {"root": index, "path": rel, "type": "symlink", "target": os.readlink(path)}
+    if stat.S_ISREG(st.st_mode):
+        return {
+            "root": index,
+            "path": rel,
+            "type": "file",
+            "mode": stat.S_IMODE(st.st_mode),
+            "size": st.st_size,
+            "mtime_ns": st.st_mtime_ns,
+        }
+    return None  # sockets, fifos and devices are not cached
+
+
+# ---------- worker tasks ----------
+
+
+def _pack_segments(
+    backend: CacheBackend, codec: str, level: int, segments: List[_Segment]
+) -> List[Tuple[str, int]]:
+    """Hash each ``(path, offset, length)`` segment and upload the missing blobs.
+
+    Runs inside pool workers. Returns ``(digest, compressed bytes written)`` per segment.
+    """
+    results = []
+    for path, offset, length in segments:
+        with open(path, "rb") as f:
+            f.seek(offset)
+            data = f.read(length)
+        digest = hashlib.sha256(data).hexdigest()
+        name = _blob_name(digest, codec)
+        written = 0
+        if not backend.has_blob(name):
+            blob = _compress(codec, level, data)
+            backend.write_blob(name, blob)
+            written = len(blob)
+        results.append((digest, written))
+    return results
+
+
+def _unpack_segments(backend: CacheBackend, codec: str, segments: List[_Segment]) -> int:
+    """Write each ``(path, offset, blob name)`` segment into its pre-sized file.
+
+    Runs inside pool workers. Returns the number of compressed bytes read.
+    """
+    read = 0
+    for path, offset, name in segments:
+        blob = backend.read_blob(name)
+        read += len(blob)
+        with open(path, "r+b") as f:
+            f.seek(offset)
+            f.write(_decompress(codec, blob))
+    return read
+
+
+def _tasks(segments: Iterable[Tuple[_Segment, int]], chunk_size: int) -> Iterator[List[_Segment]]:
+    """Group ``(segment, size)`` pairs into tasks of about one chunk each."""
+    task: List[_Segment] = []
+    size = 0
+    for segment, length in segments:
+        task.append(segment)
+        size += length
+        if size >= chunk_size or len(task) >= _MAX_SEGMENTS_PER_TASK:
+            yield task
+            task, size = [], 0
+    if task:
+        yield task
+
+
+def _run(
+    fn: Callable[..., Any], args: Tuple[Any, ...], tasks: Iterable[List[_Segment]], workers: int
+) -> Iterator[Any]:
+    """Run ``fn(*args, task)`` for every task, in order, with at most ``2 * workers`` in flight."""
+    if workers <= 1:
+        for task in tasks:
+            yield fn(*args, task)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        queue: Deque[Future] = deque()
+        for task in tasks:
+            queue.append(pool.submit(fn, *args, task))
+            if len(queue) >= 2 * workers:
+                yield queue.popleft().result()
+        while queue:
+            yield queue.popleft().result()
+
+
+# ---------- public API ----------
+
+
+def save_cache(
+    paths: Iterable[str],
+    key: str,
+    *,
+    backend: Optional[CacheBackend] = None,
+    codec: Optional[str] = None,
+    level: Optional[int] = None,
+    workers: Optional[int] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> Optional[CacheStats]:
+    """
+    Save files and directories as a content-addressed cache entry.
+
+    Files are split into ``chunk_size`` pieces, each stored once under the
+    SHA-256 of its content, so entries sharing files share storage and only new
+    content is compressed and written. Hashing and compression run across a
+    process pool (at most ``2 * workers`` tasks in flight). Files whose size and
+    mtime match the manifest last saved or restored for the same ``paths`` in
+    this job are not read at all.
+
+    Like ``actions/cache``, an existing key is never overwritten and keys are
+    scoped by ``paths``. Symlinks are stored as links; missing paths are skipped.
+
+    Example:
+        save_cache(["~/.cache/pip", ".venv"], f"deps-{runner_os}-{lock_hash}")
+
+    Args:
+        paths (Iterable[str]): Files or directories to cache (``~`` is expanded).
+        key (str): Cache key.
+        backend (CacheBackend | None): Storage; defaults to ``LocalDirectoryBackend()``.
+        codec (str | None): ``zstd``, ``gzip``, ``lzma`` or ``none``; defaults to ``default_codec()``.
+        level (int | None): Compression level; defaults to the codec's usual level.
+        workers (int | None): Worker processes; defaults to ``os.cpu_count()``,
+            ``0`` or ``1`` works in the calling process.
+        chunk_size (int): Maximum bytes per blob.
+
+    Returns:
+        CacheStats | None: What was saved, or None if ``key`` already exists.
+
+    Raises:
+        ValueError: If ``paths`` is empty, ``chunk_size`` is not positive or the codec is unknown.
+        RuntimeError: If ``zstd`` is requested without ``zstandard`` installed.
+    """
+    paths = list(paths)
+    if not paths:
+        raise ValueError("save_cache requires at least one path")
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be a positive integer")
+    backend = backend or LocalDirectoryBackend()
+    codec = codec or default_codec()
+    _check_codec(codec)
+    level = _LEVELS[codec] if level is None else level
+    if workers is None:
+        workers = os.cpu_count() or 1
+
+    version = _version(paths)
+    scoped = f"{version}/{key}"
+    if backend.read_manifest(scoped) is not None:
+        return None
+
+    previous: Dict[Tuple[int, str], Dict[str, Any]] = {}
+    state = _load_state(version)
+    if state and state["codec"] == codec and state["chunk_size"] == chunk_size:
+        previous = {
+            (e["root"], e["path"]): e for e in state["entries"] if e["type"] == "file"
+        }
+
+    stats = CacheStats(key=key)
+    entries: List[Dict[str, Any]] = []
+    pending: List[Tuple[Dict[str, Any], str]] = []
+    for entry, path in _scan(paths):
+        entries.append(entry)
+        if entry["type"] != "file":
+            continue
+        stats.files += 1
+        stats.bytes += entry["size"]
+        old = previous.get((entry["root"], entry["path"]))
+        if (
+            old is not None
+            and old["size"] == entry["size"]
+            and old["mtime_ns"] == entry["mtime_ns"]
+            and all(backend.has_blob(_blob_name(d, codec)) for d in old["chunks"])
+        ):
+            entry["chunks"] = old["chunks"]
+            stats.reused_files += 1
+        else:
+            entry["chunks"] = []
+            pending.append((entry, path))
+
+    def segments() -> Iterator[Tuple[_Segment, int]]:
+        for entry, path in pending:
+            for offset in range(0, entry["size"], chunk_size):
+                length = min(chunk_size, entry["size"] - offset)
+                yield (path, offset, length), length
+
+    owners = (entry for entry, _ in pending for _ in range(0, entry["size"], chunk_size))
+    tasks = _tasks(segments(), chunk_size)
+    for results in _run(_pack_segments, (backend, codec, level), tasks, workers):
+        for digest, written in results:
+            next(owners)["chunks"].append(digest)
+            stats.transferred_bytes += written
+
+    manifest = {
+        "version": MANIFEST_VERSION,
+        "key": key,
+        "paths": paths,
+        "codec": codec,
+        "chunk_size": chunk_size,
+        "entries": entries,
+    }
+    data = _encode_manifest(manifest)
+    backend.write_manifest(scoped, data)
+    _replace_atomically(_state_path(version), data)
+    return stats
+
+
+def restore_cache(
+    paths: Iterable[str],
+    primary_key: str,
+    restore_keys: Iterable[str] = (),
+    *,
+    backend: Optional[CacheBackend] = None,
+    workers: Optional[int] = None,
+) -> Optional[CacheStats]:
+    """
+    Restore a cache entry saved by ``save_cache``.
+
+    ``primary_key`` is matched exactly; otherwise each of ``restore_keys`` is
+    tried in order as a prefix, picking the most recently saved match. Files
+    already on disk with the recorded size and mtime are left alone; the others
+    are rebuilt from their blobs across a process pool, each file written to a
+    temporary name and moved into place once complete.
+
+    Example:
+        hit = restore_cache([".venv"], f"deps-{lock_hash}", ["deps-"])
+        set_output("cache-hit", bool(hit and hit.key == f"deps-{lock_hash}"))
+
+    Symlinks are created after every file and directory, and no entry is
+    written through a symlink that resolves outside its root.
+
+    Args:
+        paths (Iterable[str]): The same paths that were passed to ``save_cache``.
+        primary_key (str): Key to restore.
+        restore_keys (Iterable[str]): Fallback key prefixes, in order of preference.
+        backend (CacheBackend | None): Storage; defaults to ``LocalDirectoryBackend()``.
+        workers (int | None): Worker processes; defaults to ``os.cpu_count()``,
+            ``0`` or ``1`` works in the calling process.
+
+    Returns:
+        CacheStats | None: What was restored (``key`` is the matched key), or
+        None if no entry matched.
+
+    Raises:
+        ValueError: If the manifest is unsupported or contains unsafe paths.
+        RuntimeError: If the entry uses ``zstd`` and ``zstandard`` is not installed.
+    """
+    paths = list(paths)
+    backend = backend or LocalDirectoryBackend()
+    if workers is None:
+        workers = os.cpu_count() or 1
+
+    version = _version(paths)
+    scoped: Optional[str] = f"{version}/{primary_key}"
+    data = backend.read_manifest(scoped)  # type: ignore[arg-type]
+    if data is None:
+        scoped = None
+        for prefix in restore_keys:
+            matches = backend.list_keys(f"{version}/{prefix}")
+            if matches:
+                scoped = matches[0]
+                break
+        if scoped is None:
+            return None
+        data = backend.read_manifest(scoped)
+        if data is None:
+            return None
+
+    manifest = _decode_manifest(data)
+    codec = manifest["codec"]
+    _check_codec(codec)
+    chunk_size = manifest["chunk_size"]
+    stats = CacheStats(key=manifest["key"])
+
+    files: List[Tuple[Dict[str, Any], str, str]] = []
+    links: List[Tuple[Dict[str, Any], str]] = []
+    checked: Set[str] = set()
+    try:
+        for entry in manifest["entries"]:
+            dest = _destination(paths, entry)
+            _check_parent(paths, entry, dest, checked)
+            kind = entry["type"]
+            if kind == "dir":
+                os.makedirs(dest, exist_ok=True)
+                continue
+            if kind == "symlink":
+                links.append((entry, dest))
+                continue
+            os.makedirs(os.path.dirname(dest) or ".", exist_ok=True)
+
+            stats.files += 1
+            stats.bytes += entry["size"]
+            try:
+                st = os.lstat(dest)
+            except FileNotFoundError:
+                st = None
+            if (
+                st is not None
+                and stat.S_ISREG(st.st_mode)
+                and st.st_size == entry["size"]
+                and st.st_mtime_ns == entry["mtime_ns"]
+            ):
+                stats.reused_files += 1
+                continue
+            fd, tmp = tempfile.mkstemp(
+                dir=os.path.dirname(dest) or ".", prefix=f".{os.path.basename(dest)}."
+            )
+            files.append((entry, dest, tmp))
+            os.ftruncate(fd, entry["size"])
+            os.close(fd)
+
+        def segments() -> Iterator[Tuple[_Segment, int]]:
+            for entry, _, tmp in files:
+                for index, digest in enumerate(entry["chunks"]):
+                    offset = index * chunk_size
+                    length = min(chunk_size, entry["size"] - offset)
+                    yield (tmp, offset, _blob_name(digest, codec)), length
+
+        tasks = _tasks(segments(), chunk_size)
+        for read in _run(_unpack_segments, (backend, codec), tasks, workers):
+            stats.transferred_bytes += read
+
+        for entry, dest, tmp in files:
+            os.chmod(tmp, entry["mode"])
+            os.utime(tmp, ns=(entry["mtime_ns"], entry["mtime_ns"]))
+            os.replace(tmp, dest)
+
+        # Links go last, so no file or directory is written through one; each
+        # is checked again against the links created before it.
+        for entry, dest in links:
+            _check_parent(paths, entry, dest)
+            os.makedirs(os.path.dirname(dest) or ".", exist_ok=True)
+            if os.path.islink(dest) and os.readlink(dest) == entry["target"]:
+                continue
+            if os.path.isdir(dest) and not os.path.islink(dest):
+                raise ValueError(f"Refusing to replace directory {entry['path']!r} with a symlink")
+            if os.path.lexists(dest):
+                os.unlink(dest)
+            os.symlink(entry["target"], dest)
+    except BaseException:
+        for _, _, tmp in files:
+            if os.path.exists(tmp):
+                os.unlink(tmp)
+        raise
+
+    _replace_atomically(_state_path(version), data)
+    return stats
@@ -0,0 +1,308 @@
+import re
+from functools import lru_cache
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Pattern, Set, Tuple
+
+from .payload_query import select_many
+
+_GLOB_CHARS = frozenset("*?[")
+
+
+def _is_literal(segment: str) -> bool:
+    return not any(ch in _GLOB_CHARS for ch in segment)
+
+
+def _translate(pattern: str) -> str:
+    """
+    Translate a glob into a regular expression body.
+
+    ``**`` matches across ``/``; ``*`` and ``?`` stop at ``/``; ``[...]``
+    character classes are passed through (``[!...]`` negates).
+
+    Args:
+        pattern (str): Glob pattern.
+
+    Returns:
+        str: Regular expression body without anchors.
+    """
+    out: List[str] = []
+    i, n = 0, len(pattern)
+    while i < n:
+        ch = pattern[i]
+        if ch == "*":
+            if pattern.startswith("**/", i):
+                out.append("(?:.*/)?")
+                i += 3
+                continue
+            if pattern.startswith("**", i):
+                out.append(".*")
+                i += 2
+                continue
+            out.append("[^/]*")
+        elif ch == "?":
+            out.append("[^/]")
+        elif ch == "[":
+            end = pattern.find("]", i + 1)
+            if end == -1:
+                out.append(re.escape(ch))
+            else:
+                body = pattern[i + 1 : end]
+                if body.startswith("!"):
+                    body = "^" + body[1:]
+                out.append(f"[{body}]")
+                i = end
+        else:
+            out.append(re.escape(ch))
+        i += 1
+    return "".join(out)
+
+
+class PathPattern:
+    """
+    A compiled path pattern split into trie-walkable segments.
+
+    Two syntaxes are supported:
+
+    * ``"glob"`` – GitHub workflow ``paths:`` filters. Patterns are matched
+      against the full repository-relative path (``*.js`` only matches at the root,
+      ``**.js`` anywhere).
+    * ``"gitignore"`` – patterns without a slash match at any depth, a leading
+      ``/`` anchors to the root, a trailing ``/`` only matches directories, and a
+      pattern matching a directory matches everything below it.
+
+    Attributes:
+        pattern (str): The pattern as given (without a leading ``!``).
+        negated (bool): True if the pattern started with ``!``.
+        syntax (str): ``"glob"`` or ``"gitignore"``.
+        directory_only (bool): True for gitignore patterns ending in ``/``.
+        segments (Tuple[str, ...]): Normalised pattern segments.
+        regex (Pattern[str]): Compiled full-path matcher.
+    """
+
+    def __init__(self, pattern: str, syntax: str = "glob") -> None:
+        if syntax not in ("glob", "gitignore"):
+            raise ValueError(f"Unknown pattern syntax: {syntax!r}")
+        self.negated = pattern.startswith("!")
+        body = pattern[1:] if self.negated else pattern
+        self.pattern = body
+        self.syntax = syntax
+        self.directory_only = False
+
+        if syntax == "gitignore":
+            if body.endswith("/"):
+                self.directory_only = True
+                body = body.rstrip("/")
+            if body.startswith("/"):
+                body = body[1:]
+            elif "/" not in body:
+                body = "**/" + body
+            # A matching directory matches everything below it.
+            expr = _translate(body) + ("/.*" if self.directory_only else "(?:/.*)?")
+        else:
+            body = body.lstrip("/")
+            expr = _translate(body)
+
+        if not body:
+            raise ValueError("Path pattern must not be empty")
+        self.segments: Tuple[str, ...] = tuple(body.split("/"))
+        self.regex: Pattern[str] = re.compile(expr + r"\Z", re.DOTALL)
+
+        # Leading segments without ``**`` can be resolved level by level in the
+        # trie; literal ones become dict lookups (regex None).
+        prefix: List[Tuple[str, Optional[Pattern[str]]]] = []
+        for segment in self.segments:
+            if "**" in segment:
+                break
+            if _is_literal(segment):
+                prefix.append((segment, None))
+            else:
+                prefix.append((segment, re.compile(_translate(segment) + r"\Z")))
+        self.prefix: Tuple[Tuple[str, Optional[Pattern[str]]], ...] = tuple(prefix)
+        # When the whole glob is walkable, the nodes reached are exactly the matches.
+        self.exact = syntax == "glob" and len(prefix) == len(self.segments)
+
+    def matches(self, path: str) -> bool:
+        """Return True if ``path`` (repository-relative, ``/``-separated) matches."""
+        return self.regex.match(path) is not None
+
+    def __repr__(self) -> str:
+        prefix = "!" if self.negated else ""
+        return f"PathPattern({prefix + self.pattern!r}, syntax={self.syntax!r})"
+
+
+@lru_cache(maxsize=1024)
+def compile_pattern(pattern: str, syntax: str = "glob") -> PathPattern:
+    """
+    Compile (or fetch from cache) a path pattern.
+
+    Args:
+        pattern (str): Glob or gitignore pattern, optionally prefixed with ``!``.
+        syntax (str): ``"glob"`` (GitHub ``paths:`` filters) or ``"gitignore"``.
+
+    Returns:
+        PathPattern: The compiled pattern.
+
+    Raises:
+        ValueError: If the pattern is empty or the syntax is unknown.
+    """
+    return PathPattern(pattern, syntax)
+
+
+class _Node:
+    """Directory trie node. ``path`` is set when a changed file ends here."""
+
+    __slots__ = ("children", "path")
+
+    def __init__(self) -> None:
+        self.children: Dict[str, "_Node"] = {}
+        self.path: Optional[str] = None
+
+    def files(self) -> Iterator[str]:
+        stack = [self]
+        while stack:
+            node = stack.pop()
+            if node.path is not None:
+                yield node.path
+            stack.extend(node.children.values())
+
+
+class ChangedFiles:
+    """
+    Deduplicated index of changed paths with a trie-backed pattern matcher.
+
+    Literal leading segments of a pattern (``src/app/**``) are resolved by
+    dictionary lookups, and single-segment globs only scan the children of the
+    directories reached so far, so a pattern only touches the part of the tree
+    it can match instead of every changed file.
+
+    Attributes:
+        added (Set[str]): Paths reported as added.
+        modified (Set[str]): Paths reported as modified.
+        removed (Set[str]): Paths reported as removed.
+    """
+
+    def __init__(
+        self,
+        paths: Iterable[str] = (),
+        *,
+        added: Iterable[str] = (),
+        modified: Iterable[str] = (),
+        removed: Iterable[str] = (),
+    ) -> None:
+        self.added: Set[str] = set(added)
+        self.modified: Set[str] = set(modified)
+        self.removed: Set[str] = set(removed)
+        self._root = _Node()
+        self._paths: Set[str] = set()
+        for path in (*paths, *self.added, *self.modified, *self.removed):
+            self._insert(path)
+
+    @classmethod
+    def from_payload(cls, payload: Any) -> "ChangedFiles":
+        """
+        Build the index from a push-style payload (``commits[*].added/modified/removed``).
+
+        Pull request payloads do not list files; build those indexes from the API
+        instead, e.g. ``ChangedFiles(f.filename for f in pr.get_files())``.
+
+        Args:
+            payload (Any): A ``WebhookPayload`` or raw payload dict.
+
+        Returns:
+            ChangedFiles: The index (empty if the payload lists no files).
+        """
+        found = select_many(
+            payload,
+            ["commits[*].added[*]", "commits[*].modified[*]", "commits[*].removed[*]"],
+        )
+        return cls(
+            added=found["commits[*].added[*]"],
+            modified=found["commits[*].modified[*]"],
+            removed=found["commits[*].removed[*]"],
+        )
+
+    def _insert(self, path: str) -> None:
+        path = path.lstrip("/")
+        if not path or path in self._paths:
+            return
+        self._paths.add(path)
+        node = self._root
+        for part in path.split("/"):
+            node = node.children.setdefault(part, _Node())
+        node.path = path
+
+    def __len__(self) -> int:
+        return len(self._paths)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(sorted(self._paths))
+
+    def __contains__(self, path: object) -> bool:
+        return path in self._paths
+
+    def _match_one(self, compiled: PathPattern) -> List[str]:
+        nodes = [self._root]
+        for segment, regex in compiled.prefix:
+            if regex is None:
+                nodes = [n.children[segment] for n in nodes if segment in n.children]
+            else:
+                nodes = [
+                    child
+                    for n in nodes
+                    for name, child in n.children.items()
+                    if regex.match(name)
+                ]
+            if not nodes:
+                return []
+
+        if compiled.exact:
+            return sorted(n.path for n in nodes if n.path is not None)
+        return sorted(
+            path for n in nodes for path in n.files() if compiled.matches(path)
+        )
+
+    def match(
+        self, patterns: Iterable[str], *, syntax: str = "glob"
+    ) -> Dict[str, List[str]]:
+        """
+        Match every pattern against the index.
+
+        Args:
+            patterns (Iterable[str]): Glob or gitignore patterns. A leading ``!``
+                is ignored here; see ``filter`` for ordered include/exclude.
+            syntax (str): ``"glob"`` or ``"gitignore"``.
+
+        Returns:
+            Dict[str, List[str]]: Sorted matching paths keyed by pattern, as given.
+        """
+        return {
+            pattern: self._match_one(compile_pattern(pattern, syntax))
+            for pattern in patterns
+        }
+
+    def filter(self, patterns: Iterable[str], *, syntax: str = "glob") -> List[str]:
+        """
+        Apply patterns the way workflow ``paths:`` filters do.
+
+        Patterns are evaluated in order; a path is selected if the last pattern
+        matching it is not negated with ``!``.
+
+        Args:
+            patterns (Iterable[str]): Ordered include (``x``) and exclude (``!x``) patterns.
+            syntax (str): ``"glob"`` or ``"gitignore"``.
+
+        Returns:
+            List[str]: Selected paths, sorted.
+        """
+        selected: Set[str] = set()
+        for pattern in patterns:
+            compiled = compile_pattern(pattern, syntax)
+            hits = self._match_one(compiled)
+            if compiled.negated:
+                selected.difference_update(hits)
+            else:
+                selected.update(hits)
+        return sorted(selected)
+
+    def any_match(self, patterns: Iterable[str], *, syntax: str = "glob") -> bool:
+        """Return True if ``filter(patterns)`` would select at least one path."""
+        return bool(self.filter(patterns, syntax=syntax))
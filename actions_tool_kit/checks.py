@@ -0,0 +1,299 @@
+import random
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+from typing import Any, Callable, Dict, Hashable, Iterable, List, Optional
+
+import requests
+from github import Github, GithubException
+from urllib3.exceptions import NewConnectionError
+
+from .context import context
+from .models import RepoIdentifier
+
+# The Checks API accepts at most 50 annotations per request.
+MAX_ANNOTATIONS_PER_REQUEST = 50
+
+
+@dataclass
+class Annotation:
+    """
+    A check-run annotation.
+
+    Attributes:
+        path (str): Repository-relative file path.
+        start_line (int): First line of the annotated range.
+        end_line (Optional[int]): Last line; defaults to ``start_line``.
+        annotation_level (str): ``notice``, ``warning`` or ``failure``.
+        message (str): Annotation text.
+        title (Optional[str]): Short title.
+        start_column (Optional[int]): First column (single-line annotations only).
+        end_column (Optional[int]): Last column (single-line annotations only).
+        raw_details (Optional[str]): Extra details shown when expanded.
+    """
+
+    path: str
+    start_line: int
+    end_line: Optional[int] = None
+    annotation_level: str = "warning"
+    message: str = ""
+    title: Optional[str] = None
+    start_column: Optional[int] = None
+    end_column: Optional[int] = None
+    raw_details: Optional[str] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the Checks API representation, omitting unset fields."""
+        data = {k: v for k, v in asdict(self).items() if v is not None}
+        data.setdefault("end_line", self.start_line)
+        return data
+
+
+def _unsent(exc: BaseException) -> bool:
+    """True if the request certainly never took effect, so sending it again cannot duplicate it."""
+    if isinstance(exc, GithubException):
+        headers = {k.lower(): v for k, v in (exc.headers or {}).items()}
+        limited = headers.get("x-ratelimit-remaining") == "0" or "retry-after" in headers
+        return exc.status == 429 or (exc.status == 403 and limited)
+    if isinstance(exc, requests.ConnectTimeout):
+        return True
+    if isinstance(exc, requests.ConnectionError) and exc.args:
+        reason = getattr(exc.args[0], "reason", exc.args[0])
+        return isinstance(reason, NewConnectionError)
+    return False
+
+
+def _retryable(exc: BaseException) -> bool:
+    if isinstance(exc, GithubException):
+        return exc.status >= 500 or _unsent(exc)
+    return isinstance(exc, requests.RequestException)
+
+
+def _annotation_key(data: Dict[str, Any]) -> Hashable:
+    return tuple(data.get(k) for k in ("path", "start_line", "end_line", "annotation_level", "message", "title"))
+
+
+class CheckRunPublisher:
+    """
+    Stream annotations into a check run, 50 per update.
+
+    Annotations are buffered and each full chunk is sent as its own update on a
+    small thread pool (the Checks API appends annotations across updates).
+    Failed chunks are retried with jittered exponential back-off. Because a
+    resent chunk is appended again, a chunk whose outcome is unknown (a 5xx
+    or a timeout after sending) is only resent if the run's annotations do
+    not already contain it. Pacing is
+    left to the client's transport, so pass a client created with
+    ``rate_limit=True`` to keep uploads inside the rate-limit budget. At most
+    ``2 * max_workers`` chunks are queued, so memory stays bounded however
+    many annotations are streamed in.
+
+    Example:
+        with CheckRunPublisher(gh, "lint") as run:
+            for a in lint_results():
+                run.add(a)
+
+    Attributes:
+        name (str): Check run name.
+        repo (RepoIdentifier): Target repository.
+        head_sha (str): Commit the check run is attached to.
+        check_run_id (Optional[int]): ID once ``start()`` has run.
+        counts (Dict[str, int]): Annotations added per level.
+    """
+
+    def __init__(
+        self,
+        client: Github,
+        name: str,
+        *,
+        repo: Optional[RepoIdentifier] = None,
+        head_sha: Optional[str] = None,
+        title: Optional[str] = None,
+        max_workers: int = 4,
+        max_retries: int = 3,
+        backoff_base: float = 1.0,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        self.name = name
+        self.repo = repo or context.repo
+        sha = head_sha or context.sha
+        if not sha:
+            raise RuntimeError("CheckRunPublisher requires head_sha or GITHUB_SHA")
+        self.head_sha: str = sha
+        self.title = title or name
+        self.check_run_id: Optional[int] = None
+        self.counts: Dict[str, int] = {"notice": 0, "warning": 0, "failure": 0}
+
+        self._requester = client.requester
+        self._max_retries = max_retries
+        self._backoff_base = backoff_base
+        self._sleep = sleep
+        self._buffer: List[Dict[str, Any]] = []
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="check-run"
+        )
+        self._slots = threading.BoundedSemaphore(2 * max_workers)
+        self._errors: List[BaseException] = []
+        self._sent: "Counter[Hashable]" = Counter()
+        self._sent_lock = threading.Lock()
+
+    @property
+    def _url(self) -> str:
+        return f"/repos/{self.repo.owner}/{self.repo.repo}/check-runs"
+
+    def _backoff(self, attempt: int) -> None:
+        self._sleep(random.uniform(0, self._backoff_base * 2**attempt))
+
+    def _call(self, verb: str, url: str, body: Dict[str, Any], *, idempotent: bool = True) -> Dict[str, Any]:
+        attempt = 0
+        while True:
+            try:
+                _, data = self._requester.requestJsonAndCheck(verb, url, input=body)
+                return dict(data)
+            except Exception as exc:
+                if attempt >= self._max_retries or not (_unsent(exc) if not idempotent else _retryable(exc)):
+                    raise
+                self._backoff(attempt)
+                attempt += 1
+
+    def _listed(self) -> "Counter[Hashable]":
+        listed: "Counter[Hashable]" = Counter()
+        page = 1
+        while True:
+            _, data = self._requester.requestJsonAndCheck(
+                "GET", f"{self._url}/{self.check_run_id}/annotations", parameters={"per_page": 100, "page": page}
+            )
+            listed.update(_annotation_key(a) for a in data)
+            if len(data) < 100:
+                return listed
+            page += 1
+
+    def _applied(self, keys: "Counter[Hashable]") -> bool:
+        """Whether a chunk is already on the run, beyond what other uploads account for."""
+        listed = self._listed()
+        with self._sent_lock:
+            return all(listed[k] >= self._sent[k] + n for k, n in keys.items())
+
+    def _output(self, summary: str, **extra: Any) -> Dict[str, Any]:
+        return {"title": self.title, "summary": summary, **extra}
+
+    def start(self) -> int:
+        """
+        Create the check run in the ``in_progress`` state.
+
+        Returns:
+            int: The check run ID.
+        """
+        data = self._call(
+            "POST",
+            self._url,
+            {"name": self.name, "head_sha": self.head_sha, "status": "in_progress"},
+            idempotent=False,
+        )
+        self.check_run_id = int(data["id"])
+        return self.check_run_id
+
+    def _send_chunk(self, chunk: List[Dict[str, Any]]) -> None:
+        body = {"output": self._output("In progress", annotations=chunk)}
+        keys = Counter(_annotation_key(a) for a in chunk)
+        uncertain = False
+        attempt = 0
+        while True:
+            try:
+                if not (uncertain and self._applied(keys)):
+                    self._requester.requestJsonAndCheck("PATCH", f"{self._url}/{self.check_run_id}", input=body)
+                break
+            except Exception as exc:
+                if attempt >= self._max_retries or not _retryable(exc):
+                    raise
+                uncertain = uncertain or not _unsent(exc)
+                self._backoff(attempt)
+                attempt += 1
+        with self._sent_lock:
+            self._sent.update(keys)
+
+    def _upload(self, chunk: List[Dict[str, Any]]) -> None:
+        try:
+            self._send_chunk(chunk)
+        except Exception as exc:
+            self._errors.append(exc)
+        finally:
+            self._slots.release()
+
+    def flush(self) -> None:
+        """Send buffered annotations now, even if fewer than 50."""
+        if self.check_run_id is None:
+            self.start()
+        if self._buffer:
+            chunk, self._buffer = self._buffer, []
+            self._slots.acquire()
+            self._executor.submit(self._upload, chunk)
+
+    def add(self, annotation: Annotation) -> None:
+        """
+        Queue one annotation; a full chunk is uploaded in the background.
+
+        Args:
+            annotation (Annotation): The annotation to publish.
+        """
+        self.counts[annotation.annotation_level] = (
+            self.counts.get(annotation.annotation_level, 0) + 1
+        )
+        self._buffer.append(annotation.to_dict())
+        if len(self._buffer) >= MAX_ANNOTATIONS_PER_REQUEST:
+            self.flush()
+
+    def add_many(self, annotations: Iterable[Annotation]) -> None:
+        """Queue every annotation from an iterable (consumed lazily)."""
+        for annotation in annotations:
+            self.add(annotation)
+
+    def finish(
+        self,
+        conclusion: Optional[str] = None,
+        summary: Optional[str] = None,
+        text: Optional[str] = None,
+    ) -> None:
+        """
+        Upload remaining annotations, wait for all chunks and complete the run.
+
+        Args:
+            conclusion (str | None): Check conclusion; defaults to ``failure`` if
+                any failure-level annotation was added, otherwise ``success``.
+            summary (str | None): Output summary; defaults to annotation counts.
+            text (str | None): Optional output body.
+
+        Raises:
+            Exception: The first chunk upload that still failed after retries
+                (the run is completed before it is raised).
+        """
+        self.flush()
+        self._executor.shutdown(wait=True)
+
+        if conclusion is None:
+            conclusion = "failure" if self.counts.get("failure") else "success"
+        if summary is None:
+            summary = ", ".join(f"{n} {level}" for level, n in self.counts.items())
+        output = self._output(summary, **({"text": text} if text else {}))
+        self._call(
+            "PATCH",
+            f"{self._url}/{self.check_run_id}",
+            {"status": "completed", "conclusion": conclusion, "output": output},
+        )
+        if self._errors:
+            raise self._errors[0]
+
+    def __enter__(self) -> "CheckRunPublisher":
+        self.start()
+        return self
+
+    def __exit__(self, exc_type: Any, exc: Any, tb: Any) -> None:
+        if exc_type is None:
+            self.finish()
+        else:
+            try:
+                self.finish(conclusion="failure", summary=f"Aborted: {exc}")
+            except Exception:
+                pass  # let the original exception propagate instead
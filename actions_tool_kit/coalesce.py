@@ -0,0 +1,225 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from requests import PreparedRequest, Response
+from requests.adapters import BaseAdapter
+
+from .actions_core import append_summary
+from .transport import DelegatingAdapter
+
+_Key = Tuple[str, str, str]
+
+
+class _Flight:
+    """A GET currently in progress; followers wait on ``done``."""
+
+    __slots__ = ("done", "response", "error", "generation")
+
+    def __init__(self, generation: int) -> None:
+        self.done = threading.Event()
+        self.generation = generation
+        self.response: Optional[Response] = None
+        self.error: Optional[BaseException] = None
+
+
+def _clone(response: Response) -> Response:
+    """Copy a fully read response so every caller gets an independent object."""
+    copy = Response()
+    copy.status_code = response.status_code
+    copy.reason = response.reason
+    copy.headers = response.headers.copy()
+    copy._content = response.content
+    copy.url = response.url
+    copy.request = response.request
+    copy.encoding = response.encoding
+    copy.elapsed = response.elapsed
+    return copy
+
+
+class RequestMemo:
+    """
+    Per-run response memo with single-flight deduplication of identical GETs.
+
+    Concurrent identical GETs share one network request; completed ``200``
+    responses are replayed for ``ttl`` seconds. Any write to a URL drops the
+    memoized responses under that URL. One instance can be shared by several
+    clients; its counters cover all of them.
+
+    Attributes:
+        ttl (float): Seconds a memoized response stays valid.
+        max_entries (int): Maximum memoized responses (oldest dropped first).
+        hits (int): GETs answered from the memo.
+        misses (int): GETs sent to the network.
+        coalesced (int): GETs that waited for an identical in-flight request.
+    """
+
+    def __init__(
+        self,
+        ttl: float = 300.0,
+        max_entries: int = 1024,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[_Key, Tuple[float, Response]]" = OrderedDict()
+        self._flights: Dict[_Key, _Flight] = {}
+        # Bumped by every invalidation; flights started before it are not memoized.
+        self._generation = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @staticmethod
+    def key(request: PreparedRequest) -> _Key:
+        """Memo key: URL plus the headers that change the response."""
+        return (
+            str(request.url),
+            request.headers.get("Accept", ""),
+            request.headers.get("Authorization", ""),
+        )
+
+    def invalidate(self, url: str) -> None:
+        """
+        Drop memoized responses for ``url`` and anything below it.
+
+        GETs in flight for those URLs still answer their callers, but are
+        not memoized, and later GETs do not join them.
+        """
+        base = url.split("?", 1)[0].rstrip("/")
+
+        def under(key: _Key) -> bool:
+            path = key[0].split("?", 1)[0]
+            return path == base or path.startswith(base + "/")
+
+        with self._lock:
+            self._generation += 1
+            for key in [k for k in self._entries if under(k)]:
+                del self._entries[key]
+            for key in [k for k in self._flights if under(k)]:
+                del self._flights[key]
+
+    def clear(self) -> None:
+        """Drop every memoized response."""
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+            self._flights.clear()
+
+    def fetch(self, request: PreparedRequest, send: Callable[[], Response]) -> Response:
+        """
+        Return a memoized response, join an identical in-flight request, or send.
+
+        Args:
+            request (PreparedRequest): The GET being made.
+            send (Callable[[], Response]): Performs the actual request.
+
+        Returns:
+            Response: The response for this caller.
+        """
+        key = self.key(request)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and self._clock() - entry[0] < self.ttl:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return _clone(entry[1])
+            flight = self._flights.get(key)
+            leader = flight is None
+            if flight is None:
+                flight = self._flights[key] = _Flight(self._generation)
+                self.misses += 1
+            else:
+                self.coalesced += 1
+
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return _clone(flight.response)  # type: ignore[arg-type]
+
+        try:
+            response = send()
+            response.content  # read the body once so it can be shared
+            flight.response = response
+        except BaseException as exc:
+            flight.error = exc
+            raise
+        finally:
+            with self._lock:
+                if self._flights.get(key) is flight:
+                    del self._flights[key]
+                if (
+                    flight.response is not None
+                    and flight.response.status_code == 200
+                    and flight.generation == self._generation
+                ):
+                    self._entries[key] = (self._clock(), flight.response)
+                    self._entries.move_to_end(key)
+                    while len(self._entries) > self.max_entries:
+                        self._entries.popitem(last=False)
+            flight.done.set()
+        return _clone(response)
+
+    def summary_markdown(self) -> str:
+        """Render the counters as a markdown table for the step summary."""
+        total = self.hits + self.misses + self.coalesced
+        saved = self.hits + self.coalesced
+        rate = f"{saved / total:.0%}" if total else "n/a"
+        return (
+            "### GitHub API request memo\n\n"
+            "| Requests | Network | Memo hits | Coalesced | Saved |\n"
+            "|---:|---:|---:|---:|---:|\n"
+            f"| {total} | {self.misses} | {self.hits} | {self.coalesced} | {rate} |\n"
+        )
+
+    def write_summary(self) -> None:
+        """Append ``summary_markdown()`` to the step summary."""
+        append_summary(self.summary_markdown())
+
+
+class CoalescingAdapter(DelegatingAdapter):
+    """
+    Transport adapter routing GETs through a ``RequestMemo``.
+
+    Mutating requests pass straight through and invalidate memoized responses
+    under their URL.
+
+    Attributes:
+        memo (RequestMemo): The (possibly shared) memo.
+    """
+
+    def __init__(self, inner: BaseAdapter, memo: RequestMemo) -> None:
+        super().__init__(inner)
+        self.memo = memo
+
+    def send(self, request: PreparedRequest, **kwargs: Any) -> Response:  # type: ignore[override]
+        if request.method not in ("GET", "HEAD", "OPTIONS"):
+            self.memo.invalidate(str(request.url))
+        if request.method != "GET" or kwargs.get("stream"):
+            return self.inner.send(request, **kwargs)
+        return self.memo.fetch(request, lambda: self.inner.send(request, **kwargs))
+
+
+_shared_memo: Optional[RequestMemo] = None
+_shared_memo_lock = threading.Lock()
+
+
+def shared_memo() -> RequestMemo:
+    """
+    Return the process-wide memo used by ``get_github_client(memoize=True)``.
+
+    Returns:
+        RequestMemo: The shared memo, created on first use.
+    """
+    global _shared_memo
+    with _shared_memo_lock:
+        if _shared_memo is None:
+            _shared_memo = RequestMemo()
+        return _shared_memo
@@ -1,7 +1,12 @@
-import os
+import atexit
+import copy
 import json
+import mmap
+import os
+import pickle
+import tempfile
 from pathlib import Path
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Iterable, List, cast
 
 from .models import (
     WebhookPayload,
@@ -11,6 +16,8 @@ from .models import (
     Sender,
 )
 from .payload_parser import parse_payload
+from .changed_files import ChangedFiles
+from .runner_env import RunnerEnvironment, runner_env
 
 
 class Context:
@@ -19,45 +26,110 @@ class Context:
 
     Initializes values from environment variables and event JSON payload for ease of access
     to repository, issue, PR, and workflow information inside a GitHub Actions workflow.
+    The payload is parsed on first access, and instances pickle without it (see
+    ``share_context``), so they are cheap to hand to process-pool workers.
     """
 
-    def __init__(self):
+    def __init__(self, env: Optional[RunnerEnvironment] = None):
+        """
+        Initialize context from environment variables; the event payload is loaded on first use.
+
+        Args:
+            env (RunnerEnvironment | None): Environment snapshot to read from;
+                captured from ``os.environ`` when omitted.
+        """
+        self._set_env(env or RunnerEnvironment.from_environ())
+        self._payload: Optional[WebhookPayload] = None
+        self._from_event = True
+        self._payload_file: Optional[str] = None
+        self._changed_files: Optional[ChangedFiles] = None
+
+    def _set_env(self, env: RunnerEnvironment) -> None:
+        self.env: RunnerEnvironment = env
+        self.event_name = env.event_name
+        self.sha = env.sha
+        self.ref = env.ref
+        self.workflow = env.workflow
+        self.action = env.action
+        self.actor = env.actor
+        self.job = env.job
+        self.run_attempt = env.run_attempt
+        self.run_number = env.run_number
+        self.run_id = env.run_id
+        self.api_url = env.api_url
+        self.server_url = env.server_url
+        self.graphql_url = env.graphql_url
+
+    @property
+    def payload(self) -> WebhookPayload:
         """
-        Initialize context by loading event payload and environment variables.
+        Get the event payload, parsed from ``GITHUB_EVENT_PATH`` on first access.
+
+        Returns:
+            WebhookPayload: The parsed payload (empty if there is no event file).
         """
-        event_path = os.getenv("GITHUB_EVENT_PATH")
+        if self._payload is None:
+            self._payload = self._load_payload()
+        return self._payload
+
+    @payload.setter
+    def payload(self, value: WebhookPayload) -> None:
+        self._payload = value
+        self._from_event = False
+        self._payload_file = None
+        self._changed_files = None
+
+    def _load_payload(self) -> WebhookPayload:
+        if self._payload_file is not None:
+            with open(self._payload_file, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as m:
+                payload: WebhookPayload = pickle.loads(m)
+            return payload
+
+        event_path = self.env.event_path
         payload_data = {}
 
         if event_path:
             path = Path(event_path)
             if path.is_file():
-                with open(path, "r", encoding="utf-8") as f:
-                    payload_data = json.load(f)
+                with open(path, "r", encoding="utf-8") as event_file:
+                    payload_data = json.load(event_file)
             else:
                 print(f"GITHUB_EVENT_PATH {event_path} does not exist\n")
 
-        self.payload: WebhookPayload = parse_payload(payload_data)
-
-        self.event_name = os.getenv("GITHUB_EVENT_NAME")
-        self.sha = os.getenv("GITHUB_SHA")
-        self.ref = os.getenv("GITHUB_REF")
-        self.workflow = os.getenv("GITHUB_WORKFLOW")
-        self.action = os.getenv("GITHUB_ACTION")
-        self.actor = os.getenv("GITHUB_ACTOR")
-        self.job = os.getenv("GITHUB_JOB")
-        self.run_attempt = int(os.getenv("GITHUB_RUN_ATTEMPT", "0"))
-        self.run_number = int(os.getenv("GITHUB_RUN_NUMBER", "0"))
-        self.run_id = int(os.getenv("GITHUB_RUN_ID", "0"))
-        self.api_url = os.getenv("GITHUB_API_URL", "https://api.github.com")
-        self.server_url = os.getenv("GITHUB_SERVER_URL", "https://github.com")
-        self.graphql_url = os.getenv(
-            "GITHUB_GRAPHQL_URL", "https://api.github.com/graphql"
-        )
+        return parse_payload(payload_data)
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # Workers get the environment snapshot and where to load the payload
+        # from, never the payload itself, so the pickle stays a few hundred bytes.
+        if not self._from_event and self._payload_file is None:
+            self._payload_file = _dump_payload(self.payload, self.env.temp)
+        return {"env": self.env, "payload_file": self._payload_file}
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self._set_env(state["env"])
+        self._payload = None
+        self._from_event = state["payload_file"] is None
+        self._payload_file = state["payload_file"]
+        self._changed_files = None
+
+    # copy.copy/deepcopy would otherwise go through the pickling hooks above
+    # and round-trip the payload through a file.
+    def __copy__(self) -> "Context":
+        clone = type(self).__new__(type(self))
+        vars(clone).update(vars(self))
+        return clone
+
+    def __deepcopy__(self, memo: Dict[int, Any]) -> "Context":
+        clone = type(self).__new__(type(self))
+        memo[id(self)] = clone
+        for name, value in vars(self).items():
+            setattr(clone, name, copy.deepcopy(value, memo))
+        return clone
 
     @property
     def repo(self) -> RepoIdentifier:
         """
-        Get repository identifier from environment or payload.
+        Get repository identifier from the environment snapshot or payload.
 
         Returns:
             RepoIdentifier: Object containing `owner` and `repo` name.
@@ -65,7 +137,7 @@ class Context:
         Raises:
             RuntimeError: If repository information is unavailable.
         """
-        repo_str = os.getenv("GITHUB_REPOSITORY")
+        repo_str = self.env.repository
 
         if repo_str:
             owner, repo = repo_str.split("/")
@@ -134,7 +206,7 @@ class Context:
         """
         if self.payload.sender:
             return self.payload.sender
-        return Sender(login=self.actor, type=None)
+        return Sender(login=cast(str, self.actor), type=None)
 
     @property
     def head_branch(self) -> Optional[str]:
@@ -145,7 +217,7 @@ class Context:
             str | None: Head branch name or None if not a PR.
         """
         if self.payload.pull_request:
-            return self.payload.pull_request.get("head", {}).get("ref")
+            return cast(Optional[str], self.payload.pull_request.get("head", {}).get("ref"))
         return None
 
     @property
@@ -157,9 +229,106 @@ class Context:
             str | None: Base branch name or None if not a PR.
         """
         if self.payload.pull_request:
-            return self.payload.pull_request.get("base", {}).get("ref")
+            return cast(Optional[str], self.payload.pull_request.get("base", {}).get("ref"))
         return None
 
+    def select(self, path: str, default: Any = None) -> Any:
+        """
+        Read a nested value from the event payload with a precompiled path expression.
+
+        Args:
+            path (str): Dotted path such as ``pull_request.head.sha`` or ``commits[*].id``.
+            default (Any): Value returned when a non-wildcard path does not resolve.
+
+        Returns:
+            Any: The resolved value, or a list of matches for wildcard paths.
+        """
+        return self.payload.select(path, default)
+
+    def select_many(self, paths: Iterable[str], default: Any = None) -> Dict[str, Any]:
+        """
+        Read several nested values from the event payload in a single traversal.
+
+        Args:
+            paths (Iterable[str]): Path expressions, see ``select``.
+            default (Any): Value used for non-wildcard paths that do not resolve.
+
+        Returns:
+            Dict[str, Any]: Results keyed by path expression.
+        """
+        return self.payload.select_many(paths, default)
+
+    def changed_files(self) -> ChangedFiles:
+        """
+        Get the deduplicated, pattern-indexed set of files changed by a push event.
+
+        The index is built from ``commits[*].added/modified/removed`` on first use
+        and cached. Pull request payloads carry no file list, so the index is
+        empty for them.
+
+        Example:
+            context.changed_files().match(["src/**", "docs/**"])
+            context.changed_files().filter(["**.py", "!tests/**"])
+
+        Returns:
+            ChangedFiles: The changed-file index.
+        """
+        if self._changed_files is None:
+            self._changed_files = ChangedFiles.from_payload(self.payload)
+        return self._changed_files
+
+
+_payload_files: List[str] = []
+
+
+def _remove_payload_files() -> None:
+    for path in _payload_files:
+        try:
+            os.unlink(path)
+        except OSError:
+            pass
+    _payload_files.clear()
+
+
+def _dump_payload(payload: WebhookPayload, directory: Optional[str]) -> str:
+    """Write a pickled payload for workers to map read-only; removed when this process exits."""
+    fd, path = tempfile.mkstemp(prefix="context-payload-", suffix=".pickle", dir=directory or None)
+    with os.fdopen(fd, "wb") as f:
+        pickle.dump(payload, f, protocol=pickle.HIGHEST_PROTOCOL)
+    if not _payload_files:
+        atexit.register(_remove_payload_files)
+    _payload_files.append(path)
+    return path
+
+
+def _adopt_context(shared: Context) -> None:
+    vars(context).update(vars(shared))
+
+
+def share_context(ctx: Optional[Context] = None) -> Dict[str, Any]:
+    """
+    Pool arguments that make ``ctx`` the ``context`` of every worker process.
+
+    A ``Context`` pickles as its environment snapshot plus where to load the
+    payload from: the event file itself, or (after ``ctx.payload`` was
+    replaced) a pickled copy under ``RUNNER_TEMP`` that workers map
+    read-only. Workers parse the payload only if they use it, so their
+    startup does not depend on the event size. In-place edits to a payload
+    are not seen by workers; assign ``ctx.payload`` to share them.
+
+    Example:
+        with ProcessPoolExecutor(max_workers=4, **share_context()) as pool:
+            pool.map(check_file, paths)  # workers read context.repo, context.payload...
+
+    Args:
+        ctx (Context | None): Context to share; defaults to the module-level ``context``.
+
+    Returns:
+        Dict[str, Any]: ``initializer`` and ``initargs`` for ``ProcessPoolExecutor``
+        or ``multiprocessing.Pool``.
+    """
+    return {"initializer": _adopt_context, "initargs": (ctx or context,)}
+
 
 # Instance of context for easy reuse
-context = Context()
+context = Context(runner_env())
@@ -0,0 +1,305 @@
+import codecs
+import os
+import queue
+import selectors
+import shlex
+import subprocess
+import tempfile
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Deque, Dict, Iterator, List, Mapping, Optional, Sequence, Union
+
+from .actions_core import _mask, _write, _write_group
+
+Command = Union[str, Sequence[str]]
+
+# Per-process output kept in memory up to this size, then spilled to disk.
+_SPOOL_BYTES = 4 * 1024 * 1024
+_READ_SIZE = 64 * 1024
+_OUTPUT_MODES = ("group", "prefix", "silent")
+
+
+@dataclass
+class ExecResult:
+    """
+    Outcome of one command.
+
+    Attributes:
+        name (str): Display name (defaults to the command line).
+        args (List[str]): The argument vector that was run.
+        returncode (int): Exit status (negative for signals on POSIX).
+        duration (float): Wall-clock seconds from start to exit.
+        output (Optional[str]): Combined stdout/stderr with secrets masked,
+            when ``capture=True``.
+    """
+
+    name: str
+    args: List[str] = field(default_factory=list)
+    returncode: int = 0
+    duration: float = 0.0
+    output: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        """True if the command exited with status 0."""
+        return self.returncode == 0
+
+
+class _Running:
+    """A started process and everything read from it so far."""
+
+    def __init__(
+        self, index: int, name: str, args: List[str], proc: "subprocess.Popen[bytes]", mode: str, capture: bool
+    ) -> None:
+        self.index = index
+        self.name = name
+        self.args = args
+        self.proc = proc
+        self.mode = mode
+        self.started = time.monotonic()
+        self.buffer: Optional[Any] = None
+        if mode == "group" or capture:
+            self.buffer = tempfile.SpooledTemporaryFile(max_size=_SPOOL_BYTES)
+        self._decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        self._pending = ""
+
+    def feed(self, data: bytes) -> None:
+        if self.buffer is not None:
+            self.buffer.write(data)
+        if self.mode == "prefix":
+            text = self._pending + self._decoder.decode(data, final=not data)
+            lines = text.split("\n")
+            self._pending = lines.pop()
+            if not data and self._pending:
+                lines.append(self._pending)
+                self._pending = ""
+            if lines:
+                _write("".join(f"[{self.name}] {_mask(line.rstrip(chr(13)))}\n" for line in lines))
+
+    def chunks(self) -> Iterator[str]:
+        """Yield the buffered output, decoded and masked, in chunks cut at line ends."""
+        if self.buffer is None:
+            return
+        buffer = self.buffer
+        buffer.seek(0)
+        decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        pending = ""
+        for data in iter(lambda: buffer.read(_READ_SIZE), b""):
+            text = pending + decoder.decode(data)
+            # Secrets are masked line by line, so never cut a line in two.
+            cut = text.rfind("\n") + 1
+            pending = text[cut:]
+            if cut:
+                yield _mask(text[:cut])
+        text = pending + decoder.decode(b"", final=True)
+        if text:
+            yield _mask(text)
+
+    def close(self) -> None:
+        if self.buffer is not None:
+            self.buffer.close()
+
+
+def _argv(command: Command) -> List[str]:
+    if isinstance(command, str):
+        return shlex.split(command, posix=os.name != "nt")
+    return [str(arg) for arg in command]
+
+
+def _start(
+    index: int,
+    name: str,
+    command: Command,
+    mode: str,
+    capture: bool,
+    cwd: Optional[str],
+    env: Optional[Mapping[str, str]],
+) -> _Running:
+    args = _argv(command)
+    proc = subprocess.Popen(
+        args,
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
+        cwd=cwd,
+        env={**os.environ, **env} if env is not None else None,
+    )
+    return _Running(index, name, args, proc, mode, capture)
+
+
+def _finish(run: _Running, capture: bool) -> ExecResult:
+    returncode = run.proc.wait()
+    run.feed(b"")
+    duration = time.monotonic() - run.started
+    # The full text is only built when the caller keeps it; groups stream the spool.
+    output = "".join(run.chunks()) if capture else None
+    if run.mode == "group":
+        title = f"{run.name} (exit {returncode}, {duration:.1f}s)"
+        _write_group(title, [output] if output is not None else run.chunks())
+    run.close()
+    return ExecResult(
+        name=run.name,
+        args=run.args,
+        returncode=returncode,
+        duration=duration,
+        output=output if capture else None,
+    )
+
+
+def _pump_selectors(running: Dict[Any, _Running]) -> Any:
+    """Yield processes whose output hit EOF, reading all ready pipes (POSIX)."""
+    selector = selectors.DefaultSelector()
+    registered: Dict[int, _Running] = {}
+
+    def sync() -> None:
+        for run in running.values():
+            fd = run.proc.stdout.fileno()  # type: ignore[union-attr]
+            if fd not in registered:
+                os.set_blocking(fd, False)
+                selector.register(fd, selectors.EVENT_READ, run)
+                registered[fd] = run
+
+    try:
+        while True:
+            sync()
+            if not registered:
+                yield None
+                continue
+            for key, _ in selector.select():
+                run = key.data
+                try:
+                    data = os.read(key.fd, _READ_SIZE)
+                except BlockingIOError:
+                    continue
+                if data:
+                    run.feed(data)
+                    continue
+                selector.unregister(key.fd)
+                del registered[key.fd]
+                run.proc.stdout.close()
+                yield run
+    finally:
+        selector.close()
+
+
+def _pump_threads(running: Dict[Any, _Running]) -> Any:
+    """Reader-thread fallback for platforms where pipes cannot be selected (Windows)."""
+    events: "queue.Queue[tuple]" = queue.Queue()
+    started = set()
+
+    def reader(run: _Running) -> None:
+        stream = run.proc.stdout
+        for data in iter(lambda: stream.read1(_READ_SIZE), b""):  # type: ignore[union-attr]
+            events.put((run, data))
+        events.put((run, b""))
+
+    while True:
+        for key, run in running.items():
+            if key not in started:
+                started.add(key)
+                threading.Thread(target=reader, args=(run,), daemon=True).start()
+        if not started & set(running):
+            yield None
+            continue
+        run, data = events.get()
+        if data:
+            run.feed(data)
+        else:
+            run.proc.stdout.close()
+            yield run
+
+
+def run_commands(
+    commands: Union[Sequence[Command], Mapping[str, Command]],
+    *,
+    max_concurrency: Optional[int] = None,
+    output: str = "group",
+    capture: bool = False,
+    cwd: Optional[str] = None,
+    env: Optional[Mapping[str, str]] = None,
+) -> List[ExecResult]:
+    """
+    Run commands concurrently and stream their output without interleaving.
+
+    At most ``max_concurrency`` processes run at once. Their stdout and stderr
+    are merged and read through non-blocking pipes by a single selector loop
+    in the calling thread. Output is then shown according to ``output``:
+
+    * ``group`` – each command's log is printed as one contiguous
+      ``::group::`` block as soon as it exits (buffered in memory, spilled to
+      a temporary file beyond 4 MiB).
+    * ``prefix`` – lines are printed live as ``[name] line``.
+    * ``silent`` – nothing is printed.
+
+    Secrets registered with ``set_secret`` are masked in everything printed or
+    captured. Commands are never passed to a shell; strings are split with
+    ``shlex``.
+
+    Example:
+        results = run_commands({p: ["pytest", p] for p in packages}, max_concurrency=4)
+        if not all(r.ok for r in results):
+            set_failed("tests failed")
+
+    Args:
+        commands (Sequence | Mapping): Commands as strings or argument lists; a
+            mapping supplies display names.
+        max_concurrency (int | None): Maximum parallel processes; defaults to ``os.cpu_count()``.
+        output (str): ``group``, ``prefix`` or ``silent``.
+        capture (bool): Keep each command's output on the result.
+        cwd (str | None): Working directory for every command.
+        env (Mapping[str, str] | None): Variables added to the current environment.
+
+    Returns:
+        List[ExecResult]: One result per command, in input order.
+
+    Raises:
+        ValueError: If ``output`` is not a known mode.
+        OSError: If a command cannot be started (running ones are killed first).
+    """
+    if output not in _OUTPUT_MODES:
+        raise ValueError(f"output must be one of {', '.join(_OUTPUT_MODES)}")
+    if isinstance(commands, Mapping):
+        named = list(commands.items())
+    else:
+        named = [(c if isinstance(c, str) else shlex.join(map(str, c)), c) for c in commands]
+    limit = max(1, max_concurrency or os.cpu_count() or 1)
+
+    pending: Deque[int] = deque(range(len(named)))
+    running: Dict[int, _Running] = {}
+    results: List[Optional[ExecResult]] = [None] * len(named)
+    pump = (_pump_threads if os.name == "nt" else _pump_selectors)(running)
+    try:
+        while pending or running:
+            while pending and len(running) < limit:
+                index = pending.popleft()
+                name, command = named[index]
+                running[index] = _start(index, name, command, output, capture, cwd, env)
+            finished = next(pump)
+            if finished is not None:
+                del running[finished.index]
+                results[finished.index] = _finish(finished, capture)
+    finally:
+        pump.close()
+        for run in running.values():
+            run.proc.kill()
+            run.proc.wait()
+    return results  # type: ignore[return-value]
+
+
+def run_command(command: Command, *, name: Optional[str] = None, **options: Any) -> ExecResult:
+    """
+    Run a single command; see ``run_commands`` for the options.
+
+    Args:
+        command (Command): Command string or argument list.
+        name (str | None): Display name; defaults to the command line.
+        **options: ``output``, ``capture``, ``cwd``, ``env``.
+
+    Returns:
+        ExecResult: The command's result.
+    """
+    if name is None:
+        name = command if isinstance(command, str) else shlex.join(map(str, command))
+    return run_commands({name: command}, **options)[0]
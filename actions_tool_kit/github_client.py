@@ -1,7 +1,22 @@
+import atexit
+import os
+import threading
+
 from github import Github
-from typing import Optional, Dict, Any
+from requests.adapters import BaseAdapter
+from typing import Optional, Dict, Any, Callable, Hashable, List, Tuple, Union, cast
+
+from .coalesce import CoalescingAdapter, RequestMemo, shared_memo
+from .http_cache import CachingAdapter, DiskCache
+from .rate_limit import SERVER_ERROR_RETRY, RateLimitedAdapter, RateLimitScheduler, shared_scheduler
+from .runner_env import runner_env
+from .transport import install_adapter
 
-from pycparser.ply.yacc import token
+# Enough pooled connections for a default-sized ThreadPoolExecutor sharing one client.
+DEFAULT_POOL_SIZE = min(32, (os.cpu_count() or 1) + 4)
+
+_shared_clients: Dict[Tuple[Hashable, ...], Github] = {}
+_shared_clients_lock = threading.Lock()
 
 
 def get_github_client(token: str, **options: Any) -> Github:
@@ -13,6 +28,8 @@ def get_github_client(token: str, **options: Any) -> Github:
 
     Optional keyword arguments:
         - base_url: str
+            Defaults to ``GITHUB_API_URL`` (so GHES runners need no setting),
+            else ``https://api.github.com``.
         - timeout: int
         - user_agent: str
         - per_page: int
@@ -26,5 +43,142 @@ def get_github_client(token: str, **options: Any) -> Github:
         - password: str
         - app_auth: AppAuthentication
         - lazy: bool
+        - http_cache: bool | str | DiskCache
+            Serve repeated GETs through an on-disk ETag/Last-Modified cache.
+            True uses ``$RUNNER_TEMP/gh-http-cache``; a string is a cache directory.
+        - rate_limit: bool | RateLimitScheduler
+            Schedule requests from X-RateLimit-*/Retry-After headers instead of
+            PyGithub's fixed ``seconds_between_*`` throttles. Rate-limited
+            responses are retried by the scheduler; unless ``retry`` is given,
+            server errors and connection failures keep being retried by urllib3
+            (``SERVER_ERROR_RETRY``). True uses the process-wide ``shared_scheduler()``.
+        - memoize: bool | RequestMemo
+            Share concurrent identical GETs and replay their responses for the
+            rest of the run. True uses the process-wide ``shared_memo()``.
+    """
+    http_cache: Union[bool, str, DiskCache, None] = options.pop("http_cache", None)
+    rate_limit: Union[bool, RateLimitScheduler, None] = options.pop("rate_limit", None)
+    memoize: Union[bool, RequestMemo, None] = options.pop("memoize", None)
+    options.setdefault("base_url", runner_env().api_url)
+
+    if rate_limit:
+        options.setdefault("seconds_between_requests", None)
+        options.setdefault("seconds_between_writes", None)
+        options.setdefault("retry", SERVER_ERROR_RETRY)
+
+    client = Github(login_or_token=token, **options)
+    wrappers = adapter_wrappers(
+        http_cache=http_cache, rate_limit=rate_limit, memoize=memoize
+    )
+    for wrap in wrappers:
+        install_adapter(client, wrap)
+    return client
+
+
+def adapter_wrappers(
+    *,
+    http_cache: Union[bool, str, DiskCache, None] = None,
+    rate_limit: Union[bool, RateLimitScheduler, None] = None,
+    memoize: Union[bool, RequestMemo, None] = None,
+) -> List[Callable[[BaseAdapter], BaseAdapter]]:
     """
-    return Github(login_or_token=token, **options)
+    Build the transport adapter wrappers for the ``http_cache``, ``rate_limit`` and ``memoize`` options.
+
+    Wrappers are returned innermost first: the scheduler sits next to the
+    network and the cache above it, so cache revalidations are also paced;
+    the memo is outermost, so repeated GETs never leave the process.
+
+    Args:
+        http_cache: See ``get_github_client``.
+        rate_limit: See ``get_github_client``.
+        memoize: See ``get_github_client``.
+
+    Returns:
+        List[Callable[[BaseAdapter], BaseAdapter]]: Factories to apply in order.
+    """
+    wrappers: List[Callable[[BaseAdapter], BaseAdapter]] = []
+    if rate_limit:
+        scheduler = (
+            rate_limit if isinstance(rate_limit, RateLimitScheduler) else shared_scheduler()
+        )
+        wrappers.append(lambda inner: RateLimitedAdapter(inner, scheduler))
+    if isinstance(http_cache, DiskCache) or http_cache:
+        cache = (
+            http_cache
+            if isinstance(http_cache, DiskCache)
+            else DiskCache(None if http_cache is True else str(http_cache))
+        )
+        wrappers.append(lambda inner: CachingAdapter(inner, cache))
+    if isinstance(memoize, RequestMemo) or memoize:
+        memo = memoize if isinstance(memoize, RequestMemo) else shared_memo()
+        wrappers.append(lambda inner: CoalescingAdapter(inner, memo))
+    return wrappers
+
+
+def _freeze(value: Any) -> Hashable:
+    """
+    Return a hashable stand-in for an option value, built from its contents.
+
+    Raises:
+        TypeError: If the value is unhashable and not a dict, list, tuple or set.
+    """
+    if isinstance(value, dict):
+        return ("<dict>", frozenset((_freeze(k), _freeze(v)) for k, v in value.items()))
+    if isinstance(value, (list, tuple)):
+        return (f"<{type(value).__name__}>", tuple(_freeze(v) for v in value))
+    if isinstance(value, (set, frozenset)):
+        return ("<set>", frozenset(_freeze(v) for v in value))
+    try:
+        hash(value)
+    except TypeError:
+        raise TypeError(
+            f"get_shared_github_client options must be hashable; got {type(value).__name__}"
+        ) from None
+    return cast(Hashable, value)
+
+
+def get_shared_github_client(token: str, **options: Any) -> Github:
+    """
+    Returns a process-wide GitHub client, reusing one per token, base URL and options.
+
+    Every call with the same arguments gets the same ``Github`` instance, so helper
+    functions share one HTTP session and its keep-alive connection pool instead of
+    paying a new TLS handshake per client. ``pool_size`` defaults to
+    ``DEFAULT_POOL_SIZE`` so the client can be shared by a worker pool.
+    Shared clients are closed at interpreter exit, or explicitly with
+    ``close_shared_github_clients()``.
+
+    Args:
+        token (str): GitHub token (PAT or GitHub Actions token).
+        **options: Same keyword arguments as ``get_github_client``.
+
+    Returns:
+        Github: The shared client for this configuration.
+    """
+    options.setdefault("base_url", runner_env().api_url)
+    options.setdefault("pool_size", DEFAULT_POOL_SIZE)
+    key = (token, *sorted((name, _freeze(value)) for name, value in options.items()))
+
+    client: Optional[Github] = _shared_clients.get(key)
+    if client is not None:
+        return client
+    with _shared_clients_lock:
+        client = _shared_clients.get(key)
+        if client is None:
+            client = get_github_client(token, **options)
+            _shared_clients[key] = client
+    return client
+
+
+def close_shared_github_clients() -> None:
+    """
+    Close and forget every client created by ``get_shared_github_client``.
+    """
+    with _shared_clients_lock:
+        clients = list(_shared_clients.values())
+        _shared_clients.clear()
+    for client in clients:
+        client.close()
+
+
+atexit.register(close_shared_github_clients)
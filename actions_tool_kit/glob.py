@@ -0,0 +1,326 @@
+import os
+import re
+import threading
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Callable, Deque, Dict, Iterable, Iterator, List, Optional, Pattern, Set, Tuple, Union
+
+from .changed_files import PathPattern, compile_pattern
+
+# (base directory relative to the root, compiled gitignore pattern)
+_Rule = Tuple[str, PathPattern]
+_Rules = Tuple[_Rule, ...]
+
+_MAX_BATCH = 64
+
+
+def _split_patterns(patterns: Union[str, Iterable[str]]) -> List[str]:
+    lines = patterns.splitlines() if isinstance(patterns, str) else list(patterns)
+    return [p.strip() for p in lines if p.strip() and not p.strip().startswith("#")]
+
+
+def _combined(patterns: List[PathPattern]) -> Optional[Pattern[str]]:
+    if not patterns:
+        return None
+    return re.compile("|".join(f"(?:{p.regex.pattern})" for p in patterns), re.DOTALL)
+
+
+def _never(path: str) -> bool:
+    return False
+
+
+def _any_rule(rules: List[_Rule], suffix: str = "") -> Callable[[str], bool]:
+    """Combine negation-free gitignore rules into one regex per base directory."""
+    by_base: Dict[str, List[PathPattern]] = {}
+    for base, pattern in rules:
+        by_base.setdefault(base, []).append(pattern)
+    combined = [(base, _combined(patterns)) for base, patterns in by_base.items()]
+    if not combined:
+        return _never
+
+    def check(path: str) -> bool:
+        path += suffix
+        for base, regex in combined:
+            if base:
+                if not path.startswith(base + "/"):
+                    continue
+                path_in_base = path[len(base) + 1 :]
+            else:
+                path_in_base = path
+            if regex.match(path_in_base):  # type: ignore[union-attr]
+                return True
+        return False
+
+    return check
+
+
+def _could_contain(pattern: PathPattern, parts: List[str]) -> bool:
+    """Return True if ``pattern`` can match something below the directory ``parts``."""
+    prefix = pattern.prefix
+    for part, (literal, regex) in zip(parts, prefix):
+        if (part != literal) if regex is None else (regex.match(part) is None):
+            return False
+    if len(prefix) < len(pattern.segments):  # a ``**`` follows the walkable prefix
+        return True
+    return len(parts) < len(pattern.segments)
+
+
+class Globber:
+    """
+    Compiled include/exclude patterns with a parallel, pruning directory walk.
+
+    Include patterns use GitHub ``paths:`` glob syntax relative to the root
+    (``src/**/*.py``); a ``!`` prefix excludes files again and the last
+    matching pattern wins. ``exclude`` patterns and ``.gitignore`` files use
+    gitignore syntax. Patterns are compiled once, so a ``Globber`` can walk
+    several roots.
+
+    Directories are pruned before they are listed when they are excluded or
+    when no include pattern can match anything below them (``src/**`` never
+    enters ``docs/``). Each walk lists directories with ``os.scandir`` on a
+    thread pool and yields matches as soon as their directory is scanned, in
+    no particular order.
+
+    Attributes:
+        include_directories (bool): Also yield directories matching the includes.
+        follow_symlinks (bool): Descend into symlinked directories (with cycle detection).
+        gitignore (bool): Honour ``.gitignore`` files found during the walk and skip ``.git``.
+    """
+
+    def __init__(
+        self,
+        patterns: Union[str, Iterable[str]],
+        *,
+        exclude: Iterable[str] = (),
+        gitignore: bool = False,
+        include_directories: bool = False,
+        follow_symlinks: bool = False,
+        workers: Optional[int] = None,
+    ) -> None:
+        self._includes = [
+            (p.negated, p) for p in (compile_pattern(s, "glob") for s in _split_patterns(patterns))
+        ]
+        if not self._includes:
+            raise ValueError("At least one include pattern is required")
+        positive = [p for negated, p in self._includes if not negated]
+        # Without negations a single alternation decides every path.
+        self._any_include = None if len(positive) < len(self._includes) else _combined(positive)
+        self._positive = positive
+        self._exclude: _Rules = tuple(
+            ("", compile_pattern(s, "gitignore")) for s in _split_patterns(exclude)
+        )
+        self.gitignore = gitignore
+        self.include_directories = include_directories
+        self.follow_symlinks = follow_symlinks
+        self._workers = workers or min(32, (os.cpu_count() or 1) + 4)
+        self._checks: Dict[_Rules, Tuple[Callable[[str], bool], Callable[[str], bool]]] = {}
+
+    def included(self, path: str) -> bool:
+        """Return True if the root-relative ``path`` matches the include patterns."""
+        if self._any_include is not None:
+            return self._any_include.match(path) is not None
+        result = False
+        for negated, pattern in self._includes:
+            if pattern.regex.match(path):
+                result = not negated
+        return result
+
+    @staticmethod
+    def _ignored(path: str, rules: _Rules) -> bool:
+        """Gitignore evaluation: the last matching rule wins. Directories end in ``/``."""
+        result = False
+        for base, pattern in rules:
+            if base:
+                if not path.startswith(base + "/"):
+                    continue
+                relative = path[len(base) + 1 :]
+            else:
+                relative = path
+            if pattern.regex.match(relative):
+                result = not pattern.negated
+        return result
+
+    def _ignore_checks(self, rules: _Rules) -> Tuple[Callable[[str], bool], Callable[[str], bool]]:
+        """Return ``(file_ignored, dir_ignored)`` predicates for a rule set (cached per set)."""
+        checks = self._checks.get(rules)
+        if checks is not None:
+            return checks
+        if not rules:
+            checks = (_never, _never)
+        elif any(pattern.negated for _, pattern in rules):
+            checks = (
+                lambda path: self._ignored(path, rules),
+                lambda path: self._ignored(path + "/", rules),
+            )
+        else:
+            # Without negations any match ignores: one alternation per base
+            # directory, and directory-only rules never apply to files.
+            checks = (
+                _any_rule([r for r in rules if not r[1].directory_only]),
+                _any_rule(list(rules), suffix="/"),
+            )
+        self._checks[rules] = checks
+        return checks
+
+    def _descend(self, path: str) -> bool:
+        parts = path.split("/")
+        return any(_could_contain(p, parts) for p in self._positive)
+
+    def _read_gitignore(self, directory: str, rel: str, rules: _Rules) -> _Rules:
+        try:
+            with open(os.path.join(directory, ".gitignore"), encoding="utf-8") as f:
+                lines = f.read().splitlines()
+        except (OSError, UnicodeDecodeError):
+            return rules
+        added = []
+        for line in lines:
+            line = line.rstrip()
+            if not line or line.startswith("#"):
+                continue
+            if line.startswith("\\"):
+                line = line[1:]
+            try:
+                added.append((rel, compile_pattern(line, "gitignore")))
+            except ValueError:
+                continue
+        return rules + tuple(added)
+
+    def _scan(
+        self,
+        root: str,
+        batch: List[Tuple[str, _Rules]],
+        relative: bool,
+        seen: Optional[Set[Tuple[int, int]]],
+        lock: threading.Lock,
+    ) -> Tuple[List[str], List[Tuple[str, _Rules]]]:
+        """List a batch of directories; return matches and subdirectories to walk."""
+        matches: List[str] = []
+        subdirs: List[Tuple[str, _Rules]] = []
+        included = self.included
+        for rel, rules in batch:
+            directory = os.path.join(root, rel) if rel else root
+            if self.gitignore:
+                rules = self._read_gitignore(directory, rel, rules)
+            file_ignored, dir_ignored = self._ignore_checks(rules)
+            try:
+                it = os.scandir(directory)
+            except OSError:
+                continue  # unreadable or vanished; skip like find/fd
+            with it:
+                for entry in it:
+                    path = f"{rel}/{entry.name}" if rel else entry.name
+                    try:
+                        is_dir = entry.is_dir(follow_symlinks=self.follow_symlinks)
+                    except OSError:
+                        continue
+                    if not is_dir:
+                        if included(path) and not file_ignored(path):
+                            matches.append(path if relative else entry.path)
+                        continue
+                    if self.gitignore and entry.name == ".git":
+                        continue
+                    if dir_ignored(path):
+                        continue
+                    if self.include_directories and included(path):
+                        matches.append(path if relative else entry.path)
+                    if not self._descend(path):
+                        continue
+                    if seen is not None:
+                        st = entry.stat()
+                        with lock:
+                            if (st.st_dev, st.st_ino) in seen:
+                                continue
+                            seen.add((st.st_dev, st.st_ino))
+                    subdirs.append((path, rules))
+        return matches, subdirs
+
+    def walk(self, root: Optional[str] = None, *, relative: bool = False) -> Iterator[str]:
+        """
+        Yield files (and optionally directories) under ``root`` that match.
+
+        Args:
+            root (str | None): Directory to search; defaults to ``GITHUB_WORKSPACE`` or the cwd.
+            relative (bool): Yield ``/``-separated paths relative to ``root``
+                instead of paths joined onto it.
+
+        Yields:
+            str: Matching paths, in discovery order.
+        """
+        root = root or os.getenv("GITHUB_WORKSPACE") or os.getcwd()
+        lock = threading.Lock()
+        seen: Optional[Set[Tuple[int, int]]] = None
+        if self.follow_symlinks:
+            st = os.stat(root)
+            seen = {(st.st_dev, st.st_ino)}
+
+        backlog: Deque[Tuple[str, _Rules]] = deque([("", self._exclude)])
+        if self._workers <= 1:
+            while backlog:
+                matches, subdirs = self._scan(root, [backlog.pop()], relative, seen, lock)
+                backlog.extend(subdirs)
+                yield from matches
+            return
+
+        pool = ThreadPoolExecutor(max_workers=self._workers, thread_name_prefix="glob")
+        pending: Set[Future] = set()
+        try:
+            while backlog or pending:
+                while backlog and len(pending) < 2 * self._workers:
+                    size = min(_MAX_BATCH, max(1, len(backlog) // (2 * self._workers)))
+                    batch = [backlog.pop() for _ in range(size)]
+                    pending.add(pool.submit(self._scan, root, batch, relative, seen, lock))
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    matches, subdirs = future.result()
+                    backlog.extend(subdirs)
+                    yield from matches
+        finally:
+            for future in pending:
+                future.cancel()
+            pool.shutdown(wait=True)
+
+
+def glob(
+    patterns: Union[str, Iterable[str]],
+    root: Optional[str] = None,
+    *,
+    exclude: Iterable[str] = (),
+    gitignore: bool = False,
+    include_directories: bool = False,
+    follow_symlinks: bool = False,
+    relative: bool = False,
+    workers: Optional[int] = None,
+) -> Iterator[str]:
+    """
+    Stream the paths under ``root`` matching ``patterns``.
+
+    Example:
+        for path in glob(["**/*.py", "!**/test_*.py"], exclude=["node_modules/"], gitignore=True):
+            lint(path)
+
+    Args:
+        patterns (str | Iterable[str]): Include globs, one per item or line; ``!`` excludes.
+        root (str | None): Directory to search; defaults to ``GITHUB_WORKSPACE`` or the cwd.
+        exclude (Iterable[str]): Gitignore-style patterns pruned during the walk.
+        gitignore (bool): Honour ``.gitignore`` files and skip ``.git`` directories.
+        include_directories (bool): Also yield matching directories.
+        follow_symlinks (bool): Descend into symlinked directories.
+        relative (bool): Yield paths relative to ``root``.
+        workers (int | None): Scanner threads; defaults to ``min(32, cpu + 4)``,
+            ``1`` walks in the calling thread.
+
+    Yields:
+        str: Matching paths, in discovery order.
+
+    Raises:
+        ValueError: If no include pattern is given.
+    """
+    globber = Globber(
+        patterns,
+        exclude=exclude,
+        gitignore=gitignore,
+        include_directories=include_directories,
+        follow_symlinks=follow_symlinks,
+        workers=workers,
+    )
+    return globber.walk(root, relative=relative)
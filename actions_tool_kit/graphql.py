@@ -0,0 +1,279 @@
+import json
+from dataclasses import dataclass, field
+from typing import (
+    Any,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    TypeVar,
+    Union,
+)
+
+from github import Github, GithubException
+
+from .context import context
+from .models import IssueIdentifier, PullRequestIdentifier, RepoIdentifier
+
+DEFAULT_ISSUE_FIELDS = "number title state url createdAt updatedAt author { login }"
+DEFAULT_PULL_REQUEST_FIELDS = (
+    "number title state url isDraft merged headRefName baseRefName headRefOid "
+    "createdAt updatedAt author { login }"
+)
+
+# GitHub rejects queries that could return more than 500,000 nodes.
+MAX_NODES = 500_000
+
+Identifier = TypeVar("Identifier", IssueIdentifier, PullRequestIdentifier)
+
+
+@dataclass
+class IssueNode:
+    """
+    An issue returned by a batched GraphQL lookup.
+
+    Attributes:
+        number (int): Issue number.
+        title (Optional[str]): Issue title.
+        state (Optional[str]): ``OPEN`` or ``CLOSED``.
+        url (Optional[str]): Web URL.
+        author (Optional[str]): Login of the author, if requested and available.
+        extra (Dict[str, Any]): Any other requested fields, as returned by the API.
+    """
+
+    number: int
+    title: Optional[str] = None
+    state: Optional[str] = None
+    url: Optional[str] = None
+    author: Optional[str] = None
+    extra: Dict[str, Any] = field(default_factory=dict)
+
+
+@dataclass
+class PullRequestNode(IssueNode):
+    """
+    A pull request returned by a batched GraphQL lookup.
+
+    Attributes:
+        head_ref (Optional[str]): Source branch name.
+        base_ref (Optional[str]): Target branch name.
+        head_sha (Optional[str]): Head commit SHA.
+        is_draft (Optional[bool]): Whether the PR is a draft.
+        merged (Optional[bool]): Whether the PR has been merged.
+    """
+
+    head_ref: Optional[str] = None
+    base_ref: Optional[str] = None
+    head_sha: Optional[str] = None
+    is_draft: Optional[bool] = None
+    merged: Optional[bool] = None
+
+
+_ISSUE_KEYS = {"number", "title", "state", "url", "author"}
+_PULL_REQUEST_KEYS = {
+    "headRefName": "head_ref",
+    "baseRefName": "base_ref",
+    "headRefOid": "head_sha",
+    "isDraft": "is_draft",
+    "merged": "merged",
+}
+
+
+def _issue_node(data: Dict[str, Any]) -> IssueNode:
+    author = data.get("author")
+    return IssueNode(
+        number=data.get("number", 0),
+        title=data.get("title"),
+        state=data.get("state"),
+        url=data.get("url"),
+        author=author.get("login") if isinstance(author, dict) else None,
+        extra={k: v for k, v in data.items() if k not in _ISSUE_KEYS},
+    )
+
+
+def _pull_request_node(data: Dict[str, Any]) -> PullRequestNode:
+    base = _issue_node(data)
+    return PullRequestNode(
+        number=base.number,
+        title=base.title,
+        state=base.state,
+        url=base.url,
+        author=base.author,
+        extra={k: v for k, v in base.extra.items() if k not in _PULL_REQUEST_KEYS},
+        **{attr: data.get(key) for key, attr in _PULL_REQUEST_KEYS.items()},
+    )
+
+
+def _batches(
+    items: Sequence[Identifier], batch_size: int, nodes_per_lookup: int, max_nodes: int
+) -> Iterator[Sequence[Identifier]]:
+    """Split lookups so each query stays under both the alias and the node budget."""
+    size = max(1, min(batch_size, max_nodes // max(1, nodes_per_lookup)))
+    for start in range(0, len(items), size):
+        yield items[start : start + size]
+
+
+def build_lookup_query(
+    identifiers: Sequence[Union[IssueIdentifier, PullRequestIdentifier]],
+    kind: str,
+    fields: str,
+) -> Tuple[str, Dict[str, Union[IssueIdentifier, PullRequestIdentifier]]]:
+    """
+    Build one aliased GraphQL query resolving many issues or pull requests.
+
+    Lookups are grouped per repository so each repository is resolved once::
+
+        query { r0: repository(owner: "o", name: "r") { n0: issue(number: 1) { ... } } }
+
+    Args:
+        identifiers: Identifiers to resolve.
+        kind (str): ``"issue"`` or ``"pullRequest"``.
+        fields (str): GraphQL selection set for each node, without braces.
+
+    Returns:
+        Tuple[str, Dict]: The query and a map from ``"rX.nY"`` alias paths to identifiers.
+    """
+    by_repo: Dict[RepoIdentifier, List[Union[IssueIdentifier, PullRequestIdentifier]]] = {}
+    for ident in identifiers:
+        by_repo.setdefault(RepoIdentifier(ident.owner, ident.repo), []).append(ident)
+
+    aliases: Dict[str, Union[IssueIdentifier, PullRequestIdentifier]] = {}
+    parts: List[str] = []
+    counter = 0
+    for r, (repo, idents) in enumerate(by_repo.items()):
+        nodes = []
+        for ident in idents:
+            aliases[f"r{r}.n{counter}"] = ident
+            nodes.append(f"n{counter}: {kind}(number: {int(ident.number)}) {{ {fields} }}")
+            counter += 1
+        parts.append(
+            f"r{r}: repository(owner: {json.dumps(repo.owner)}, name: {json.dumps(repo.repo)}) "
+            f"{{ {' '.join(nodes)} }}"
+        )
+    return "query { " + " ".join(parts) + " }", aliases
+
+
+def _lookup(
+    client: Github,
+    identifiers: Iterable[Identifier],
+    kind: str,
+    fields: str,
+    batch_size: int,
+    nodes_per_lookup: int,
+    max_nodes: int,
+    graphql_url: Optional[str],
+) -> Dict[Identifier, Optional[Dict[str, Any]]]:
+    unique = list(dict.fromkeys(identifiers))
+    url = graphql_url or context.graphql_url
+    results: Dict[Identifier, Optional[Dict[str, Any]]] = {}
+
+    for batch in _batches(unique, batch_size, nodes_per_lookup, max_nodes):
+        query, aliases = build_lookup_query(batch, kind, fields)
+        headers, body = client.requester.requestJsonAndCheck(
+            "POST", url, input={"query": query}
+        )
+        data = body.get("data")
+        if data is None:
+            raise GithubException(400, body, headers)
+        for alias, ident in aliases.items():
+            repo_alias, node_alias = alias.split(".")
+            repo = data.get(repo_alias)
+            results[ident] = repo.get(node_alias) if repo else None  # type: ignore[index]
+    return results
+
+
+def lookup_issues(
+    client: Github,
+    identifiers: Iterable[IssueIdentifier],
+    *,
+    fields: str = DEFAULT_ISSUE_FIELDS,
+    batch_size: int = 100,
+    nodes_per_lookup: int = 1,
+    max_nodes: int = MAX_NODES,
+    graphql_url: Optional[str] = None,
+) -> Dict[IssueIdentifier, Optional[IssueNode]]:
+    """
+    Resolve many issues with as few GraphQL round-trips as possible.
+
+    Identifiers (from any number of repositories) are deduplicated and packed
+    into aliased queries of at most ``batch_size`` lookups, further reduced so
+    ``batch_size * nodes_per_lookup`` stays under ``max_nodes``. Raise
+    ``nodes_per_lookup`` when ``fields`` includes connections such as
+    ``labels(first: 20) { nodes { name } }``.
+
+    Args:
+        client (Github): Authenticated client (its transport layers apply).
+        identifiers (Iterable[IssueIdentifier]): Issues to resolve.
+        fields (str): GraphQL selection for each issue.
+        batch_size (int): Maximum lookups per query.
+        nodes_per_lookup (int): Estimated nodes each lookup can return.
+        max_nodes (int): Node budget per query.
+        graphql_url (str | None): GraphQL endpoint; defaults to ``context.graphql_url``.
+
+    Returns:
+        Dict[IssueIdentifier, IssueNode | None]: Results keyed by identifier;
+        None for issues that do not exist or are not visible.
+
+    Raises:
+        GithubException: If the API rejects a query outright.
+    """
+    raw = _lookup(
+        client,
+        identifiers,
+        "issue",
+        fields,
+        batch_size,
+        nodes_per_lookup,
+        max_nodes,
+        graphql_url,
+    )
+    return {ident: _issue_node(data) if data else None for ident, data in raw.items()}
+
+
+def lookup_pull_requests(
+    client: Github,
+    identifiers: Iterable[PullRequestIdentifier],
+    *,
+    fields: str = DEFAULT_PULL_REQUEST_FIELDS,
+    batch_size: int = 100,
+    nodes_per_lookup: int = 1,
+    max_nodes: int = MAX_NODES,
+    graphql_url: Optional[str] = None,
+) -> Dict[PullRequestIdentifier, Optional[PullRequestNode]]:
+    """
+    Resolve many pull requests with as few GraphQL round-trips as possible.
+
+    See ``lookup_issues`` for batching rules.
+
+    Args:
+        client (Github): Authenticated client (its transport layers apply).
+        identifiers (Iterable[PullRequestIdentifier]): Pull requests to resolve.
+        fields (str): GraphQL selection for each pull request.
+        batch_size (int): Maximum lookups per query.
+        nodes_per_lookup (int): Estimated nodes each lookup can return.
+        max_nodes (int): Node budget per query.
+        graphql_url (str | None): GraphQL endpoint; defaults to ``context.graphql_url``.
+
+    Returns:
+        Dict[PullRequestIdentifier, PullRequestNode | None]: Results keyed by
+        identifier; None for pull requests that do not exist or are not visible.
+
+    Raises:
+        GithubException: If the API rejects a query outright.
+    """
+    raw = _lookup(
+        client,
+        identifiers,
+        "pullRequest",
+        fields,
+        batch_size,
+        nodes_per_lookup,
+        max_nodes,
+        graphql_url,
+    )
+    return {
+        ident: _pull_request_node(data) if data else None for ident, data in raw.items()
+    }
@@ -0,0 +1,247 @@
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Dict, Optional
+
+from requests import PreparedRequest, Response
+from requests.adapters import BaseAdapter
+from requests.structures import CaseInsensitiveDict
+
+from .transport import DelegatingAdapter
+
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+# Describe the raw transfer, not the decoded body we store.
+_TRANSFER_HEADERS = {"content-encoding", "content-length", "transfer-encoding"}
+
+
+@dataclass
+class CacheEntry:
+    """
+    A cached HTTP response.
+
+    Attributes:
+        status (int): HTTP status code of the original response.
+        headers (Dict[str, str]): Response headers, without transfer-encoding headers.
+        body (bytes): Decoded response body.
+    """
+
+    status: int
+    headers: Dict[str, str] = field(default_factory=dict)
+    body: bytes = b""
+
+
+def default_cache_dir() -> str:
+    """
+    Return the default on-disk cache directory.
+
+    Returns:
+        str: ``$RUNNER_TEMP/gh-http-cache``, or a directory under the system temp dir.
+    """
+    base = os.getenv("RUNNER_TEMP") or tempfile.gettempdir()
+    return os.path.join(base, "gh-http-cache")
+
+
+class DiskCache:
+    """
+    Size-bounded, thread-safe on-disk store for HTTP responses with LRU eviction.
+
+    Each entry is one file (a JSON header line followed by the body). Recency is
+    tracked through file mtimes, so an ``actions/cache``-restored directory
+    keeps its LRU order across runs.
+
+    Attributes:
+        directory (str): Directory holding the entries.
+        max_bytes (int): Total size above which least recently used entries are evicted.
+    """
+
+    _SUFFIX = ".entry"
+
+    def __init__(
+        self, directory: Optional[str] = None, max_bytes: int = DEFAULT_MAX_BYTES
+    ) -> None:
+        self.directory = directory or default_cache_dir()
+        self.max_bytes = max_bytes
+        os.makedirs(self.directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._index: "OrderedDict[str, int]" = OrderedDict()
+        self._size = 0
+
+        names = [n for n in os.listdir(self.directory) if n.endswith(self._SUFFIX)]
+        stats = [(n, os.stat(os.path.join(self.directory, n))) for n in names]
+        for name, st in sorted(stats, key=lambda item: item[1].st_mtime):
+            self._index[name[: -len(self._SUFFIX)]] = st.st_size
+            self._size += st.st_size
+
+    @property
+    def size(self) -> int:
+        """Total bytes currently stored."""
+        return self._size
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def _path(self, digest: str) -> str:
+        return os.path.join(self.directory, digest + self._SUFFIX)
+
+    @staticmethod
+    def _digest(key: str) -> str:
+        return hashlib.sha256(key.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+        """
+        Read an entry and mark it as most recently used.
+
+        Args:
+            key (str): Cache key.
+
+        Returns:
+            CacheEntry | None: The entry, or None if absent or unreadable.
+        """
+        digest = self._digest(key)
+        with self._lock:
+            if digest not in self._index:
+                return None
+            path = self._path(digest)
+            try:
+                with open(path, "rb") as f:
+                    meta = json.loads(f.readline())
+                    body = f.read()
+                os.utime(path)
+            except (OSError, ValueError):
+                self._size -= self._index.pop(digest)
+                return None
+            self._index.move_to_end(digest)
+        return CacheEntry(status=meta["status"], headers=meta["headers"], body=body)
+
+    def put(self, key: str, entry: CacheEntry) -> None:
+        """
+        Store an entry atomically, then evict old entries beyond ``max_bytes``.
+
+        Args:
+            key (str): Cache key.
+            entry (CacheEntry): Response to store.
+        """
+        digest = self._digest(key)
+        meta = json.dumps({"status": entry.status, "headers": entry.headers})
+        data = meta.encode("utf-8") + b"\n" + entry.body
+        if len(data) > self.max_bytes:
+            return
+
+        fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        with self._lock:
+            os.replace(tmp, self._path(digest))
+            self._size += len(data) - self._index.pop(digest, 0)
+            self._index[digest] = len(data)
+            while self._size > self.max_bytes and self._index:
+                oldest, size = self._index.popitem(last=False)
+                self._size -= size
+                try:
+                    os.remove(self._path(oldest))
+                except OSError:
+                    pass
+
+    def clear(self) -> None:
+        """Remove every entry."""
+        with self._lock:
+            for digest in self._index:
+                try:
+                    os.remove(self._path(digest))
+                except OSError:
+                    pass
+            self._index.clear()
+            self._size = 0
+
+
+class CachingAdapter(DelegatingAdapter):
+    """
+    Transport adapter adding ETag / Last-Modified conditional requests.
+
+    GET responses carrying a validator are stored in a ``DiskCache``. Later
+    identical GETs are sent with ``If-None-Match`` / ``If-Modified-Since``; a
+    ``304 Not Modified`` (which GitHub does not count against the rate limit)
+    is answered from the cache with the fresh response headers merged in.
+
+    The cache key covers the URL, ``Accept`` and ``Authorization`` headers, so
+    different tokens never share entries.
+
+    Attributes:
+        cache (DiskCache): Backing store.
+        hits (int): Requests answered from the cache after a 304.
+        misses (int): Cacheable requests that returned a full response.
+    """
+
+    def __init__(self, inner: BaseAdapter, cache: DiskCache) -> None:
+        super().__init__(inner)
+        self.cache = cache
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _key(request: PreparedRequest) -> str:
+        return "\n".join(
+            (
+                str(request.url),
+                request.headers.get("Accept", ""),
+                request.headers.get("Authorization", ""),
+            )
+        )
+
+    def send(self, request: PreparedRequest, **kwargs: Any) -> Response:  # type: ignore[override]
+        if request.method != "GET" or kwargs.get("stream"):
+            return self.inner.send(request, **kwargs)
+
+        key = self._key(request)
+        entry = self.cache.get(key)
+        if entry is not None:
+            etag = entry.headers.get("etag")
+            last_modified = entry.headers.get("last-modified")
+            if etag and "If-None-Match" not in request.headers:
+                request.headers["If-None-Match"] = etag
+            if last_modified and "If-Modified-Since" not in request.headers:
+                request.headers["If-Modified-Since"] = last_modified
+
+        response = self.inner.send(request, **kwargs)
+
+        if response.status_code == 304 and entry is not None:
+            self.hits += 1
+            return self._from_entry(entry, request, response)
+
+        if response.status_code == 200:
+            self.misses += 1
+            headers = {
+                k.lower(): v
+                for k, v in response.headers.items()
+                if k.lower() not in _TRANSFER_HEADERS
+            }
+            if "etag" in headers or "last-modified" in headers:
+                self.cache.put(key, CacheEntry(200, headers, response.content))
+        return response
+
+    @staticmethod
+    def _from_entry(
+        entry: CacheEntry, request: PreparedRequest, not_modified: Response
+    ) -> Response:
+        headers = dict(entry.headers)
+        headers.update(
+            (k.lower(), v)
+            for k, v in not_modified.headers.items()
+            if k.lower() not in _TRANSFER_HEADERS
+        )
+        response = Response()
+        response.status_code = entry.status
+        response.reason = "OK"
+        response.headers = CaseInsensitiveDict(headers)
+        response._content = entry.body
+        response.url = str(request.url)
+        response.request = request
+        response.encoding = not_modified.encoding or "utf-8"
+        response.connection = not_modified.connection
+        not_modified.close()
+        return response
@@ -0,0 +1,387 @@
+import errno
+import os
+import shutil
+import stat
+import sys
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, Callable, Iterator, List, Optional, Set, Tuple
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None  # type: ignore[assignment]
+
+# ioctl(dst, FICLONE, src): share extents on btrfs, XFS, bcachefs, overlayfs...
+_FICLONE = getattr(fcntl, "FICLONE", 0x40049409)
+
+# Errors meaning "this copy method does not work here", as opposed to real I/O errors.
+_UNSUPPORTED = {
+    errno.EXDEV,
+    errno.EINVAL,
+    errno.ENOTSUP,
+    errno.EOPNOTSUPP,
+    errno.ENOSYS,
+    errno.ENOTTY,
+    errno.EBADF,
+    errno.EPERM,
+}
+
+_CHUNK = 64 * 1024 * 1024
+# Files handed to a worker per task; per-file futures cost more than copying small files.
+_BATCH = 64
+
+# (source, destination) pairs for tree operations.
+_Job = Tuple[str, str]
+
+# (method, st_dev) pairs already known not to work, so each is tried once per filesystem.
+_disabled: Set[Tuple[str, int]] = set()
+
+
+def _try(method: str, dev: int, fn: Callable[[], None]) -> bool:
+    if (method, dev) in _disabled:
+        return False
+    try:
+        fn()
+        return True
+    except OSError as exc:
+        if exc.errno not in _UNSUPPORTED:
+            raise
+        _disabled.add((method, dev))
+        return False
+
+
+def _copy_data(src: int, dst: int, size: int, dev: int) -> str:
+    """Copy ``size`` bytes between file descriptors; return the method used."""
+    attempted = False
+
+    def rewind() -> None:
+        # A failed attempt may have moved the offsets or written a partial copy.
+        nonlocal attempted
+        if attempted:
+            os.lseek(src, 0, os.SEEK_SET)
+            os.lseek(dst, 0, os.SEEK_SET)
+            os.ftruncate(dst, 0)
+        attempted = True
+
+    def reflink() -> None:
+        rewind()
+        fcntl.ioctl(dst, _FICLONE, src)
+
+    def copy_file_range() -> None:
+        rewind()
+        copied = 0
+        while copied < size:
+            n = os.copy_file_range(src, dst, min(_CHUNK, size - copied))
+            if n == 0:
+                break
+            copied += n
+
+    def sendfile() -> None:
+        rewind()
+        offset = 0
+        while offset < size:
+            n = os.sendfile(dst, src, offset, min(_CHUNK, size - offset))
+            if n == 0:
+                break
+            offset += n
+
+    if size and fcntl is not None and _try("reflink", dev, reflink):
+        return "reflink"
+    if size and hasattr(os, "copy_file_range") and _try("copy_file_range", dev, copy_file_range):
+        return "copy_file_range"
+    if size and hasattr(os, "sendfile") and _try("sendfile", dev, sendfile):
+        return "sendfile"
+    rewind()
+    while True:
+        block = os.read(src, 1024 * 1024)
+        if not block:
+            return "read/write"
+        os.write(dst, block)
+
+
+def copy_file(source: str, dest: str, *, preserve: bool = True) -> str:
+    """
+    Copy one file using the fastest mechanism the filesystem supports.
+
+    Tries, in order: a reflink (``FICLONE``, copy-on-write extent sharing),
+    ``os.copy_file_range`` (in-kernel, may be offloaded to the filesystem or
+    NFS server), ``os.sendfile`` and finally a read/write loop. A mechanism
+    that fails as unsupported is not tried again on that filesystem.
+
+    Args:
+        source (str): File to copy (symlinks are followed).
+        dest (str): Destination file path (overwritten).
+        preserve (bool): Copy permission bits and timestamps, like ``shutil.copy2``.
+
+    Returns:
+        str: The mechanism used (``reflink``, ``copy_file_range``, ``sendfile`` or ``read/write``).
+    """
+    src = os.open(source, os.O_RDONLY | getattr(os, "O_BINARY", 0))
+    try:
+        st = os.fstat(src)
+        flags = os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_BINARY", 0)
+        dst = os.open(dest, flags, 0o666)
+        try:
+            method = _copy_data(src, dst, st.st_size, st.st_dev)
+            if preserve:
+                if hasattr(os, "fchmod"):
+                    os.fchmod(dst, stat.S_IMODE(st.st_mode))
+                else:  # pragma: no cover - Windows
+                    os.chmod(dest, stat.S_IMODE(st.st_mode))
+        finally:
+            os.close(dst)
+    finally:
+        os.close(src)
+    if preserve:
+        os.utime(dest, ns=(st.st_atime_ns, st.st_mtime_ns))
+    return method
+
+
+def _default_workers() -> int:
+    return min(32, (os.cpu_count() or 1) + 4)
+
+
+def mkdir_p(path: str) -> None:
+    """Create a directory and any missing parents (no error if it exists)."""
+    os.makedirs(path, exist_ok=True)
+
+
+def _run_batched(jobs: Iterator[_Job], fn: Callable[[str, str], None], workers: int, name: str) -> None:
+    """Apply ``fn`` to every job, in batches on a pool with at most ``2 * workers`` in flight."""
+    if workers <= 1:
+        for job in jobs:
+            fn(*job)
+        return
+
+    def run(batch: List[_Job]) -> None:
+        for job in batch:
+            fn(*job)
+
+    pending: Set[Future] = set()
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix=name) as pool:
+        batch: List[_Job] = []
+        for job in jobs:
+            batch.append(job)
+            if len(batch) < _BATCH:
+                continue
+            if len(pending) >= 2 * workers:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    future.result()
+            pending.add(pool.submit(run, batch))
+            batch = []
+        if batch:
+            pending.add(pool.submit(run, batch))
+        for future in pending:
+            future.result()
+
+
+def _copy_tree(source: str, dest: str, workers: Optional[int], preserve: bool) -> None:
+    directories: List[_Job] = []
+
+    def files() -> Iterator[_Job]:
+        stack = [(source, dest)]
+        while stack:
+            src_dir, dst_dir = stack.pop()
+            os.makedirs(dst_dir, exist_ok=True)
+            directories.append((src_dir, dst_dir))
+            with os.scandir(src_dir) as it:
+                for entry in it:
+                    target = os.path.join(dst_dir, entry.name)
+                    if entry.is_symlink():
+                        if os.path.lexists(target):
+                            os.unlink(target)
+                        os.symlink(os.readlink(entry.path), target)
+                    elif entry.is_dir():
+                        stack.append((entry.path, target))
+                    else:
+                        yield entry.path, target
+
+    def copy(src: str, dst: str) -> None:
+        copy_file(src, dst, preserve=preserve)
+
+    _run_batched(files(), copy, workers or _default_workers(), "io-copy")
+    if preserve:
+        # Directory timestamps change while they are filled, so apply them last.
+        for src_dir, dst_dir in reversed(directories):
+            shutil.copystat(src_dir, dst_dir)
+
+
+def cp(
+    source: str,
+    dest: str,
+    *,
+    recursive: bool = False,
+    force: bool = True,
+    copy_source_directory: bool = True,
+    preserve: bool = True,
+    workers: Optional[int] = None,
+) -> None:
+    """
+    Copy a file or directory, like ``@actions/io`` ``cp``.
+
+    Directory trees are copied with files spread over a thread pool, each
+    through ``copy_file`` (reflink / ``copy_file_range`` / ``sendfile``).
+    Symlinks inside a tree are recreated, not followed.
+
+    Args:
+        source (str): File or directory to copy.
+        dest (str): Target path. If it is an existing directory, ``source`` is
+            copied into it (unless ``copy_source_directory`` is False for a
+            directory source, in which case its contents are copied).
+        recursive (bool): Required to copy directories.
+        force (bool): Overwrite an existing destination file.
+        copy_source_directory (bool): Copy the directory itself rather than its contents.
+        preserve (bool): Keep permission bits and timestamps.
+        workers (int | None): Copy threads; defaults to ``min(32, cpu + 4)``.
+
+    Raises:
+        FileNotFoundError: If ``source`` does not exist.
+        IsADirectoryError: If ``source`` is a directory and ``recursive`` is False.
+        FileExistsError: If the destination file exists and ``force`` is False.
+    """
+    if not os.path.exists(source):
+        raise FileNotFoundError(f"no such file or directory: {source}")
+    source_is_dir = os.path.isdir(source)
+    if source_is_dir and not recursive:
+        raise IsADirectoryError(f"Failed to copy. {source} is a directory, but tried to copy without recursive flag.")
+
+    target = dest
+    if os.path.isdir(dest) and (not source_is_dir or copy_source_directory):
+        target = os.path.join(dest, os.path.basename(os.path.normpath(source)))
+
+    if source_is_dir:
+        _copy_tree(source, target, workers, preserve)
+        return
+    if os.path.exists(target) and not force:
+        raise FileExistsError(f"Destination already exists: {target}")
+    os.makedirs(os.path.dirname(os.path.abspath(target)), exist_ok=True)
+    copy_file(source, target, preserve=preserve)
+
+
+def mv(source: str, dest: str, *, force: bool = True, workers: Optional[int] = None) -> None:
+    """
+    Move a file or directory, like ``@actions/io`` ``mv``.
+
+    A rename is used when possible; across filesystems the source is copied
+    with ``cp`` and then removed with ``rm_rf``.
+
+    Args:
+        source (str): File or directory to move.
+        dest (str): Target path; an existing directory receives ``source`` inside it.
+        force (bool): Replace an existing destination.
+        workers (int | None): Threads for the cross-filesystem fallback.
+
+    Raises:
+        FileNotFoundError: If ``source`` does not exist.
+        FileExistsError: If the destination exists and ``force`` is False.
+    """
+    if not os.path.lexists(source):
+        raise FileNotFoundError(f"no such file or directory: {source}")
+    target = dest
+    if os.path.isdir(dest):
+        target = os.path.join(dest, os.path.basename(os.path.normpath(source)))
+    if os.path.lexists(target):
+        if not force:
+            raise FileExistsError(f"Destination already exists: {target}")
+        rm_rf(target)
+    os.makedirs(os.path.dirname(os.path.abspath(target)), exist_ok=True)
+    try:
+        os.rename(source, target)
+    except OSError as exc:
+        if exc.errno != errno.EXDEV:
+            raise
+        cp(source, target, recursive=True, copy_source_directory=False, workers=workers)
+        rm_rf(source, workers=workers)
+
+
+def _on_rm_error(func: Callable[[str], Any], path: str, exc: object) -> None:
+    # Read-only entries (common on Windows, and in Go module caches) block removal.
+    os.chmod(path, stat.S_IWRITE | stat.S_IREAD | stat.S_IEXEC)
+    func(path)
+
+
+def rm_rf(path: str, *, workers: Optional[int] = None) -> None:
+    """
+    Remove a file or directory tree, like ``rm -rf`` (no error if missing).
+
+    Files are unlinked on a thread pool, then directories are removed
+    bottom-up. Read-only entries are made writable and retried.
+
+    Args:
+        path (str): Path to remove. Symlinks are removed, never followed.
+        workers (int | None): Threads; defaults to ``min(32, cpu + 4)``, ``1`` uses ``shutil.rmtree``.
+    """
+    if not os.path.lexists(path):
+        return
+    if os.path.islink(path) or not os.path.isdir(path):
+        try:
+            os.unlink(path)
+        except PermissionError:
+            _on_rm_error(os.unlink, path, None)
+        return
+
+    workers = workers or _default_workers()
+    if workers <= 1:
+        if sys.version_info >= (3, 12):
+            shutil.rmtree(path, onexc=_on_rm_error)
+        else:
+            shutil.rmtree(path, onerror=_on_rm_error)
+        return
+
+    def unlink(file_path: str, _: str) -> None:
+        try:
+            os.unlink(file_path)
+        except FileNotFoundError:
+            pass
+        except PermissionError:
+            _on_rm_error(os.unlink, file_path, None)
+
+    directories: List[str] = []
+
+    def files() -> Iterator[_Job]:
+        stack = [path]
+        while stack:
+            current = stack.pop()
+            directories.append(current)
+            try:
+                it = os.scandir(current)
+            except PermissionError:
+                os.chmod(current, stat.S_IRWXU)
+                it = os.scandir(current)
+            with it:
+                for entry in it:
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(entry.path)
+                    else:
+                        yield entry.path, ""
+
+    _run_batched(files(), unlink, workers, "io-rm")
+    for directory in reversed(directories):
+        try:
+            os.rmdir(directory)
+        except PermissionError:
+            _on_rm_error(os.rmdir, directory, None)
+
+
+def which(tool: str, check: bool = False) -> Optional[str]:
+    """
+    Locate an executable on ``PATH``.
+
+    Nothing is cached: a lookup is a few ``stat`` calls, and tools installed
+    or added with ``add_path`` later in the step are found.
+
+    Args:
+        tool (str): Executable name or path.
+        check (bool): Raise instead of returning None when not found.
+
+    Returns:
+        str | None: Full path of the executable, or None.
+
+    Raises:
+        FileNotFoundError: If ``check`` is True and the tool is not found.
+    """
+    found = shutil.which(tool)
+    if found is None and check:
+        raise FileNotFoundError(f"Unable to locate executable file: {tool}")
+    return found
@@ -0,0 +1,177 @@
+import atexit
+import logging
+import os
+import queue
+from logging.handlers import QueueHandler, QueueListener
+from typing import Any, Dict, Mapping, Optional
+
+from . import actions_core
+from .actions_core import debug, error, info, notice, warning
+
+# Lowest level mapped to each command; a record uses the highest threshold at or below its level.
+DEFAULT_LEVELS: Mapping[int, str] = {
+    logging.NOTSET: "debug",
+    logging.INFO: "info",
+    logging.WARNING: "warning",
+    logging.ERROR: "error",
+}
+
+_EMITTERS = {"warning": warning, "error": error, "notice": notice}
+
+
+class WorkflowCommandHandler(logging.Handler):
+    """
+    ``logging`` handler writing records as workflow commands.
+
+    Levels map to ``debug`` / ``info`` (a plain line) / ``notice`` /
+    ``warning`` / ``error`` through ``levels``, merged over
+    ``DEFAULT_LEVELS``. Annotations (``notice``, ``warning``, ``error``)
+    carry the source location of the logging call as ``file``/``line`` when
+    that file lies inside ``GITHUB_WORKSPACE``; pass ``extra={"file": ...,
+    "line": ..., "col": ..., "title": ...}`` to point them elsewhere.
+
+    Writing happens on the calling thread; use ``install_logging_bridge`` to
+    move it to a background listener.
+
+    Attributes:
+        levels (Dict[int, str]): Level thresholds and their commands.
+        annotate_location (bool): Attach the logging call's file and line.
+    """
+
+    def __init__(
+        self,
+        level: int = logging.NOTSET,
+        *,
+        levels: Optional[Mapping[int, str]] = None,
+        annotate_location: bool = True,
+        workspace: Optional[str] = None,
+    ) -> None:
+        super().__init__(level)
+        self.levels: Dict[int, str] = dict(sorted({**DEFAULT_LEVELS, **(levels or {})}.items()))
+        self.annotate_location = annotate_location
+        root = workspace if workspace is not None else os.getenv("GITHUB_WORKSPACE")
+        self._workspace = os.path.realpath(root) if root else None
+        self._relative: Dict[str, Optional[str]] = {}
+
+    def command_for(self, levelno: int) -> str:
+        """Return the workflow command for a log level."""
+        command = "debug"
+        for threshold, name in self.levels.items():
+            if levelno >= threshold:
+                command = name
+        return command
+
+    def _location(self, pathname: str) -> Optional[str]:
+        relative = self._relative.get(pathname, "")
+        if relative != "":
+            return relative
+        relative = None
+        if self._workspace:
+            path = os.path.relpath(os.path.realpath(pathname), self._workspace)
+            if not path.startswith(".."):
+                relative = path.replace(os.sep, "/")
+        self._relative[pathname] = relative
+        return relative
+
+    def emit(self, record: logging.LogRecord) -> None:
+        try:
+            command = self.command_for(record.levelno)
+            if command == "debug":
+                if actions_core.is_debug():
+                    debug(self.format(record))
+                return
+            if command == "info":
+                info(self.format(record))
+                return
+            props: Dict[str, Any] = {"title": getattr(record, "title", None)}
+            file = getattr(record, "file", None)
+            if file is not None:
+                props.update(file=file, line=getattr(record, "line", None), col=getattr(record, "col", None))
+            elif self.annotate_location:
+                file = self._location(record.pathname)
+                if file is not None:
+                    props.update(file=file, line=record.lineno)
+            _EMITTERS[command](self.format(record), **props)
+        except Exception:
+            self.handleError(record)
+
+
+class LoggingBridge:
+    """
+    A ``WorkflowCommandHandler`` behind a ``QueueHandler`` / ``QueueListener`` pair.
+
+    Logging calls only enqueue the record; a listener thread formats it and
+    writes to stdout, so hot paths and worker threads never wait on output.
+    Records are written in the order they were logged. ``close()`` (also run
+    at exit) drains the queue.
+
+    Attributes:
+        logger (logging.Logger): The logger the queue handler is attached to.
+        handler (WorkflowCommandHandler): The handler run by the listener.
+        listener (QueueListener): The background listener.
+    """
+
+    def __init__(self, logger: logging.Logger, handler: WorkflowCommandHandler) -> None:
+        self.logger = logger
+        self.handler = handler
+        self._queue: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+        self.queue_handler = QueueHandler(self._queue)
+        if not actions_core.is_debug() and handler.command_for(logging.DEBUG) == "debug":
+            # Debug output would be discarded anyway; skip queueing it.
+            self.queue_handler.setLevel(max(handler.level, logging.INFO))
+        self.listener = QueueListener(self._queue, handler, respect_handler_level=True)
+
+    def start(self) -> "LoggingBridge":
+        self.logger.addHandler(self.queue_handler)
+        self.listener.start()
+        atexit.register(self.close)
+        return self
+
+    def close(self) -> None:
+        """Detach from the logger and write everything still queued (idempotent)."""
+        if self.queue_handler not in self.logger.handlers:
+            return
+        self.logger.removeHandler(self.queue_handler)
+        self.listener.stop()
+        atexit.unregister(self.close)
+
+    def __enter__(self) -> "LoggingBridge":
+        return self
+
+    def __exit__(self, exc_type: Any, exc: Any, tb: Any) -> None:
+        self.close()
+
+
+def install_logging_bridge(
+    logger: Optional[logging.Logger] = None,
+    *,
+    level: Optional[int] = None,
+    levels: Optional[Mapping[int, str]] = None,
+    annotate_location: bool = True,
+    fmt: Optional[str] = None,
+) -> LoggingBridge:
+    """
+    Route stdlib ``logging`` records to workflow commands without blocking callers.
+
+    Example:
+        install_logging_bridge(level=logging.INFO)
+        log.warning("deprecated option %s", name)   # ::warning file=src/app.py,line=42::deprecated option x
+
+    Args:
+        logger (logging.Logger | None): Logger to attach to; defaults to the root logger.
+        level (int | None): If given, also set the logger's level.
+        levels (Mapping[int, str] | None): Thresholds merged over ``DEFAULT_LEVELS``
+            (``{logging.INFO: "notice"}`` turns info records into notices).
+        annotate_location (bool): Attach the logging call's file and line to annotations.
+        fmt (str | None): ``logging.Formatter`` format for messages; defaults to ``%(message)s``.
+
+    Returns:
+        LoggingBridge: The running bridge; ``close()`` detaches it.
+    """
+    logger = logger or logging.getLogger()
+    if level is not None:
+        logger.setLevel(level)
+    handler = WorkflowCommandHandler(levels=levels, annotate_location=annotate_location)
+    if fmt is not None:
+        handler.setFormatter(logging.Formatter(fmt))
+    return LoggingBridge(logger, handler).start()
@@ -0,0 +1,279 @@
+import atexit
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Hashable, List, Mapping, Optional, Tuple, Union
+
+from . import actions_core
+from .actions_core import _write, append_summary
+
+KeySpec = Union[str, Callable[[str, Mapping[str, Any]], Hashable]]
+
+# Keys tracked per command before new keys share one overflow bucket.
+DEFAULT_MAX_KEYS = 10_000
+_OVERFLOW = "(other keys)"
+_KEY_PROPERTIES = ("title", "file")
+
+
+@dataclass(frozen=True)
+class LogPolicy:
+    """
+    Limits applied to one log command (``notice``, ``warning``, ``error``, ``debug``, ``info``).
+
+    Checks run in order: duplicates are dropped first, then sampling, then
+    the token bucket. Each applies per key (see ``key``).
+
+    Attributes:
+        rate (Optional[float]): Token-bucket refill, in messages per second.
+        burst (int): Token-bucket capacity (messages allowed at once).
+        first (Optional[int]): Emit the first N messages, then sample ``1/every``.
+        every (int): Keep one in ``every`` messages after the first N (1 keeps
+            all, 0 keeps none).
+        dedupe_window (Optional[float]): Seconds during which an identical
+            message (same text and properties) is dropped.
+        key (str | Callable): What the limits are counted per: ``"command"``
+            (default), ``"message"``, ``"title"``, ``"file"``, or a callable
+            ``(message, props) -> key``.
+    """
+
+    rate: Optional[float] = None
+    burst: int = 100
+    first: Optional[int] = None
+    every: int = 1
+    dedupe_window: Optional[float] = None
+    key: KeySpec = "command"
+
+
+@dataclass
+class LimitStats:
+    """
+    Counters for one command and key.
+
+    Attributes:
+        command (str): Log command.
+        key (str): Key the limits were counted per.
+        emitted (int): Messages written.
+        rate_limited (int): Messages dropped by the token bucket.
+        sampled (int): Messages dropped by first-N / 1-in-M sampling.
+        duplicates (int): Messages dropped as duplicates.
+    """
+
+    command: str
+    key: str
+    emitted: int = 0
+    rate_limited: int = 0
+    sampled: int = 0
+    duplicates: int = 0
+
+    @property
+    def dropped(self) -> int:
+        return self.rate_limited + self.sampled + self.duplicates
+
+
+@dataclass
+class _KeyState:
+    stats: LimitStats
+    tokens: float = 0.0
+    updated: float = 0.0
+    seen: int = 0
+
+
+class LogLimiter:
+    """
+    Rate limiting, sampling and deduplication for log emitters.
+
+    Installed with ``install_log_limits``, the limiter is consulted by every
+    ``actions_core`` emitter for the commands it has a policy for; other
+    commands (groups, outputs, masks...) are never touched. State per key is
+    bounded by ``max_keys`` (further keys share one bucket). Duplicate
+    windows remember at most ``max_keys`` recent messages per command, and
+    forget each one once its window has passed.
+
+    Example:
+        install_log_limits({
+            "warning": LogPolicy(first=100, every=50, key="title"),
+            "debug": LogPolicy(rate=200, burst=1000, dedupe_window=60),
+        })
+    """
+
+    def __init__(
+        self,
+        policies: Mapping[str, LogPolicy],
+        *,
+        max_keys: int = DEFAULT_MAX_KEYS,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.policies = dict(policies)
+        self._max_keys = max_keys
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._states: Dict[str, Dict[Hashable, _KeyState]] = {c: {} for c in self.policies}
+        # Last time each message was written, oldest first, per command.
+        self._recent: Dict[str, "OrderedDict[Hashable, float]"] = {c: OrderedDict() for c in self.policies}
+
+    @staticmethod
+    def _key(policy: LogPolicy, command: str, message: str, props: Mapping[str, Any]) -> Hashable:
+        spec = policy.key
+        if callable(spec):
+            return spec(message, props)
+        if spec == "command":
+            return command
+        if spec == "message":
+            return message
+        if spec in _KEY_PROPERTIES:
+            return props.get(spec)
+        raise ValueError(f"Unknown log limit key: {spec!r}")
+
+    def _state(self, command: str, key: Hashable, policy: LogPolicy, now: float) -> _KeyState:
+        states = self._states[command]
+        state = states.get(key)
+        if state is None:
+            if len(states) >= self._max_keys:
+                key = _OVERFLOW
+                state = states.get(key)
+            if state is None:
+                label = command if key == command else "(none)" if key is None else str(key)
+                state = states[key] = _KeyState(LimitStats(command, label), float(policy.burst), now)
+        return state
+
+    def allow(self, command: str, message: str, props: Mapping[str, Any]) -> bool:
+        """
+        Decide whether one message is written, and count it.
+
+        Args:
+            command (str): Log command.
+            message (str): Message text.
+            props (Mapping[str, Any]): Command properties (``title``, ``file``, ...).
+
+        Returns:
+            bool: True to write the message.
+        """
+        policy = self.policies.get(command)
+        if policy is None:
+            return True
+        now = self._clock()
+        key = self._key(policy, command, message, props)
+        with self._lock:
+            state = self._state(command, key, policy, now)
+            stats = state.stats
+            if policy.dedupe_window is not None:
+                recent = self._recent[command]
+                while recent and now - next(iter(recent.values())) >= policy.dedupe_window:
+                    recent.popitem(last=False)
+                fingerprint = (message, tuple(sorted((k, str(v)) for k, v in props.items() if v is not None)))
+                if fingerprint in recent:
+                    stats.duplicates += 1
+                    return False
+                recent[fingerprint] = now
+                while len(recent) > self._max_keys:
+                    recent.popitem(last=False)
+
+            state.seen += 1
+            if policy.first is not None or policy.every != 1:
+                past_first = state.seen - (policy.first or 0)
+                if past_first > 0 and (policy.every <= 0 or (past_first - 1) % policy.every):
+                    stats.sampled += 1
+                    return self._dropped(stats)
+
+            if policy.rate is not None:
+                state.tokens = min(float(policy.burst), state.tokens + (now - state.updated) * policy.rate)
+                state.updated = now
+                if state.tokens < 1:
+                    stats.rate_limited += 1
+                    return self._dropped(stats)
+                state.tokens -= 1
+            stats.emitted += 1
+            return True
+
+    @staticmethod
+    def _dropped(stats: LimitStats) -> bool:
+        if stats.rate_limited + stats.sampled == 1:
+            # Say once per key that output is being thinned, bypassing the limiter itself.
+            _write(f"[log limits] further '{stats.command}' messages for {stats.key} are limited; totals at the end\n")
+        return False
+
+    def stats(self) -> List[LimitStats]:
+        """Return the counters for every command and key seen, in first-seen order."""
+        with self._lock:
+            return [state.stats for states in self._states.values() for state in states.values()]
+
+    def to_markdown(self) -> str:
+        """Render a table of emitted and dropped messages (keys that dropped nothing are omitted)."""
+        rows = [s for s in self.stats() if s.dropped]
+        if not rows:
+            return ""
+        lines = [
+            "### Log limits",
+            "",
+            "| Command | Key | Emitted | Rate limited | Sampled out | Duplicates |",
+            "|---|---|--:|--:|--:|--:|",
+        ]
+        for s in rows:
+            key = s.key.replace("|", "\\|").replace("\n", " ")[:80]
+            lines.append(f"| {s.command} | {key} | {s.emitted} | {s.rate_limited} | {s.sampled} | {s.duplicates} |")
+        return "\n".join(lines) + "\n"
+
+    def report(self, *, summary: bool = True) -> Tuple[int, int]:
+        """
+        Log the drop totals and optionally append the table to the step summary.
+
+        Returns:
+            Tuple[int, int]: Messages emitted and dropped across all keys.
+        """
+        stats = self.stats()
+        emitted = sum(s.emitted for s in stats)
+        dropped = sum(s.dropped for s in stats)
+        if dropped:
+            _write(f"[log limits] {dropped} of {emitted + dropped} log messages were dropped\n")
+            if summary:
+                append_summary(self.to_markdown())
+        return emitted, dropped
+
+
+_installed: Optional[LogLimiter] = None
+_installed_summary = True
+_report_registered = False
+
+
+def _report_at_exit() -> None:
+    if _installed is not None:
+        _installed.report(summary=_installed_summary)
+
+
+def install_log_limits(
+    policies: Mapping[str, LogPolicy],
+    *,
+    summary: bool = True,
+    max_keys: int = DEFAULT_MAX_KEYS,
+) -> LogLimiter:
+    """
+    Limit log volume for the rest of the process.
+
+    Replaces any limiter installed before. At exit the drop counters are
+    logged and, with ``summary``, appended to the step summary as a table.
+
+    Args:
+        policies (Mapping[str, LogPolicy]): Policy per log command.
+        summary (bool): Append the drop table to the step summary at exit.
+        max_keys (int): Keys tracked per command before they share one bucket.
+
+    Returns:
+        LogLimiter: The installed limiter (its ``stats()`` can be inspected at any time).
+    """
+    global _installed, _installed_summary, _report_registered
+    limiter = LogLimiter(policies, max_keys=max_keys)
+    _installed, _installed_summary = limiter, summary
+    actions_core._log_filter = limiter.allow
+    if not _report_registered:
+        atexit.register(_report_at_exit)
+        _report_registered = True
+    return limiter
+
+
+def uninstall_log_limits() -> Optional[LogLimiter]:
+    """Remove the installed limiter without reporting; return it, if there was one."""
+    global _installed
+    limiter, _installed = _installed, None
+    actions_core._log_filter = None
+    return limiter
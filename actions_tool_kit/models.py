@@ -1,8 +1,10 @@
 from dataclasses import dataclass, field
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Iterable
 
+from .payload_query import select, select_many
 
-@dataclass
+
+@dataclass(frozen=True)
 class RepoIdentifier:
     """
     Identifies a GitHub repository by owner and name.
@@ -16,7 +18,7 @@ class RepoIdentifier:
     repo: str
 
 
-@dataclass
+@dataclass(frozen=True)
 class IssueIdentifier:
     """
     Identifies a GitHub issue by repository and issue number.
@@ -32,7 +34,7 @@ class IssueIdentifier:
     number: int
 
 
-@dataclass
+@dataclass(frozen=True)
 class PullRequestIdentifier:
     """
     Identifies a GitHub pull request by repository and PR number.
@@ -124,3 +126,33 @@ class WebhookPayload:
     installation: Optional[Dict[str, Any]] = None
     comment: Optional[Dict[str, Any]] = None
     extra: Dict[str, Any] = field(default_factory=dict)
+
+    def select(self, path: str, default: Any = None) -> Any:
+        """
+        Read a nested value with a precompiled path expression.
+
+        Example:
+            payload.select("pull_request.head.repo.full_name")
+            payload.select("commits[*].author.email")  # -> list
+
+        Args:
+            path (str): Dotted path; ``[*]`` fans out over lists and ``[N]`` indexes them.
+            default (Any): Value returned when a non-wildcard path does not resolve.
+
+        Returns:
+            Any: The resolved value, or a list of matches for wildcard paths.
+        """
+        return select(self, path, default)
+
+    def select_many(self, paths: Iterable[str], default: Any = None) -> Dict[str, Any]:
+        """
+        Read several nested values in a single traversal of the payload.
+
+        Args:
+            paths (Iterable[str]): Path expressions, see ``select``.
+            default (Any): Value used for non-wildcard paths that do not resolve.
+
+        Returns:
+            Dict[str, Any]: Results keyed by path expression.
+        """
+        return select_many(self, paths, default)
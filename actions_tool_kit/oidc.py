@@ -0,0 +1,170 @@
+import base64
+import binascii
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from typing import Dict, Optional, Tuple
+from urllib.parse import quote
+
+import requests
+
+from .actions_core import set_secret
+
+# Tokens are refreshed once fewer than this many seconds of validity remain.
+DEFAULT_MIN_TTL = 60.0
+_RETRIES = 3
+
+# audience -> (token, exp)
+_tokens: Dict[str, Tuple[str, float]] = {}
+_locks: Dict[str, threading.Lock] = {}
+_locks_guard = threading.Lock()
+
+
+def _expiry(token: str) -> Optional[float]:
+    """Return the ``exp`` claim of a JWT (the signature is not checked)."""
+    try:
+        payload = token.split(".")[1]
+        claims = json.loads(base64.urlsafe_b64decode(payload + "=" * (-len(payload) % 4)))
+        return float(claims["exp"])
+    except (IndexError, KeyError, TypeError, ValueError, binascii.Error):
+        return None
+
+
+def _request_env() -> Tuple[str, str]:
+    url = os.getenv("ACTIONS_ID_TOKEN_REQUEST_URL")
+    token = os.getenv("ACTIONS_ID_TOKEN_REQUEST_TOKEN")
+    if not url:
+        raise RuntimeError(
+            "Unable to get ACTIONS_ID_TOKEN_REQUEST_URL env variable; "
+            "the workflow needs 'permissions: id-token: write'"
+        )
+    if not token:
+        raise RuntimeError("Unable to get ACTIONS_ID_TOKEN_REQUEST_TOKEN env variable")
+    return url, token
+
+
+def _cache_path(url: str, audience: str) -> str:
+    # The request URL is specific to the job, so entries never outlive it.
+    digest = hashlib.sha256(f"{url}\0{audience}".encode()).hexdigest()[:32]
+    base = os.getenv("RUNNER_TEMP") or tempfile.gettempdir()
+    return os.path.join(base, "oidc-token-cache", f"{digest}.json")
+
+
+def _read_file_cache(path: str) -> Optional[Tuple[str, float]]:
+    try:
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        return str(data["value"]), float(data["exp"])
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+
+
+def _write_file_cache(path: str, token: str, exp: float) -> None:
+    directory = os.path.dirname(path)
+    os.makedirs(directory, mode=0o700, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=directory, suffix=".tmp")  # created 0600
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump({"value": token, "exp": exp}, f)
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+
+def _fetch(url: str, request_token: str, audience: str, timeout: float) -> str:
+    if audience:
+        url += f"&audience={quote(audience, safe='')}"
+    headers = {"Authorization": f"Bearer {request_token}", "Accept": "application/json"}
+    attempt = 0
+    while True:
+        try:
+            response = requests.get(url, headers=headers, timeout=timeout)
+            if response.status_code < 500 or attempt >= _RETRIES:
+                response.raise_for_status()
+                value = response.json().get("value")
+                if not value:
+                    raise RuntimeError("ID token response has no value field")
+                return str(value)
+        except (requests.ConnectionError, requests.Timeout):
+            if attempt >= _RETRIES:
+                raise
+        time.sleep(0.5 * 2**attempt)
+        attempt += 1
+
+
+def _lock_for(audience: str) -> threading.Lock:
+    with _locks_guard:
+        lock = _locks.get(audience)
+        if lock is None:
+            lock = _locks[audience] = threading.Lock()
+        return lock
+
+
+def get_id_token(
+    audience: Optional[str] = None,
+    *,
+    min_ttl: float = DEFAULT_MIN_TTL,
+    share_across_steps: bool = False,
+    timeout: float = 30.0,
+) -> str:
+    """
+    Return a GitHub OIDC ID token, like ``@actions/core`` ``getIDToken``.
+
+    Tokens are cached per audience until fewer than ``min_ttl`` seconds of
+    validity (the JWT ``exp`` claim) remain. Concurrent calls for the same
+    audience share one request. With ``share_across_steps`` the token is also
+    stored in a ``0600`` file under ``RUNNER_TEMP`` (removed with the job), so
+    later steps reuse it. Every token is registered with ``set_secret`` the
+    first time this process sees it.
+
+    Example:
+        aws_token = get_id_token("sts.amazonaws.com")
+        gcp_token = get_id_token("//iam.googleapis.com/projects/...")
+
+    Args:
+        audience (str | None): Audience (``aud`` claim); the default audience when omitted.
+        min_ttl (float): Seconds of validity a cached token must still have.
+        share_across_steps (bool): Also cache in a file for later steps of the job.
+        timeout (float): Seconds per HTTP request (up to three retries on 5xx or connection errors).
+
+    Returns:
+        str: The ID token (a JWT).
+
+    Raises:
+        RuntimeError: If the workflow lacks ``id-token: write`` or the response has no token.
+        requests.HTTPError: If the token endpoint answers with an error status.
+    """
+    audience = audience or ""
+    url, request_token = _request_env()
+    with _lock_for(audience):
+        now = time.time()
+        cached = _tokens.get(audience)
+        if cached is not None and cached[1] - now > min_ttl:
+            return cached[0]
+
+        path = _cache_path(url, audience) if share_across_steps else None
+        if path is not None:
+            stored = _read_file_cache(path)
+            if stored is not None and stored[1] - now > min_ttl:
+                set_secret(stored[0])
+                _tokens[audience] = stored
+                return stored[0]
+
+        token = _fetch(url, request_token, audience, timeout)
+        set_secret(token)
+        exp = _expiry(token)
+        if exp is not None:
+            _tokens[audience] = (token, exp)
+            if path is not None:
+                _write_file_cache(path, token, exp)
+        return token
+
+
+def clear_id_token_cache() -> None:
+    """Forget tokens cached in memory (files shared across steps are kept)."""
+    with _locks_guard:
+        _tokens.clear()
@@ -1,3 +1,17 @@
+import gzip
+import json
+import os
+from collections import deque
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    Future,
+    ProcessPoolExecutor,
+    as_completed,
+    wait,
+)
+from itertools import islice
+from typing import IO, Deque, FrozenSet, Iterable, Iterator, List, Optional, Set, cast
+
 from .models import WebhookPayload, PayloadRepository, RepoOwner, Sender
 
 
@@ -75,3 +89,191 @@ def parse_payload(data: dict) -> WebhookPayload:
             }
         },
     )
+
+
+def _open_archive(path: str) -> IO[bytes]:
+    """Open an NDJSON archive for binary line reading, transparently un-gzipping it.
+
+    Args:
+        path: Path to a plain or gzip-compressed NDJSON file.
+
+    Returns:
+        A binary file object yielding raw lines.
+    """
+    with open(path, "rb") as f:
+        magic = f.read(2)
+    if magic == b"\x1f\x8b":
+        return cast(IO[bytes], gzip.open(path, "rb"))
+    return open(path, "rb")
+
+
+def _parse_chunk(
+    lines: List[bytes],
+    first_lineno: int,
+    event_types: Optional[FrozenSet[str]],
+    actions: Optional[FrozenSet[str]],
+    event_key: str,
+    payload_key: str,
+) -> List[WebhookPayload]:
+    """Decode, filter and parse one chunk of NDJSON records.
+
+    Runs inside pool workers, so it only takes picklable arguments. Filters are
+    applied on the decoded dict, before any dataclass is constructed.
+
+    Args:
+        lines: Raw NDJSON lines.
+        first_lineno: 1-based line number of ``lines[0]`` in the archive, for errors.
+        event_types: Allowed event names, or None to accept all.
+        actions: Allowed ``action`` values, or None to accept all.
+        event_key: Envelope key holding the event name.
+        payload_key: Envelope key holding the webhook body.
+
+    Returns:
+        Parsed payloads for the records that passed the filters, in input order.
+
+    Raises:
+        ValueError: If a line is not valid JSON or not a JSON object.
+    """
+    parsed: List[WebhookPayload] = []
+    for offset, line in enumerate(lines):
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError as exc:
+            raise ValueError(
+                f"Invalid JSON record on line {first_lineno + offset}: {exc}"
+            ) from exc
+        if not isinstance(record, dict):
+            raise ValueError(
+                f"Record on line {first_lineno + offset} is not a JSON object"
+            )
+
+        if isinstance(record.get(payload_key), dict):
+            event = record.get(event_key)
+            data = record[payload_key]
+        else:
+            event = None
+            data = record
+
+        if event_types is not None and event not in event_types:
+            continue
+        if actions is not None and data.get("action") not in actions:
+            continue
+        parsed.append(parse_payload(data))
+    return parsed
+
+
+def _chunks(stream: IO[bytes], chunk_size: int) -> Iterator[List[bytes]]:
+    """Yield successive lists of at most ``chunk_size`` raw lines."""
+    while True:
+        chunk = list(islice(stream, chunk_size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def iter_payload_archive(
+    path: str,
+    *,
+    event_types: Optional[Iterable[str]] = None,
+    actions: Optional[Iterable[str]] = None,
+    workers: Optional[int] = None,
+    chunk_size: int = 1000,
+    ordered: bool = True,
+    event_key: str = "event",
+    payload_key: str = "payload",
+) -> Iterator[WebhookPayload]:
+    """
+    Stream and parse an archive of webhook deliveries stored as NDJSON.
+
+    Each line is either a bare webhook body or an envelope such as
+    ``{"event": "push", "payload": {...}}``. The archive may be gzip-compressed;
+    this is detected from the file content, not the extension.
+
+    Lines are read lazily in chunks of ``chunk_size`` and parsed across a
+    process pool. At most ``2 * workers`` chunks are in flight at any time, so
+    memory stays bounded regardless of archive size.
+
+    Args:
+        path (str): Path to the NDJSON archive (optionally gzip-compressed).
+        event_types (Iterable[str] | None): Only yield envelopes whose event name is listed.
+            Bare records carry no event name and are skipped when this is set.
+        actions (Iterable[str] | None): Only yield payloads whose ``action`` is listed.
+        workers (int | None): Number of worker processes. Defaults to ``os.cpu_count()``;
+            ``0`` or ``1`` parses in the calling process.
+        chunk_size (int): Number of lines sent to a worker at once.
+        ordered (bool): If True, yield payloads in archive order. If False, yield
+            chunks as soon as they are parsed.
+        event_key (str): Envelope key holding the event name.
+        payload_key (str): Envelope key holding the webhook body.
+
+    Yields:
+        WebhookPayload: One parsed payload per record that passed the filters.
+
+    Raises:
+        ValueError: If ``chunk_size`` is not positive or a record is not a valid JSON object.
+    """
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be a positive integer")
+
+    type_filter = frozenset(event_types) if event_types is not None else None
+    action_filter = frozenset(actions) if actions is not None else None
+    if workers is None:
+        workers = os.cpu_count() or 1
+
+    with _open_archive(path) as stream:
+        chunks = _chunks(stream, chunk_size)
+
+        if workers <= 1:
+            lineno = 1
+            for chunk in chunks:
+                yield from _parse_chunk(
+                    chunk, lineno, type_filter, action_filter, event_key, payload_key
+                )
+                lineno += len(chunk)
+            return
+
+        max_pending = 2 * workers
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            lineno = 1
+            if ordered:
+                queue: Deque[Future] = deque()
+                for chunk in chunks:
+                    queue.append(
+                        pool.submit(
+                            _parse_chunk,
+                            chunk,
+                            lineno,
+                            type_filter,
+                            action_filter,
+                            event_key,
+                            payload_key,
+                        )
+                    )
+                    lineno += len(chunk)
+                    if len(queue) >= max_pending:
+                        yield from queue.popleft().result()
+                while queue:
+                    yield from queue.popleft().result()
+            else:
+                pending: Set[Future] = set()
+                for chunk in chunks:
+                    pending.add(
+                        pool.submit(
+                            _parse_chunk,
+                            chunk,
+                            lineno,
+                            type_filter,
+                            action_filter,
+                            event_key,
+                            payload_key,
+                        )
+                    )
+                    lineno += len(chunk)
+                    if len(pending) >= max_pending:
+                        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                        for future in done:
+                            yield from future.result()
+                for future in as_completed(pending):
+                    yield from future.result()
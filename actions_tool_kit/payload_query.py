@@ -0,0 +1,253 @@
+import re
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Tuple
+
+# A compiled step is ("key", name), ("index", position) or ("wildcard", None).
+Step = Tuple[str, Any]
+
+_MISSING = object()
+_SEGMENT = re.compile(r"([^.\[\]]+)?((?:\[(?:\*|-?\d+)\])*)")
+_SUBSCRIPT = re.compile(r"\[(\*|-?\d+)\]")
+
+
+def _parse(path: str) -> Tuple[Step, ...]:
+    """
+    Split a dotted path expression into compiled steps.
+
+    Args:
+        path (str): Expression such as ``pull_request.head.sha`` or ``commits[*].author.email``.
+
+    Returns:
+        Tuple[Step, ...]: Steps to apply from the root object.
+
+    Raises:
+        ValueError: If the expression is empty or malformed.
+    """
+    if not path or not path.strip():
+        raise ValueError("Path expression must not be empty")
+
+    steps: List[Step] = []
+    for segment in path.split("."):
+        match = _SEGMENT.fullmatch(segment)
+        if not match or not segment:
+            raise ValueError(f"Invalid path expression: {path!r}")
+        name, subscripts = match.groups()
+        if name:
+            steps.append(("key", name))
+        for token in _SUBSCRIPT.findall(subscripts):
+            steps.append(("wildcard", None) if token == "*" else ("index", int(token)))
+    return tuple(steps)
+
+
+def _lookup(obj: Any, key: str) -> Any:
+    """Read ``key`` from a dict, or from a payload dataclass (falling back to its ``extra``)."""
+    if isinstance(obj, dict):
+        return obj.get(key, _MISSING)
+    fields = getattr(obj, "__dataclass_fields__", None)
+    if fields is not None:
+        if key in fields:
+            return getattr(obj, key)
+        extra = getattr(obj, "extra", None)
+        if isinstance(extra, dict):
+            return extra.get(key, _MISSING)
+    return _MISSING
+
+
+def _apply(step: Step, values: List[Any]) -> List[Any]:
+    """Apply one step to every current value, dropping values where it does not resolve."""
+    kind, arg = step
+    out: List[Any] = []
+    for value in values:
+        if value is None:
+            continue
+        if kind == "key":
+            found = _lookup(value, arg)
+            if found is not _MISSING:
+                out.append(found)
+        elif isinstance(value, (list, tuple)):
+            if kind == "wildcard":
+                out.extend(value)
+            elif -len(value) <= arg < len(value):
+                out.append(value[arg])
+    return out
+
+
+class PathQuery:
+    """
+    A compiled path expression over a webhook payload.
+
+    Obtain instances through ``compile_path`` so identical expressions share one
+    compiled object.
+
+    Attributes:
+        path (str): The original expression.
+        steps (Tuple[Step, ...]): The compiled steps.
+        multi (bool): True if the expression contains a ``[*]`` wildcard and
+            therefore evaluates to a list.
+    """
+
+    __slots__ = ("path", "steps", "multi")
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self.steps = _parse(path)
+        self.multi = any(kind == "wildcard" for kind, _ in self.steps)
+
+    def evaluate(self, root: Any, default: Any = None) -> Any:
+        """
+        Evaluate the expression against a payload.
+
+        Args:
+            root (Any): A ``WebhookPayload``, nested dataclass or plain dict.
+            default (Any): Value returned when a non-wildcard path does not resolve.
+
+        Returns:
+            Any: The resolved value, ``default`` if missing, or a list of matches
+            for wildcard expressions (empty if nothing matched).
+        """
+        values = [root]
+        for step in self.steps:
+            values = _apply(step, values)
+            if not values:
+                break
+        if self.multi:
+            return values
+        return values[0] if values else default
+
+    def __repr__(self) -> str:
+        return f"PathQuery({self.path!r})"
+
+
+class _Node:
+    """Trie node shared by all paths with a common step prefix."""
+
+    __slots__ = ("children", "terminals")
+
+    def __init__(self) -> None:
+        self.children: Dict[Step, "_Node"] = {}
+        self.terminals: List[str] = []
+
+
+class PathSet:
+    """
+    Several compiled path expressions evaluated together in a single traversal.
+
+    Common prefixes (``pull_request.head.*``) are resolved once and shared.
+    Obtain instances through ``compile_paths``.
+
+    Attributes:
+        paths (Tuple[str, ...]): The expressions, in the order given.
+    """
+
+    def __init__(self, paths: Tuple[str, ...]) -> None:
+        self.paths = paths
+        self._root = _Node()
+        for path in paths:
+            node = self._root
+            for step in compile_path(path).steps:
+                node = node.children.setdefault(step, _Node())
+            node.terminals.append(path)
+
+    def evaluate(self, root: Any, default: Any = None) -> Dict[str, Any]:
+        """
+        Evaluate every expression against a payload.
+
+        Args:
+            root (Any): A ``WebhookPayload``, nested dataclass or plain dict.
+            default (Any): Value used for non-wildcard paths that do not resolve.
+
+        Returns:
+            Dict[str, Any]: Results keyed by path expression.
+        """
+        results: Dict[str, Any] = {}
+        self._walk(self._root, [root], False, default, results)
+        return results
+
+    def _walk(
+        self,
+        node: _Node,
+        values: List[Any],
+        multi: bool,
+        default: Any,
+        results: Dict[str, Any],
+    ) -> None:
+        for path in node.terminals:
+            results[path] = values if multi else (values[0] if values else default)
+        for step, child in node.children.items():
+            self._walk(
+                child,
+                _apply(step, values) if values else [],
+                multi or step[0] == "wildcard",
+                default,
+                results,
+            )
+
+
+@lru_cache(maxsize=1024)
+def compile_path(path: str) -> PathQuery:
+    """
+    Compile (or fetch from cache) a path expression.
+
+    Supported syntax: dotted keys, ``[*]`` to fan out over a list and ``[N]``
+    (negative allowed) to index into one, e.g. ``commits[*].author.email``.
+
+    Args:
+        path (str): The path expression.
+
+    Returns:
+        PathQuery: The compiled query.
+
+    Raises:
+        ValueError: If the expression is malformed.
+    """
+    return PathQuery(path)
+
+
+@lru_cache(maxsize=256)
+def _compile_path_set(paths: Tuple[str, ...]) -> PathSet:
+    return PathSet(paths)
+
+
+def compile_paths(paths: Iterable[str]) -> PathSet:
+    """
+    Compile (or fetch from cache) a set of path expressions for joint evaluation.
+
+    Args:
+        paths (Iterable[str]): Path expressions.
+
+    Returns:
+        PathSet: The compiled set.
+    """
+    return _compile_path_set(tuple(paths))
+
+
+def select(root: Any, path: str, default: Any = None) -> Any:
+    """
+    Evaluate a single path expression against a payload.
+
+    Args:
+        root (Any): A ``WebhookPayload``, nested dataclass or plain dict.
+        path (str): The path expression.
+        default (Any): Value returned when a non-wildcard path does not resolve.
+
+    Returns:
+        Any: The resolved value (a list for wildcard expressions).
+    """
+    return compile_path(path).evaluate(root, default)
+
+
+def select_many(
+    root: Any, paths: Iterable[str], default: Any = None
+) -> Dict[str, Any]:
+    """
+    Evaluate many path expressions against a payload in one traversal.
+
+    Args:
+        root (Any): A ``WebhookPayload``, nested dataclass or plain dict.
+        paths (Iterable[str]): Path expressions.
+        default (Any): Value used for non-wildcard paths that do not resolve.
+
+    Returns:
+        Dict[str, Any]: Results keyed by path expression.
+    """
+    return compile_paths(paths).evaluate(root, default)
@@ -0,0 +1,459 @@
+import json
+import os
+import re
+from dataclasses import dataclass
+from typing import IO, Any, Dict, Iterable, Iterator, List, Mapping, Optional, Pattern, Tuple, Union
+
+from .actions_core import _cmd
+from .checks import Annotation, CheckRunPublisher
+
+# Capture properties of a matcher pattern, as (JSON key, Problem attribute).
+_PROPERTIES = (
+    ("file", "file"),
+    ("line", "line"),
+    ("column", "column"),
+    ("endLine", "end_line"),
+    ("endColumn", "end_column"),
+    ("severity", "severity"),
+    ("code", "code"),
+    ("message", "message"),
+    ("fromPath", "from_path"),
+)
+_INT_PROPERTIES = {"line", "column", "end_line", "end_column"}
+_LEVELS = {"error": "failure", "warning": "warning", "notice": "notice"}
+_READ_SIZE = 1024 * 1024
+
+# JavaScript named groups (``(?<name>...)``) in matcher files, but not lookbehinds.
+_JS_NAMED_GROUP = re.compile(r"\(\?<(?![=!])")
+_BACKREFERENCE = re.compile(r"\\[1-9]|\(\?P=|\\k<")
+
+
+def _severity(value: Optional[str], default: Optional[str]) -> str:
+    text = (value or "").strip().lower()
+    if text.startswith("warn"):
+        return "warning"
+    if text.startswith(("err", "fatal")):
+        return "error"
+    if text.startswith(("notice", "info", "note")):
+        return "notice"
+    return default or "error"
+
+
+def _strip_names(regex: Pattern[str]) -> str:
+    # Named groups must be unique across the combined alternation.
+    if not regex.groupindex:
+        return regex.pattern
+    return re.sub(r"\(\?P<[^>]+>", "(", regex.pattern)
+
+
+def _prefilter(firsts: List[Pattern[str]]) -> Optional[Pattern[str]]:
+    """Combine first patterns into one ``MULTILINE`` search for candidate lines, if possible."""
+    if not firsts or any(_BACKREFERENCE.search(r.pattern) for r in firsts):
+        return None
+    # Renumbered groups are harmless here: the prefilter only finds candidate lines.
+    body = "|".join(f"(?:{_strip_names(r)})" for r in firsts)
+    try:
+        combined = re.compile(body, re.MULTILINE)
+    except re.error:
+        return None
+    # Stripping names must not have changed the group structure.
+    return combined if combined.groups == sum(r.groups for r in firsts) else None
+
+
+@dataclass(frozen=True)
+class MatcherPattern:
+    """
+    One line pattern of a problem matcher.
+
+    Attributes:
+        regexp (str): The expression as written in the matcher file.
+        regex (Pattern[str]): Compiled expression, searched anywhere in a line.
+        groups (Tuple[Tuple[str, int], ...]): ``(property, group)`` pairs to capture.
+        loop (bool): Keep matching this (last) pattern on following lines.
+    """
+
+    regexp: str
+    regex: Pattern[str]
+    groups: Tuple[Tuple[str, int], ...] = ()
+    loop: bool = False
+
+    def capture(self, match: "re.Match[str]") -> Dict[str, str]:
+        captured = {}
+        for name, group in self.groups:
+            value = match.group(group)
+            if value is not None:
+                captured[name] = value
+        return captured
+
+
+@dataclass(frozen=True)
+class ProblemMatcher:
+    """
+    A problem matcher as defined by the runner's JSON format.
+
+    Attributes:
+        owner (str): Unique matcher name, used by ``remove-matcher``.
+        patterns (Tuple[MatcherPattern, ...]): Patterns matched on consecutive lines.
+        severity (Optional[str]): Severity when the patterns capture none.
+    """
+
+    owner: str
+    patterns: Tuple[MatcherPattern, ...]
+    severity: Optional[str] = None
+
+
+@dataclass
+class Problem:
+    """
+    A problem reported by a matcher.
+
+    Attributes:
+        owner (str): Owner of the matcher that produced it.
+        message (str): Problem text.
+        severity (str): ``error``, ``warning`` or ``notice``.
+        file (Optional[str]): Path, relative to the workspace when it lies inside it.
+        line (Optional[int]): Line number.
+        column (Optional[int]): Column number.
+        end_line (Optional[int]): Last line of the range.
+        end_column (Optional[int]): Last column of the range.
+        code (Optional[str]): Tool-specific code, used as the annotation title.
+    """
+
+    owner: str
+    message: str
+    severity: str = "error"
+    file: Optional[str] = None
+    line: Optional[int] = None
+    column: Optional[int] = None
+    end_line: Optional[int] = None
+    end_column: Optional[int] = None
+    code: Optional[str] = None
+
+    def to_annotation(self) -> Annotation:
+        """
+        Convert to a check-run annotation.
+
+        Raises:
+            ValueError: If the problem has no file and line.
+        """
+        if self.file is None or self.line is None:
+            raise ValueError("Check-run annotations require a file and line")
+        single_line = self.end_line in (None, self.line)
+        return Annotation(
+            path=self.file,
+            start_line=self.line,
+            end_line=self.end_line,
+            annotation_level=_LEVELS[self.severity],
+            message=self.message,
+            title=self.code,
+            start_column=self.column if single_line else None,
+            end_column=self.end_column if single_line else None,
+        )
+
+    def emit(self) -> None:
+        """Print the problem as an ``::error``/``::warning``/``::notice`` workflow command."""
+        _cmd(
+            self.severity,
+            self.message,
+            title=self.code,
+            file=self.file,
+            line=self.line,
+            endLine=self.end_line,
+            col=self.column,
+            endColumn=self.end_column,
+        )
+
+
+def _compile_pattern(spec: Mapping[str, Any], owner: str) -> MatcherPattern:
+    regexp = spec.get("regexp")
+    if not isinstance(regexp, str) or not regexp:
+        raise ValueError(f"Problem matcher '{owner}': every pattern needs a regexp")
+    try:
+        regex = re.compile(_JS_NAMED_GROUP.sub("(?P<", regexp))
+    except re.error as exc:
+        raise ValueError(f"Problem matcher '{owner}': invalid regexp {regexp!r}: {exc}") from None
+    groups = []
+    for key, name in _PROPERTIES:
+        group = spec.get(key)
+        if group is None:
+            continue
+        if not isinstance(group, int) or not 0 <= group <= regex.groups:
+            raise ValueError(f"Problem matcher '{owner}': {key} refers to missing group {group}")
+        groups.append((name, group))
+    return MatcherPattern(regexp, regex, tuple(groups), bool(spec.get("loop", False)))
+
+
+def _compile_matcher(spec: Mapping[str, Any]) -> ProblemMatcher:
+    owner = spec.get("owner")
+    if not isinstance(owner, str) or not owner:
+        raise ValueError("Problem matcher is missing an owner")
+    raw = spec.get("pattern")
+    if isinstance(raw, Mapping):
+        raw = [raw]
+    if not raw:
+        raise ValueError(f"Problem matcher '{owner}' has no patterns")
+    patterns = tuple(_compile_pattern(p, owner) for p in raw)
+    for i, pattern in enumerate(patterns):
+        if pattern.loop and (i != len(patterns) - 1 or len(patterns) == 1):
+            raise ValueError(f"Problem matcher '{owner}': only the last of several patterns may loop")
+    captured = {name for p in patterns for name, _ in p.groups}
+    if "message" not in captured:
+        raise ValueError(f"Problem matcher '{owner}' does not capture a message")
+    return ProblemMatcher(owner, patterns, spec.get("severity"))
+
+
+def load_matchers(source: Union[str, "os.PathLike[str]", Mapping[str, Any]]) -> List[ProblemMatcher]:
+    """
+    Load problem matchers from a matcher file or its parsed JSON.
+
+    The format is the runner's: ``{"problemMatcher": [{"owner", "severity",
+    "pattern": [{"regexp", "file", "line", "column", "severity", "code",
+    "message", "loop", ...}]}]}``, where each property is a capture group
+    number. JavaScript-style ``(?<name>...)`` groups are accepted.
+
+    Args:
+        source (str | PathLike | Mapping): Path to the JSON file, or the loaded document.
+
+    Returns:
+        List[ProblemMatcher]: The compiled matchers, in file order.
+
+    Raises:
+        ValueError: If the document is not a valid matcher definition.
+    """
+    if isinstance(source, Mapping):
+        document = source
+    else:
+        with open(source, encoding="utf-8") as f:
+            document = json.load(f)
+    specs = document.get("problemMatcher")
+    if not isinstance(specs, list):
+        raise ValueError("Matcher document must contain a 'problemMatcher' list")
+    return [_compile_matcher(spec) for spec in specs]
+
+
+def add_matcher(path: Union[str, "os.PathLike[str]"]) -> None:
+    """Register a matcher file with the runner (``::add-matcher::``) for later steps' output."""
+    _cmd("add-matcher", os.fspath(path))
+
+
+def remove_matcher(owner: str) -> None:
+    """Unregister a runner problem matcher by owner (``::remove-matcher owner=...::``)."""
+    _cmd("remove-matcher", owner=owner)
+
+
+class MatcherSet:
+    """
+    Apply problem matchers to streamed output, with the runner's semantics.
+
+    Each line is offered to the matchers in order; the first one that matches
+    consumes it and resets the others. Multi-line matchers capture properties
+    across consecutive lines, a failed continuation restarts the matcher on the
+    same line, and a ``loop`` pattern keeps reporting one problem per line.
+
+    Lines no matcher can start on are skipped in bulk: while no matcher is
+    part-way through a sequence, whole chunks are searched with one
+    ``MULTILINE`` alternation of all first patterns, and only lines it hits
+    are evaluated by each matcher. Patterns that anchor with ``\\A``/``\\Z``
+    or look past the end of the line are not supported.
+
+    Example:
+        matchers = MatcherSet(load_matchers(".github/gcc.json"))
+        with open("build.log") as log, CheckRunPublisher(gh, "build") as run:
+            publish(matchers.scan_stream(log), run)
+
+    Attributes:
+        workspace (Optional[str]): Absolute paths below it are made relative.
+    """
+
+    def __init__(self, matchers: Iterable[ProblemMatcher] = (), *, workspace: Optional[str] = None) -> None:
+        self._matchers: List[ProblemMatcher] = []
+        self.workspace = workspace if workspace is not None else os.getenv("GITHUB_WORKSPACE")
+        self._prefilter: Optional[Pattern[str]] = None
+        # (matcher index, next pattern index, properties captured so far)
+        self._active: Optional[Tuple[int, int, Dict[str, str]]] = None
+        self._partial = ""
+        self.add(matchers)
+
+    @property
+    def matchers(self) -> List[ProblemMatcher]:
+        """The registered matchers, in evaluation order."""
+        return list(self._matchers)
+
+    def add(self, matchers: Iterable[ProblemMatcher]) -> None:
+        """Register matchers; one with an existing owner replaces it in place."""
+        for matcher in matchers:
+            owners = [m.owner for m in self._matchers]
+            if matcher.owner in owners:
+                self._matchers[owners.index(matcher.owner)] = matcher
+            else:
+                self._matchers.append(matcher)
+        self._recompile()
+
+    def remove(self, owner: str) -> None:
+        """Unregister the matcher with the given owner (no error if absent)."""
+        self._matchers = [m for m in self._matchers if m.owner != owner]
+        self._recompile()
+
+    def _recompile(self) -> None:
+        self._active = None
+        self._prefilter = _prefilter([m.patterns[0].regex for m in self._matchers])
+
+    def _problem(self, matcher: ProblemMatcher, captured: Dict[str, str]) -> Optional[Problem]:
+        message = captured.get("message", "").strip()
+        if not message:
+            return None
+        values: Dict[str, Any] = {}
+        for name in _INT_PROPERTIES:
+            try:
+                values[name] = int(captured[name])
+            except (KeyError, ValueError):
+                pass
+        return Problem(
+            owner=matcher.owner,
+            message=message,
+            severity=_severity(captured.get("severity"), matcher.severity),
+            file=self._path(captured.get("file"), captured.get("from_path")),
+            code=captured.get("code") or None,
+            **values,
+        )
+
+    def _path(self, file: Optional[str], from_path: Optional[str]) -> Optional[str]:
+        if not file:
+            return None
+        file = file.strip()
+        if from_path and not os.path.isabs(file):
+            file = os.path.join(os.path.dirname(from_path.strip()), file)
+        if self.workspace and os.path.isabs(file):
+            relative = os.path.relpath(file, self.workspace)
+            if not relative.startswith(".."):
+                file = relative
+        return os.path.normpath(file).replace(os.sep, "/")
+
+    def _start(self, index: int, line: str) -> Tuple[bool, Optional[Problem]]:
+        matcher = self._matchers[index]
+        first = matcher.patterns[0]
+        match = first.regex.search(line)
+        if match is None:
+            return False, None
+        captured = first.capture(match)
+        if len(matcher.patterns) == 1:
+            self._active = None
+            return True, self._problem(matcher, captured)
+        self._active = (index, 1, captured)
+        return True, None
+
+    def feed_line(self, line: str) -> Optional[Problem]:
+        """
+        Process one line (without its line ending).
+
+        Returns:
+            Optional[Problem]: The problem completed by this line, if any.
+        """
+        active = self._active
+        for index, matcher in enumerate(self._matchers):
+            if active is not None and active[0] == index:
+                step, captured = active[1], active[2]
+                pattern = matcher.patterns[step]
+                match = pattern.regex.search(line)
+                if match is not None:
+                    merged = {**captured, **pattern.capture(match)}
+                    if step + 1 < len(matcher.patterns):
+                        self._active = (index, step + 1, merged)
+                        return None
+                    # A looping pattern keeps what the earlier lines captured.
+                    self._active = (index, step, captured) if pattern.loop else None
+                    return self._problem(matcher, merged)
+            matched, problem = self._start(index, line)
+            if matched:
+                return problem
+        self._active = None
+        return None
+
+    def _scan(self, block: str) -> List[Problem]:
+        """Match a block of complete ``\\n``-terminated lines."""
+        if "\r" in block:
+            block = block.replace("\r\n", "\n")
+        problems: List[Problem] = []
+        pos, size = 0, len(block)
+        prefilter = self._prefilter
+        while pos < size:
+            if self._active is None:
+                if prefilter is not None:
+                    hit = prefilter.search(block, pos)
+                    # An empty match after the final newline is not a line.
+                    if hit is None or hit.start() >= size:
+                        break
+                    start = hit.start()
+                elif not self._matchers:
+                    break
+                else:
+                    start = pos
+                pos = block.rfind("\n", pos, start) + 1 or pos
+            end = block.find("\n", pos)
+            if end < 0:
+                end = size
+            problem = self.feed_line(block[pos:end])
+            if problem is not None:
+                problems.append(problem)
+            pos = end + 1
+        return problems
+
+    def feed(self, text: str) -> List[Problem]:
+        """
+        Process a chunk of output; a trailing partial line is kept for the next call.
+
+        Args:
+            text (str): Output text, in any chunk size.
+
+        Returns:
+            List[Problem]: Problems completed by the complete lines in the chunk.
+        """
+        data = self._partial + text if self._partial else text
+        end = data.rfind("\n")
+        if end < 0:
+            self._partial = data
+            return []
+        self._partial = data[end + 1 :]
+        return self._scan(data[: end + 1])
+
+    def close(self) -> List[Problem]:
+        """Process a final unterminated line, if any."""
+        data, self._partial = self._partial, ""
+        return self._scan(data + "\n") if data else []
+
+    def scan_stream(self, stream: Union[IO[str], Iterable[str]]) -> Iterator[Problem]:
+        """
+        Yield problems from a text stream or an iterable of chunks or lines.
+
+        File objects are read in 1 MiB chunks rather than line by line.
+        """
+        read = getattr(stream, "read", None)
+        chunks = iter(lambda: read(_READ_SIZE), "") if read is not None else stream
+        for chunk in chunks:
+            yield from self.feed(chunk)
+        yield from self.close()
+
+
+def publish(problems: Iterable[Problem], publisher: Optional[CheckRunPublisher] = None) -> int:
+    """
+    Report problems as annotations.
+
+    With a ``publisher`` they are batched into its check run (problems without
+    a file and line are printed as workflow commands instead); otherwise each
+    is printed as an ``::error``/``::warning``/``::notice`` command.
+
+    Args:
+        problems (Iterable[Problem]): Problems, consumed lazily.
+        publisher (CheckRunPublisher | None): Check run to add annotations to.
+
+    Returns:
+        int: Number of problems reported.
+    """
+    count = 0
+    for problem in problems:
+        if publisher is not None and problem.file is not None and problem.line is not None:
+            publisher.add(problem.to_annotation())
+        else:
+            problem.emit()
+        count += 1
+    return count
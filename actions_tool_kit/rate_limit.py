@@ -0,0 +1,295 @@
+import random
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterator, Optional
+from urllib.parse import urlparse
+
+from requests import PreparedRequest, Response
+from requests.adapters import BaseAdapter
+from urllib3.util.retry import Retry
+
+from .transport import DelegatingAdapter
+
+_SAFE_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+_CORE = "core"
+
+# Transport retries kept under a scheduler: connection failures and server
+# errors on idempotent requests. 403/429 (with or without Retry-After) are left
+# to the scheduler, so they are never retried twice.
+SERVER_ERROR_RETRY = Retry(
+    total=5,
+    status_forcelist=(500, 502, 503, 504),
+    backoff_factor=0.5,
+    raise_on_status=False,
+    respect_retry_after_header=False,
+)
+
+
+def resource_for(url: str) -> str:
+    """
+    Guess the rate-limit resource (``X-RateLimit-Resource``) a request is charged to.
+
+    Args:
+        url (str): Request URL.
+
+    Returns:
+        str: ``graphql``, ``code_search``, ``search`` or ``core``.
+    """
+    path = urlparse(url).path
+    if path.endswith("/graphql"):
+        return "graphql"
+    if "/search/code" in path:
+        return "code_search"
+    if "/search/" in path:
+        return "search"
+    return _CORE
+
+
+@dataclass
+class _Budget:
+    remaining: Optional[int] = None
+    reset_at: float = 0.0
+
+
+class TokenBucket:
+    """
+    Classic token bucket. Callers reserve a token up front and sleep for the
+    returned delay outside any lock, so waiting threads are served in order.
+
+    Attributes:
+        rate (float): Tokens added per second.
+        capacity (float): Maximum number of stored tokens (burst size).
+    """
+
+    def __init__(
+        self, rate: float, capacity: float, clock: Callable[[], float] = time.monotonic
+    ) -> None:
+        if rate <= 0 or capacity <= 0:
+            raise ValueError("rate and capacity must be positive")
+        self.rate = rate
+        self.capacity = capacity
+        self._clock = clock
+        self._tokens = capacity
+        self._stamp = clock()
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """
+        Take one token, borrowing against future refills if necessary.
+
+        Returns:
+            float: Seconds the caller must wait before using the token.
+        """
+        with self._lock:
+            now = self._clock()
+            self._tokens = min(
+                self.capacity, self._tokens + (now - self._stamp) * self.rate
+            )
+            self._stamp = now
+            self._tokens -= 1
+            return 0.0 if self._tokens >= 0 else -self._tokens / self.rate
+
+
+class RateLimitScheduler:
+    """
+    Thread-safe request scheduler driven by GitHub's rate-limit headers.
+
+    * **Read lane** – requests spend the primary budget reported by
+      ``X-RateLimit-Remaining``; once it drops to ``reserve``, callers wait
+      for ``X-RateLimit-Reset``. Budgets are kept per ``X-RateLimit-Resource``
+      (``core``, ``search``, ``graphql``...), so an exhausted search budget
+      does not hold back REST calls. This is budget counting, not a token
+      bucket: reads are not spaced out while budget is left, only capped by
+      ``max_concurrency``.
+    * **Write lane** – mutating requests additionally pass a token bucket
+      (default one per second), as GitHub recommends to avoid secondary limits.
+    * **Concurrency cap** – at most ``max_concurrency`` requests are in flight.
+    * **Back-off** – ``Retry-After`` and exhausted-budget responses pause every
+      thread sharing the scheduler; secondary limits without ``Retry-After``
+      back off exponentially with full jitter.
+
+    Share one instance between threads (and clients using the same token) so a
+    worker pool uses the whole budget without tripping abuse detection.
+
+    Attributes:
+        max_retries (int): How often a rate-limited request is retried.
+        reserve (int): Primary budget left untouched for other consumers.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_concurrency: int = 10,
+        writes_per_second: float = 1.0,
+        write_burst: int = 1,
+        reserve: int = 0,
+        max_retries: int = 3,
+        backoff_base: float = 1.0,
+        backoff_cap: float = 60.0,
+        clock: Callable[[], float] = time.time,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        self.max_retries = max_retries
+        self.reserve = reserve
+        self._backoff_base = backoff_base
+        self._backoff_cap = backoff_cap
+        self._clock = clock
+        self._sleep = sleep
+        self._slots = threading.BoundedSemaphore(max_concurrency)
+        self._writes = TokenBucket(writes_per_second, write_burst, clock=clock)
+        self._lock = threading.Lock()
+        self._budgets: Dict[str, _Budget] = {}
+        self._paused_until = 0.0
+
+    def _budget(self, resource: str) -> _Budget:
+        budget = self._budgets.get(resource)
+        if budget is None:
+            budget = self._budgets[resource] = _Budget()
+        return budget
+
+    @property
+    def remaining(self) -> Optional[int]:
+        """Core budget left as last reported by GitHub (None until known)."""
+        return self.remaining_for(_CORE)
+
+    def remaining_for(self, resource: str) -> Optional[int]:
+        """Budget left for one rate-limit resource (None until known)."""
+        with self._lock:
+            budget = self._budgets.get(resource)
+            return budget.remaining if budget is not None else None
+
+    def _wait_for_budget(self, write: bool, resource: str) -> None:
+        while True:
+            with self._lock:
+                budget = self._budget(resource)
+                now = self._clock()
+                wait = self._paused_until - now
+                if (
+                    wait <= 0
+                    and budget.remaining is not None
+                    and budget.remaining <= self.reserve
+                ):
+                    wait = budget.reset_at - now
+                    if wait <= 0:
+                        # New window: learn the budget again from the next response.
+                        budget.remaining = None
+                if wait <= 0:
+                    if budget.remaining is not None:
+                        budget.remaining -= 1
+                    break
+            self._sleep(wait)
+
+        if write:
+            delay = self._writes.reserve()
+            if delay > 0:
+                self._sleep(delay)
+
+    @contextmanager
+    def slot(self, write: bool = False, resource: str = _CORE) -> Iterator[None]:
+        """
+        Context manager guarding one request.
+
+        Args:
+            write (bool): True for mutating requests (POST/PATCH/PUT/DELETE).
+            resource (str): Rate-limit resource the request is charged to (see ``resource_for``).
+        """
+        self._wait_for_budget(write, resource)
+        with self._slots:
+            yield
+
+    def backoff(self, attempt: int) -> float:
+        """Full-jitter exponential back-off delay for the given retry attempt."""
+        return random.uniform(0, min(self._backoff_cap, self._backoff_base * 2**attempt))
+
+    def observe(self, response: Response, attempt: int = 0, resource: Optional[str] = None) -> Optional[float]:
+        """
+        Update the budget from a response and decide whether to retry it.
+
+        Args:
+            response (Response): The HTTP response.
+            attempt (int): Zero-based retry attempt, used for back-off.
+            resource (str | None): Resource the request was charged to; the
+                ``X-RateLimit-Resource`` header takes precedence.
+
+        Returns:
+            float | None: Seconds until a retry may succeed, or None if the
+            response was not rate limited. ``Retry-After`` and secondary limits
+            pause all callers; an exhausted primary budget only holds back
+            requests for the same resource.
+        """
+        headers = response.headers
+        now = self._clock()
+        with self._lock:
+            budget = self._budget(headers.get("X-RateLimit-Resource") or resource or _CORE)
+            if "X-RateLimit-Remaining" in headers:
+                budget.remaining = int(float(headers["X-RateLimit-Remaining"]))
+            if "X-RateLimit-Reset" in headers:
+                budget.reset_at = float(headers["X-RateLimit-Reset"])
+            reset_at = budget.reset_at
+
+        if response.status_code not in (403, 429):
+            return None
+
+        if "Retry-After" in headers:
+            delay = float(headers["Retry-After"])
+        elif headers.get("X-RateLimit-Remaining") == "0":
+            # The exhausted budget itself makes slot() wait for its reset.
+            return max(reset_at - now, 0.0) + 1.0
+        elif response.status_code == 429 or b"rate limit" in response.content.lower():
+            delay = self.backoff(attempt)
+        else:
+            return None  # an ordinary permission error
+
+        with self._lock:
+            self._paused_until = max(self._paused_until, now + delay)
+        return delay
+
+
+class RateLimitedAdapter(DelegatingAdapter):
+    """
+    Transport adapter sending every request through a ``RateLimitScheduler``
+    and retrying rate-limited responses.
+
+    Server errors and connection failures are not handled here; they are
+    retried by the inner adapter (see ``SERVER_ERROR_RETRY``).
+
+    Attributes:
+        scheduler (RateLimitScheduler): The (possibly shared) scheduler.
+    """
+
+    def __init__(self, inner: BaseAdapter, scheduler: RateLimitScheduler) -> None:
+        super().__init__(inner)
+        self.scheduler = scheduler
+
+    def send(self, request: PreparedRequest, **kwargs: Any) -> Response:  # type: ignore[override]
+        write = request.method not in _SAFE_METHODS
+        resource = resource_for(request.url or "")
+        attempt = 0
+        while True:
+            with self.scheduler.slot(write, resource):
+                response = self.inner.send(request, **kwargs)
+            delay = self.scheduler.observe(response, attempt, resource)
+            if delay is None or attempt >= self.scheduler.max_retries:
+                return response
+            response.close()
+            attempt += 1
+
+
+_shared_scheduler: Optional[RateLimitScheduler] = None
+_shared_scheduler_lock = threading.Lock()
+
+
+def shared_scheduler() -> RateLimitScheduler:
+    """
+    Return the process-wide scheduler used by ``get_github_client(rate_limit=True)``.
+
+    Returns:
+        RateLimitScheduler: The shared scheduler, created on first use.
+    """
+    global _shared_scheduler
+    with _shared_scheduler_lock:
+        if _shared_scheduler is None:
+            _shared_scheduler = RateLimitScheduler()
+        return _shared_scheduler
@@ -0,0 +1,453 @@
+import atexit
+import json
+import math
+import os
+import tempfile
+import threading
+import time
+from array import array
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, List, Optional, Sequence, Set, Tuple, Union
+
+from . import actions_core
+from .actions_core import append_summary, debug
+
+_PROC = "/proc"
+_SPARK = "▁▂▃▄▅▆▇█"
+_SPARK_WIDTH = 60
+_UNGROUPED = "(outside groups)"
+
+
+def available() -> bool:
+    """True if process counters can be read (Linux ``/proc``)."""
+    return os.path.exists(os.path.join(_PROC, "self", "stat"))
+
+
+def _read(path: str) -> Optional[str]:
+    try:
+        with open(path, encoding="ascii", errors="replace") as f:
+            return f.read()
+    except OSError:
+        return None
+
+
+def _stat_fields(pid: Union[int, str]) -> Optional[List[str]]:
+    text = _read(f"{_PROC}/{pid}/stat")
+    if text is None:
+        return None
+    # The command name may contain spaces and parentheses; fields follow the last ")".
+    return text[text.rfind(")") + 2 :].split()
+
+
+def _io(pid: Union[int, str]) -> Tuple[int, int]:
+    text = _read(f"{_PROC}/{pid}/io")
+    if text is None:
+        return 0, 0
+    values = dict(line.split(": ", 1) for line in text.splitlines() if ": " in line)
+    return int(values.get("read_bytes", 0)), int(values.get("write_bytes", 0))
+
+
+def _rss(pid: Union[int, str], page_size: int) -> int:
+    text = _read(f"{_PROC}/{pid}/statm")
+    return int(text.split()[1]) * page_size if text else 0
+
+
+def _percentile(values: Sequence[float], fraction: float) -> float:
+    """Nearest-rank percentile of a sorted sequence."""
+    if not values:
+        return 0.0
+    return values[max(0, math.ceil(fraction * len(values)) - 1)]
+
+
+def _megabytes(n: float) -> str:
+    return f"{n / (1024 * 1024):.1f} MiB"
+
+
+def _sparkline(values: List[float]) -> str:
+    if not values:
+        return ""
+    bucket = max(1, -(-len(values) // _SPARK_WIDTH))
+    peaks = [max(values[i : i + bucket]) for i in range(0, len(values), bucket)]
+    top = max(peaks) or 1.0
+    return "".join(_SPARK[min(len(_SPARK) - 1, int(v / top * (len(_SPARK) - 1) + 0.5))] for v in peaks)
+
+
+@dataclass
+class GroupStats:
+    """
+    Resource usage while one log group was open.
+
+    Attributes:
+        name (str): Group name (samples outside any group are reported together).
+        duration (float): Seconds covered by the group's samples.
+        cpu_avg (float): Mean CPU, in percent of one core (can exceed 100).
+        cpu_p95 (float): 95th percentile CPU.
+        cpu_peak (float): Highest CPU sample.
+        rss_p50 (int): Median resident memory, bytes.
+        rss_p95 (int): 95th percentile resident memory.
+        rss_peak (int): Highest resident memory sample.
+        read_bytes (int): Bytes read from storage.
+        write_bytes (int): Bytes written to storage.
+    """
+
+    name: str
+    duration: float
+    cpu_avg: float
+    cpu_p95: float
+    cpu_peak: float
+    rss_p50: int
+    rss_p95: int
+    rss_peak: int
+    read_bytes: int
+    write_bytes: int
+
+
+class ResourceSampler:
+    """
+    Background thread sampling CPU, memory and disk I/O of this process and its children.
+
+    Every ``interval`` seconds the sampler reads ``/proc`` for this process
+    and its live descendants (reaped children are already folded into this
+    process's counters by the kernel) and records one row: CPU use since the
+    previous sample, total resident memory, cumulative storage reads/writes,
+    and the log group open at the time (``group()``/``start_group()``).
+
+    Rows are kept as typed arrays (about 34 bytes each). Past ``max_samples``
+    rows, every other row is dropped and the interval doubles, so long jobs
+    stay bounded. The sampler times its own work with ``time.thread_time``;
+    when that exceeds ``max_overhead`` of wall time, the interval doubles.
+    The full process table is scanned for new descendants every
+    ``rescan_every`` samples; known descendants are read every sample.
+
+    Example:
+        with ResourceSampler(interval=0.5) as sampler:
+            with group("Build"):
+                build()
+        sampler.publish()
+
+    Attributes:
+        interval (float): Current seconds between samples.
+        overhead (float): Sampler CPU time as a fraction of elapsed wall time.
+    """
+
+    def __init__(
+        self,
+        interval: float = 1.0,
+        *,
+        max_overhead: float = 0.01,
+        max_samples: int = 10_000,
+        rescan_every: int = 5,
+        children: bool = True,
+    ) -> None:
+        if interval <= 0:
+            raise ValueError("interval must be positive")
+        self.interval = interval
+        self.overhead = 0.0
+        self._max_overhead = max_overhead
+        self._max_samples = max(2, max_samples)
+        self._rescan_every = max(1, rescan_every)
+        self._children = children
+        self._page_size = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+        self._ticks = os.sysconf("SC_CLK_TCK") if hasattr(os, "sysconf") else 100
+        self._pid = os.getpid()
+
+        self._t = array("d")
+        self._cpu = array("f")
+        self._rss = array("Q")
+        self._read = array("Q")
+        self._write = array("Q")
+        self._group = array("H")
+        self._groups: List[Optional[str]] = []
+        self._group_index: Dict[Optional[str], int] = {}
+
+        self._descendants: Set[int] = set()
+        self._samples_taken = 0
+        self._started = 0.0
+        self._busy = 0.0
+        self._last: Optional[Tuple[float, float]] = None
+        self._baseline = (0, 0)
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    # ---------- collection ----------
+    def _scan_descendants(self) -> None:
+        parents: Dict[int, int] = {}
+        try:
+            entries = os.listdir(_PROC)
+        except OSError:
+            return
+        for name in entries:
+            if name.isdigit():
+                fields = _stat_fields(name)
+                if fields is not None:
+                    parents[int(name)] = int(fields[1])
+        found: Set[int] = set()
+        frontier = [self._pid]
+        while frontier:
+            parent = frontier.pop()
+            for pid, ppid in parents.items():
+                if ppid == parent and pid not in found:
+                    found.add(pid)
+                    frontier.append(pid)
+        self._descendants = found
+
+    def _counters(self) -> Tuple[float, int, int, int]:
+        """Return (cpu seconds, rss bytes, read bytes, written bytes) for the process tree."""
+        fields = _stat_fields("self")
+        if fields is None:
+            raise RuntimeError("Resource sampling requires /proc")
+        # utime, stime, cutime, cstime
+        ticks = sum(int(v) for v in fields[11:15])
+        rss = _rss("self", self._page_size)
+        read, written = _io("self")
+        for pid in list(self._descendants):
+            child = _stat_fields(pid)
+            if child is None:
+                self._descendants.discard(pid)
+                continue
+            ticks += sum(int(v) for v in child[11:15])
+            rss += _rss(pid, self._page_size)
+            child_read, child_written = _io(pid)
+            read += child_read
+            written += child_written
+        return ticks / self._ticks, rss, read, written
+
+    def _group_id(self, name: Optional[str]) -> int:
+        index = self._group_index.get(name)
+        if index is None:
+            index = self._group_index[name] = len(self._groups)
+            self._groups.append(name)
+        return index
+
+    def sample(self) -> None:
+        """Record one sample now (also called by the background thread)."""
+        busy = time.thread_time()
+        if self._children and self._samples_taken % self._rescan_every == 0:
+            self._scan_descendants()
+        self._samples_taken += 1
+        now = time.monotonic()
+        cpu_seconds, rss, read, written = self._counters()
+        group = self._group_id(actions_core._current_group)
+        with self._lock:
+            if self._last is None:
+                self._last = (now, cpu_seconds)
+                self._baseline = (read, written)
+                self._busy += time.thread_time() - busy
+                return
+            last_time, last_cpu = self._last
+            self._last = (now, cpu_seconds)
+            elapsed = now - last_time
+            # A child exiting between reads can make the tree total dip briefly.
+            cpu = max(0.0, cpu_seconds - last_cpu) / elapsed * 100 if elapsed > 0 else 0.0
+            self._t.append(now - self._started)
+            self._cpu.append(cpu)
+            self._rss.append(rss)
+            self._read.append(max(read, self._read[-1] if self._read else self._baseline[0]))
+            self._write.append(max(written, self._write[-1] if self._write else self._baseline[1]))
+            self._group.append(group)
+            if len(self._t) > self._max_samples:
+                self._downsample()
+        self._busy += time.thread_time() - busy
+
+    def _downsample(self) -> None:
+        for column in (self._t, self._cpu, self._rss, self._read, self._write, self._group):
+            del column[::2]
+        self.interval *= 2
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            try:
+                self.sample()
+            except Exception as exc:  # never take the job down with the sampler
+                debug(f"resource sampler stopped: {exc}")
+                return
+            elapsed = time.monotonic() - self._started
+            self.overhead = self._busy / elapsed if elapsed > 0 else 0.0
+            # The first samples include start-up costs; judge the steady state.
+            if self._samples_taken >= 10 and self.overhead > self._max_overhead:
+                self.interval *= 2
+
+    def start(self) -> "ResourceSampler":
+        """
+        Start sampling on a daemon thread.
+
+        Raises:
+            RuntimeError: If ``/proc`` is unavailable or the sampler is already running.
+        """
+        if not available():
+            raise RuntimeError("Resource sampling requires /proc (Linux)")
+        if self._thread is not None:
+            raise RuntimeError("Sampler already started")
+        self._started = time.monotonic()
+        self.sample()
+        self._thread = threading.Thread(target=self._run, name="resource-sampler", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Take a final sample and stop the thread (no-op if not running)."""
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._thread.join()
+        self._thread = None
+        try:
+            self.sample()
+        except Exception:
+            pass
+
+    def __enter__(self) -> "ResourceSampler":
+        return self.start()
+
+    def __exit__(self, exc_type: Any, exc: Any, tb: Any) -> None:
+        self.stop()
+
+    # ---------- reporting ----------
+    def __len__(self) -> int:
+        return len(self._t)
+
+    def group_stats(self) -> List[GroupStats]:
+        """
+        Summarise the samples per log group, in order of first appearance.
+
+        Returns:
+            List[GroupStats]: One entry per group with at least one sample.
+        """
+        with self._lock:
+            rows = list(zip(self._t, self._cpu, self._rss, self._read, self._write, self._group))
+        per_group: Dict[int, List[Tuple[float, float, int, int, int]]] = {}
+        previous = (0.0, *self._baseline)
+        for t, cpu, rss, read, written, group in rows:
+            last_t, last_read, last_written = previous
+            per_group.setdefault(group, []).append(
+                (t - last_t, cpu, rss, read - last_read, written - last_written)
+            )
+            previous = (t, read, written)
+
+        stats = []
+        for group, samples in per_group.items():
+            cpus = sorted(s[1] for s in samples)
+            rsss = sorted(s[2] for s in samples)
+            duration = sum(s[0] for s in samples)
+            weighted = sum(s[0] * s[1] for s in samples)
+            stats.append(
+                GroupStats(
+                    name=self._groups[group] or _UNGROUPED,
+                    duration=duration,
+                    cpu_avg=weighted / duration if duration else cpus[-1],
+                    cpu_p95=_percentile(cpus, 0.95),
+                    cpu_peak=cpus[-1],
+                    rss_p50=int(_percentile(rsss, 0.5)),
+                    rss_p95=int(_percentile(rsss, 0.95)),
+                    rss_peak=rsss[-1],
+                    read_bytes=sum(s[3] for s in samples),
+                    write_bytes=sum(s[4] for s in samples),
+                )
+            )
+        return stats
+
+    def to_markdown(self) -> str:
+        """Render peak/percentile tables and a sparkline time series as markdown."""
+        lines = [
+            "### Resource usage",
+            "",
+            "| Group | Duration | CPU avg | CPU p95 | CPU peak | RSS p50 | RSS p95 | RSS peak | Disk read | Disk written |",
+            "|---|--:|--:|--:|--:|--:|--:|--:|--:|--:|",
+        ]
+        for s in self.group_stats():
+            lines.append(
+                f"| {s.name} | {s.duration:.1f}s | {s.cpu_avg:.0f}% | {s.cpu_p95:.0f}% | {s.cpu_peak:.0f}% "
+                f"| {_megabytes(s.rss_p50)} | {_megabytes(s.rss_p95)} | {_megabytes(s.rss_peak)} "
+                f"| {_megabytes(s.read_bytes)} | {_megabytes(s.write_bytes)} |"
+            )
+        with self._lock:
+            cpu, rss = list(self._cpu), [float(v) for v in self._rss]
+        lines += [
+            "",
+            f"CPU `{_sparkline(cpu)}` peak {max(cpu, default=0):.0f}%  ",
+            f"RSS `{_sparkline(rss)}` peak {_megabytes(max(rss, default=0))}",
+            "",
+            f"<sub>{len(cpu)} samples, interval {self.interval:g}s, sampler overhead {self.overhead:.2%}</sub>",
+            "",
+        ]
+        return "\n".join(lines)
+
+    def to_json(self) -> Dict[str, Any]:
+        """Return the time series (column-oriented) and the per-group statistics."""
+        stats = [asdict(s) for s in self.group_stats()]
+        with self._lock:
+            return {
+                "interval": self.interval,
+                "overhead": self.overhead,
+                "groups": [name or _UNGROUPED for name in self._groups],
+                "series": {
+                    "t": [round(t, 3) for t in self._t],
+                    "cpu": [round(c, 1) for c in self._cpu],
+                    "rss": list(self._rss),
+                    "read_bytes": list(self._read),
+                    "write_bytes": list(self._write),
+                    "group": list(self._group),
+                },
+                "stats": stats,
+            }
+
+    def publish(self, *, summary: bool = True, artifact: Optional[str] = None) -> Optional[str]:
+        """
+        Append the report to the step summary and write the JSON file.
+
+        Args:
+            summary (bool): Append ``to_markdown()`` to the step summary.
+            artifact (str | None): JSON path; defaults to
+                ``$RUNNER_TEMP/resource-usage-<pid>.json``. Upload it with
+                ``actions/upload-artifact`` in a later step.
+
+        Returns:
+            str | None: Path of the JSON file, or None if there were no samples.
+        """
+        if not len(self):
+            return None
+        if summary:
+            append_summary(self.to_markdown())
+        if artifact is None:
+            base = os.getenv("RUNNER_TEMP") or tempfile.gettempdir()
+            artifact = os.path.join(base, f"resource-usage-{self._pid}.json")
+        with open(artifact, "w", encoding="utf-8") as f:
+            json.dump(self.to_json(), f, separators=(",", ":"))
+        return artifact
+
+
+def start_sampling(
+    interval: float = 1.0,
+    *,
+    summary: bool = True,
+    artifact: Optional[str] = None,
+    **options: Any,
+) -> Optional[ResourceSampler]:
+    """
+    Opt in to resource sampling for the rest of the process.
+
+    Starts a ``ResourceSampler`` and registers an exit hook that stops it and
+    publishes the step-summary tables and JSON file.
+
+    Args:
+        interval (float): Seconds between samples (doubles automatically to
+            stay under ``max_overhead``, 1% by default).
+        summary (bool): Append the report to the step summary at exit.
+        artifact (str | None): JSON output path (see ``ResourceSampler.publish``).
+        **options: ``max_overhead``, ``max_samples``, ``rescan_every``, ``children``.
+
+    Returns:
+        ResourceSampler | None: The running sampler, or None where ``/proc`` is unavailable.
+    """
+    if not available():
+        debug("resource sampling is only supported on Linux")
+        return None
+    sampler = ResourceSampler(interval, **options).start()
+
+    def finish() -> None:
+        sampler.stop()
+        sampler.publish(summary=summary, artifact=artifact)
+
+    atexit.register(finish)
+    return sampler
@@ -0,0 +1,201 @@
+import os
+import threading
+from dataclasses import dataclass, field, fields
+from types import MappingProxyType
+from typing import Any, Dict, Mapping, Optional, Tuple
+
+# Variables captured into a snapshot; everything else in the environment is ignored.
+_PREFIXES = ("GITHUB_", "RUNNER_", "ACTIONS_")
+_CI = "CI"
+
+
+def _int(value: Optional[str]) -> int:
+    try:
+        return int(value) if value else 0
+    except ValueError:
+        return 0
+
+
+@dataclass(frozen=True)
+class RunnerEnvironment:
+    """
+    Immutable snapshot of the runner-provided environment, parsed once.
+
+    Built from a single pass over ``os.environ`` that keeps the ``GITHUB_*``,
+    ``RUNNER_*`` and ``ACTIONS_*`` variables; the common ones are exposed as
+    typed attributes and all captured ones through ``get``. Pickling sends
+    the fields and the captured variables, never the rest of the environment.
+
+    Attributes:
+        is_actions (bool): ``GITHUB_ACTIONS`` is ``true``.
+        ci (bool): ``CI`` is ``true``.
+        debug (bool): Step debug logging is on (``RUNNER_DEBUG=1``).
+        event_name (Optional[str]): ``GITHUB_EVENT_NAME``.
+        event_path (Optional[str]): ``GITHUB_EVENT_PATH``.
+        sha (Optional[str]): ``GITHUB_SHA``.
+        ref (Optional[str]): ``GITHUB_REF``.
+        ref_name (Optional[str]): ``GITHUB_REF_NAME``.
+        ref_type (Optional[str]): ``GITHUB_REF_TYPE`` (``branch`` or ``tag``).
+        base_ref (Optional[str]): ``GITHUB_BASE_REF`` (pull requests only).
+        head_ref (Optional[str]): ``GITHUB_HEAD_REF`` (pull requests only).
+        repository (Optional[str]): ``GITHUB_REPOSITORY`` (``owner/repo``).
+        repository_owner (Optional[str]): ``GITHUB_REPOSITORY_OWNER``.
+        workflow (Optional[str]): ``GITHUB_WORKFLOW``.
+        workflow_ref (Optional[str]): ``GITHUB_WORKFLOW_REF``.
+        action (Optional[str]): ``GITHUB_ACTION``.
+        action_path (Optional[str]): ``GITHUB_ACTION_PATH``.
+        actor (Optional[str]): ``GITHUB_ACTOR``.
+        triggering_actor (Optional[str]): ``GITHUB_TRIGGERING_ACTOR``.
+        job (Optional[str]): ``GITHUB_JOB``.
+        run_id (int): ``GITHUB_RUN_ID`` (0 when unset).
+        run_number (int): ``GITHUB_RUN_NUMBER`` (0 when unset).
+        run_attempt (int): ``GITHUB_RUN_ATTEMPT`` (0 when unset).
+        workspace (Optional[str]): ``GITHUB_WORKSPACE``.
+        api_url (str): ``GITHUB_API_URL``.
+        server_url (str): ``GITHUB_SERVER_URL``.
+        graphql_url (str): ``GITHUB_GRAPHQL_URL``.
+        runner_os (Optional[str]): ``RUNNER_OS`` (``Linux``, ``Windows``, ``macOS``).
+        runner_arch (Optional[str]): ``RUNNER_ARCH`` (``X64``, ``ARM64``...).
+        runner_name (Optional[str]): ``RUNNER_NAME``.
+        runner_environment (Optional[str]): ``RUNNER_ENVIRONMENT`` (``github-hosted``...).
+        temp (Optional[str]): ``RUNNER_TEMP``.
+        tool_cache (Optional[str]): ``RUNNER_TOOL_CACHE``.
+        variables (Mapping[str, str]): Every captured variable (read-only).
+    """
+
+    is_actions: bool = False
+    ci: bool = False
+    debug: bool = False
+    event_name: Optional[str] = None
+    event_path: Optional[str] = None
+    sha: Optional[str] = None
+    ref: Optional[str] = None
+    ref_name: Optional[str] = None
+    ref_type: Optional[str] = None
+    base_ref: Optional[str] = None
+    head_ref: Optional[str] = None
+    repository: Optional[str] = None
+    repository_owner: Optional[str] = None
+    workflow: Optional[str] = None
+    workflow_ref: Optional[str] = None
+    action: Optional[str] = None
+    action_path: Optional[str] = None
+    actor: Optional[str] = None
+    triggering_actor: Optional[str] = None
+    job: Optional[str] = None
+    run_id: int = 0
+    run_number: int = 0
+    run_attempt: int = 0
+    workspace: Optional[str] = None
+    api_url: str = "https://api.github.com"
+    server_url: str = "https://github.com"
+    graphql_url: str = "https://api.github.com/graphql"
+    runner_os: Optional[str] = None
+    runner_arch: Optional[str] = None
+    runner_name: Optional[str] = None
+    runner_environment: Optional[str] = None
+    temp: Optional[str] = None
+    tool_cache: Optional[str] = None
+    variables: Mapping[str, str] = field(default_factory=dict, repr=False, compare=False, hash=False)
+
+    @classmethod
+    def from_environ(cls, environ: Optional[Mapping[str, str]] = None) -> "RunnerEnvironment":
+        """
+        Capture a snapshot.
+
+        Args:
+            environ (Mapping[str, str] | None): Variables to read; defaults to ``os.environ``.
+
+        Returns:
+            RunnerEnvironment: The parsed snapshot.
+        """
+        source = os.environ if environ is None else environ
+        env: Dict[str, str] = {k: v for k, v in source.items() if k.startswith(_PREFIXES) or k == _CI}
+        get = env.get
+        return cls(
+            is_actions=get("GITHUB_ACTIONS") == "true",
+            ci=get(_CI) == "true",
+            debug=get("RUNNER_DEBUG") == "1",
+            event_name=get("GITHUB_EVENT_NAME"),
+            event_path=get("GITHUB_EVENT_PATH"),
+            sha=get("GITHUB_SHA"),
+            ref=get("GITHUB_REF"),
+            ref_name=get("GITHUB_REF_NAME"),
+            ref_type=get("GITHUB_REF_TYPE"),
+            base_ref=get("GITHUB_BASE_REF") or None,
+            head_ref=get("GITHUB_HEAD_REF") or None,
+            repository=get("GITHUB_REPOSITORY"),
+            repository_owner=get("GITHUB_REPOSITORY_OWNER"),
+            workflow=get("GITHUB_WORKFLOW"),
+            workflow_ref=get("GITHUB_WORKFLOW_REF"),
+            action=get("GITHUB_ACTION"),
+            action_path=get("GITHUB_ACTION_PATH"),
+            actor=get("GITHUB_ACTOR"),
+            triggering_actor=get("GITHUB_TRIGGERING_ACTOR"),
+            job=get("GITHUB_JOB"),
+            run_id=_int(get("GITHUB_RUN_ID")),
+            run_number=_int(get("GITHUB_RUN_NUMBER")),
+            run_attempt=_int(get("GITHUB_RUN_ATTEMPT")),
+            workspace=get("GITHUB_WORKSPACE"),
+            api_url=get("GITHUB_API_URL", "https://api.github.com"),
+            server_url=get("GITHUB_SERVER_URL", "https://github.com"),
+            graphql_url=get("GITHUB_GRAPHQL_URL", "https://api.github.com/graphql"),
+            runner_os=get("RUNNER_OS"),
+            runner_arch=get("RUNNER_ARCH"),
+            runner_name=get("RUNNER_NAME"),
+            runner_environment=get("RUNNER_ENVIRONMENT"),
+            temp=get("RUNNER_TEMP"),
+            tool_cache=get("RUNNER_TOOL_CACHE"),
+            variables=env,
+        )
+
+    def __post_init__(self) -> None:
+        object.__setattr__(self, "variables", MappingProxyType(dict(self.variables)))
+
+    def get(self, name: str, default: Optional[str] = None) -> Optional[str]:
+        """Return a captured variable (``GITHUB_*``, ``RUNNER_*``, ``ACTIONS_*``, ``CI``)."""
+        return self.variables.get(name, default)
+
+    def __reduce__(self) -> Tuple[Any, ...]:
+        # A mapping proxy cannot be pickled; send a plain copy of the variables.
+        return (
+            RunnerEnvironment,
+            tuple(
+                dict(self.variables) if f.name == "variables" else getattr(self, f.name)
+                for f in fields(self)
+            ),
+        )
+
+
+_current: Optional[RunnerEnvironment] = None
+_lock = threading.Lock()
+
+
+def runner_env() -> RunnerEnvironment:
+    """
+    Return the process-wide snapshot, capturing it on first use.
+
+    Returns:
+        RunnerEnvironment: The cached snapshot.
+    """
+    current = _current
+    if current is None:
+        current = refresh_runner_env()
+    return current
+
+
+def refresh_runner_env(environ: Optional[Mapping[str, str]] = None) -> RunnerEnvironment:
+    """
+    Re-capture the process-wide snapshot (after changing ``os.environ``).
+
+    Args:
+        environ (Mapping[str, str] | None): Variables to read; defaults to ``os.environ``.
+
+    Returns:
+        RunnerEnvironment: The new snapshot.
+    """
+    global _current
+    snapshot = RunnerEnvironment.from_environ(environ)
+    with _lock:
+        _current = snapshot
+    return snapshot
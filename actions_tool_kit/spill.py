@@ -0,0 +1,293 @@
+import gzip
+import hashlib
+import json
+import os
+import tempfile
+from dataclasses import asdict, dataclass
+from typing import IO, Iterable, Iterator, Optional, Union, cast
+
+from . import actions_core
+from .actions_core import debug, set_output
+
+SpillData = Union[str, bytes, Iterable[Union[str, bytes]], IO[str], IO[bytes]]
+
+# Outputs are limited to 1 MB per job and summaries to 1 MiB per step; spill well before that.
+DEFAULT_OUTPUT_THRESHOLD = 64 * 1024
+DEFAULT_SUMMARY_THRESHOLD = 960 * 1024
+_CHUNK = 1024 * 1024
+_PREFIX = '{"spill":1,'
+
+
+@dataclass(frozen=True)
+class SpillRecord:
+    """
+    Pointer to a value stored in a file instead of an output or summary.
+
+    Serialized as one line of JSON (``{"spill":1,"path":...}``), so workflow
+    expressions can read it with ``fromJSON``. Files live under
+    ``RUNNER_TEMP``, which is shared by the steps of one job and removed
+    with it.
+
+    Attributes:
+        path (str): File holding the value.
+        size (int): Size of the value in bytes (before compression).
+        sha256 (str): SHA-256 of the value (before compression).
+        compression (str): ``"gzip"`` or ``"none"``.
+    """
+
+    path: str
+    size: int
+    sha256: str
+    compression: str = "none"
+
+    def to_json(self) -> str:
+        return json.dumps({"spill": 1, **asdict(self)}, separators=(",", ":"))
+
+    @classmethod
+    def parse(cls, value: str) -> Optional["SpillRecord"]:
+        """Return the record held by ``value``, or None if it is a plain value."""
+        if not value.startswith(_PREFIX):
+            return None
+        try:
+            data = json.loads(value)
+            return cls(str(data["path"]), int(data["size"]), str(data["sha256"]), str(data.get("compression", "none")))
+        except (ValueError, KeyError, TypeError):
+            return None
+
+
+def _spill_dir() -> str:
+    return os.path.join(os.getenv("RUNNER_TEMP") or tempfile.gettempdir(), "spill")
+
+
+def _chunks(data: SpillData) -> Iterator[bytes]:
+    if isinstance(data, str):
+        for start in range(0, len(data), _CHUNK):
+            yield data[start : start + _CHUNK].encode("utf-8")
+    elif isinstance(data, (bytes, bytearray, memoryview)):
+        view = memoryview(data)
+        for start in range(0, len(view), _CHUNK):
+            yield bytes(view[start : start + _CHUNK])
+    elif hasattr(data, "read"):
+        while True:
+            block = data.read(_CHUNK)
+            if not block:
+                return
+            yield block.encode("utf-8") if isinstance(block, str) else block
+    else:
+        for item in data:
+            yield item.encode("utf-8") if isinstance(item, str) else item
+
+
+def spill(data: SpillData, *, compress: bool = False, directory: Optional[str] = None) -> SpillRecord:
+    """
+    Stream a value to a file under ``RUNNER_TEMP`` and return a pointer to it.
+
+    The value is written in chunks as it is read and hashed along the way,
+    so it is never held twice in memory. Files are named by their hash, so
+    identical values share one file.
+
+    Args:
+        data (str | bytes | Iterable | IO): Value, chunks of it, or a file object to copy.
+        compress (bool): Store the file gzip-compressed.
+        directory (str | None): Where to write; defaults to ``$RUNNER_TEMP/spill``.
+
+    Returns:
+        SpillRecord: Pointer to the stored value.
+    """
+    directory = directory or _spill_dir()
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    digest = hashlib.sha256()
+    size = 0
+    try:
+        with os.fdopen(fd, "wb") as raw:
+            gz = gzip.GzipFile(fileobj=raw, mode="wb", mtime=0) if compress else None
+            write = gz.write if gz is not None else raw.write
+            for chunk in _chunks(data):
+                digest.update(chunk)
+                size += len(chunk)
+                write(chunk)
+            if gz is not None:
+                gz.close()
+        path = os.path.join(directory, digest.hexdigest() + (".gz" if compress else ""))
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+    return SpillRecord(path, size, digest.hexdigest(), "gzip" if compress else "none")
+
+
+def _locate(record: SpillRecord) -> str:
+    if os.path.exists(record.path):
+        return record.path
+    # Container steps see RUNNER_TEMP under a different mount point than host steps.
+    moved = os.path.join(_spill_dir(), os.path.basename(record.path))
+    if os.path.exists(moved):
+        return moved
+    raise FileNotFoundError(
+        f"Spilled value {record.path} not found; spilled values are only readable within the job that wrote them"
+    )
+
+
+def iter_spilled(value: Union[str, SpillRecord], *, verify: bool = True) -> Iterator[bytes]:
+    """
+    Stream the bytes of a spilled value in chunks.
+
+    Args:
+        value (str | SpillRecord): Pointer record, as read from an output or input.
+        verify (bool): Check the size and SHA-256 once the last chunk was read.
+
+    Yields:
+        bytes: Chunks of the stored value.
+
+    Raises:
+        ValueError: If ``value`` is not a pointer record, or the file does not match it.
+        FileNotFoundError: If the file is gone (for example, read from another job).
+    """
+    record = value if isinstance(value, SpillRecord) else SpillRecord.parse(value)
+    if record is None:
+        raise ValueError("Value is not a spill record")
+    digest = hashlib.sha256()
+    size = 0
+    path = _locate(record)
+    with (gzip.open(path, "rb") if record.compression == "gzip" else open(path, "rb")) as f:
+        while True:
+            chunk = f.read(_CHUNK)
+            if not chunk:
+                break
+            if verify:
+                digest.update(chunk)
+                size += len(chunk)
+            yield chunk
+    if verify and (size != record.size or digest.hexdigest() != record.sha256):
+        raise ValueError(f"Spilled value {path} does not match its record (size or sha256 differ)")
+
+
+def resolve_output(value: str, *, verify: bool = True) -> str:
+    """
+    Return the full value behind a pointer record, or ``value`` itself if it is not one.
+
+    Safe to call on any output or input, spilled or not.
+
+    Example:
+        report = resolve_output(get_input("report"))
+
+    Args:
+        value (str): Output or input value.
+        verify (bool): Check the size and SHA-256 of the stored value.
+
+    Returns:
+        str: The resolved value.
+
+    Raises:
+        ValueError: If the stored file does not match the record.
+        FileNotFoundError: If the file is gone.
+    """
+    record = SpillRecord.parse(value)
+    if record is None:
+        return value
+    return b"".join(iter_spilled(record, verify=verify)).decode("utf-8")
+
+
+def spill_output(name: str, data: SpillData, *, compress: bool = False) -> SpillRecord:
+    """
+    Stream a value to a file and set output ``name`` to its pointer record, whatever its size.
+
+    Args:
+        name (str): Output name.
+        data (str | bytes | Iterable | IO): Value, chunks of it, or a file object to copy.
+        compress (bool): Store the file gzip-compressed.
+
+    Returns:
+        SpillRecord: Pointer to the stored value.
+    """
+    record = spill(data, compress=compress)
+    set_output(name, record.to_json())
+    return record
+
+
+class SpillOver:
+    """
+    Moves outputs and summary sections past a size threshold to files.
+
+    Installed with ``install_spill``, it is consulted by ``set_output`` and
+    ``append_summary``. A spilled output holds its ``SpillRecord`` JSON; a
+    spilled summary section is replaced by a short note with the record in
+    an HTML comment. The summary threshold applies to the summary file as a
+    whole, since the runner's limit is per step.
+
+    Attributes:
+        output_threshold (int): Largest output, in bytes, written as is.
+        summary_threshold (int): Largest summary file, in bytes, written as is.
+        compress (bool): Store spilled values gzip-compressed.
+    """
+
+    def __init__(
+        self,
+        output_threshold: int = DEFAULT_OUTPUT_THRESHOLD,
+        summary_threshold: int = DEFAULT_SUMMARY_THRESHOLD,
+        *,
+        compress: bool = False,
+    ) -> None:
+        self.output_threshold = output_threshold
+        self.summary_threshold = summary_threshold
+        self.compress = compress
+
+    @staticmethod
+    def _size(text: str, limit: int) -> int:
+        # UTF-8 takes at most 4 bytes per character; only encode when that could matter.
+        return len(text) if len(text) * 4 <= limit else len(text.encode("utf-8"))
+
+    def output(self, name: str, value: str) -> str:
+        if self._size(value, self.output_threshold) <= self.output_threshold:
+            return value
+        record = spill(value, compress=self.compress)
+        debug(f"Output {name} ({record.size} bytes) spilled to {record.path}")
+        return record.to_json()
+
+    def summary(self, body: str, path: Optional[str]) -> str:
+        current = os.path.getsize(path) if path and os.path.exists(path) else 0
+        limit = self.summary_threshold - current
+        if self._size(body, limit) <= limit:
+            return body
+        record = spill(body, compress=self.compress)
+        debug(f"Summary section ({record.size} bytes) spilled to {record.path}")
+        return (
+            f"\n> **Note:** a summary section of {record.size:,} bytes exceeded the size limit "
+            f"and was saved to `{record.path}`.\n\n<!-- {record.to_json()} -->\n"
+        )
+
+
+def install_spill(
+    output_threshold: int = DEFAULT_OUTPUT_THRESHOLD,
+    summary_threshold: int = DEFAULT_SUMMARY_THRESHOLD,
+    *,
+    compress: bool = False,
+) -> SpillOver:
+    """
+    Spill oversized outputs and summary sections to files for the rest of the process.
+
+    Replaces any spill-over installed before. Consumers read spilled outputs
+    with ``resolve_output``, in later steps of the same job.
+
+    Example:
+        install_spill(output_threshold=256 * 1024, compress=True)
+        set_output("report", huge_json)   # report={"spill":1,"path":"/runner/_temp/spill/…","size":…}
+
+    Args:
+        output_threshold (int): Largest output, in bytes, written as is.
+        summary_threshold (int): Largest step summary, in bytes, written as is.
+        compress (bool): Store spilled values gzip-compressed.
+
+    Returns:
+        SpillOver: The installed spill-over.
+    """
+    spiller = SpillOver(output_threshold, summary_threshold, compress=compress)
+    actions_core._spill = spiller
+    return spiller
+
+
+def uninstall_spill() -> Optional[SpillOver]:
+    """Stop spilling; return the spill-over that was installed, if any."""
+    spiller, actions_core._spill = actions_core._spill, None
+    return cast(Optional[SpillOver], spiller)  # only install_spill sets the hook
@@ -0,0 +1,776 @@
+import copy
+import hashlib
+import json
+import os
+import platform
+import re
+import shutil
+import stat
+import tarfile
+import tempfile
+import threading
+import time
+import uuid
+import zipfile
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import lru_cache
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Set, Tuple
+from urllib.parse import urlparse
+
+import requests
+
+DEFAULT_PART_SIZE = 8 * 1024 * 1024
+
+_ARCHES = {
+    "x86_64": "x64",
+    "amd64": "x64",
+    "x64": "x64",
+    "aarch64": "arm64",
+    "arm64": "arm64",
+    "i386": "x86",
+    "i686": "x86",
+    "x86": "x86",
+}
+
+
+def default_arch() -> str:
+    """
+    Return the runner architecture in tool-cache form.
+
+    Returns:
+        str: ``x64``, ``arm64``, ``x86`` (from ``RUNNER_ARCH`` or the host machine).
+    """
+    machine = (os.getenv("RUNNER_ARCH") or platform.machine()).lower()
+    return _ARCHES.get(machine, machine)
+
+
+def tool_cache_root() -> str:
+    """
+    Return the tool-cache root directory.
+
+    Returns:
+        str: ``$RUNNER_TOOL_CACHE``, or a directory under the system temp dir.
+    """
+    return os.getenv("RUNNER_TOOL_CACHE") or os.path.join(tempfile.gettempdir(), "tool-cache")
+
+
+def _temp_dir() -> str:
+    return os.getenv("RUNNER_TEMP") or tempfile.gettempdir()
+
+
+# ---------- versions ----------
+
+_VERSION_RE = re.compile(
+    r"^\s*[v=]?(\d+)(?:\.(\d+|[xX*]))?(?:\.(\d+|[xX*]))?(?:-([0-9A-Za-z.-]+))?(?:\+[0-9A-Za-z.-]+)?\s*$"
+)
+_COMPARATOR_RE = re.compile(r"^(\^|~|>=|<=|>|<|=)?(.*)$")
+
+_Key = Tuple[int, int, int, int, Tuple[Tuple[int, Any], ...]]
+
+
+@lru_cache(maxsize=4096)
+def _parse(text: str) -> Optional[Tuple[Tuple[Optional[int], ...], Optional[str]]]:
+    """Parse a possibly partial version; wildcard or missing parts become None."""
+    match = _VERSION_RE.match(text)
+    if not match:
+        return None
+    parts = tuple(int(p) if p and p.isdigit() else None for p in match.group(1, 2, 3))
+    return parts, match.group(4)
+
+
+def _key(parts: Sequence[Optional[int]], pre: Optional[str]) -> _Key:
+    ids = tuple((0, int(i)) if i.isdigit() else (1, i) for i in pre.split(".")) if pre else ()
+    major, minor, patch = (p or 0 for p in parts)
+    return (major, minor, patch, 0 if pre else 1, ids)
+
+
+def _range(op: str, text: str) -> List[Tuple[str, _Key]]:
+    """Expand one comparator (``^1.2``, ``~1``, ``1.x``, ``>=1.4`` ...) into primitive bounds."""
+    if text.lower() in ("*", "x"):
+        return []
+    parsed = _parse(text)
+    if parsed is None:
+        raise ValueError(f"Invalid version spec: {op}{text!r}")
+    parts, pre = parsed
+    major, minor, patch = parts
+    assert major is not None  # the pattern requires it
+    low = _key(parts, pre)
+
+    if op == "^":
+        if major > 0 or minor is None:
+            high = [major + 1, 0, 0]
+        elif minor > 0 or patch is None:
+            high = [0, minor + 1, 0]
+        else:
+            high = [0, 0, patch + 1]
+        return [(">=", low), ("<", _key(high, "0"))]
+    if op == "~" or (op in ("", "=") and None in parts):
+        if minor is None:
+            high = [major + 1, 0, 0]
+        else:
+            high = [major, minor + 1, 0]
+        return [(">=", low), ("<", _key(high, "0"))]
+    return [(op or "=", low)]
+
+
+_OPS = {
+    "=": lambda a, b: a == b,
+    ">=": lambda a, b: a >= b,
+    "<=": lambda a, b: a <= b,
+    ">": lambda a, b: a > b,
+    "<": lambda a, b: a < b,
+}
+
+
+def satisfies(version: str, spec: str) -> bool:
+    """
+    Return True if ``version`` matches an npm-style semver range.
+
+    Supports exact versions, ``x``/``*`` wildcards and partial versions
+    (``1.x``, ``1.2``), caret and tilde ranges, ``<``/``<=``/``>``/``>=``
+    comparators separated by spaces, and ``||`` alternatives. Pre-releases only
+    match when the spec itself names a pre-release.
+
+    Args:
+        version (str): Concrete version, e.g. ``1.2.3``.
+        spec (str): Range, e.g. ``^1.2``, ``>=18 <21 || 22.x``.
+
+    Returns:
+        bool: Whether the version is in range.
+    """
+    parsed = _parse(version)
+    if parsed is None or None in parsed[0]:
+        return False
+    parts, pre = parsed
+    if pre and "-" not in spec:
+        return False
+    key = _key(parts, pre)
+    return any(
+        all(_OPS[op](key, bound) for op, bound in bounds) for bounds in _compile_spec(spec)
+    )
+
+
+@lru_cache(maxsize=256)
+def _compile_spec(spec: str) -> Tuple[Tuple[Tuple[str, _Key], ...], ...]:
+    """Turn a range into ``||`` alternatives of primitive ``(op, key)`` bounds."""
+    alternatives = []
+    for alternative in spec.split("||"):
+        bounds: List[Tuple[str, _Key]] = []
+        for token in alternative.split():
+            op, text = _COMPARATOR_RE.match(token).group(1, 2)  # type: ignore[union-attr]
+            bounds.extend(_range(op or "", text))
+        alternatives.append(tuple(bounds))
+    return tuple(alternatives)
+
+
+def evaluate_versions(versions: Iterable[str], spec: str) -> Optional[str]:
+    """
+    Return the highest version in ``versions`` satisfying ``spec``.
+
+    Args:
+        versions (Iterable[str]): Candidate versions.
+        spec (str): Semver range (see ``satisfies``).
+
+    Returns:
+        str | None: The best match, or None.
+    """
+    matches = [v for v in versions if satisfies(v, spec)]
+    if not matches:
+        return None
+    return max(matches, key=lambda v: _key(*_parse(v)))  # type: ignore[misc]
+
+
+# ---------- index ----------
+
+# Freshness stamp: mtime of the tool directory (key "") and of each version
+# directory. Installing a version changes the former, adding an architecture
+# to an existing version only the latter.
+_Stamp = Dict[str, int]
+_Index = Tuple[_Stamp, Dict[str, List[str]]]
+
+_index_cache: Dict[str, _Index] = {}
+_index_lock = threading.Lock()
+
+
+def _index_path(root: str, tool: str) -> str:
+    # Kept outside the tool directory so writing it does not change that directory's mtime.
+    return os.path.join(root, ".index", f"{tool}.json")
+
+
+def _scan_tool(tool_dir: str) -> _Index:
+    versions: Dict[str, List[str]] = {}
+    try:
+        # Stamp before listing, so changes made during the scan make it stale.
+        stamp = {"": os.stat(tool_dir).st_mtime_ns}
+        entries = list(os.scandir(tool_dir))
+    except FileNotFoundError:
+        return {"": -1}, versions
+    for entry in entries:
+        if not entry.is_dir():
+            continue
+        try:
+            stamp[entry.name] = entry.stat().st_mtime_ns
+            names = os.listdir(entry.path)
+        except FileNotFoundError:
+            continue
+        arches = [n[: -len(".complete")] for n in names if n.endswith(".complete")]
+        if arches:
+            versions[entry.name] = sorted(arches)
+    return stamp, versions
+
+
+def _fresh(tool_dir: str, stamp: _Stamp) -> bool:
+    try:
+        return all(os.stat(os.path.join(tool_dir, name)).st_mtime_ns == mtime for name, mtime in stamp.items())
+    except OSError:
+        return False
+
+
+def _write_index(root: str, tool: str, stamp: _Stamp, versions: Dict[str, List[str]]) -> None:
+    path = _index_path(root, tool)
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        with os.fdopen(fd, "w") as f:
+            json.dump({"stamp": stamp, "versions": versions}, f)
+        os.replace(tmp, path)
+    except OSError:
+        pass  # read-only tool caches still work from the in-memory index
+
+
+def _index(tool: str, refresh: bool = False) -> Dict[str, List[str]]:
+    """
+    Return ``{version: [arch, ...]}`` for a tool without walking its directory.
+
+    The index is stored in ``<root>/.index/<tool>.json`` together with the
+    mtimes of the tool directory and of each version directory; it is rebuilt
+    (once) when any of them changes, e.g. after another tool-cache
+    implementation added a version or an architecture.
+    """
+    root = tool_cache_root()
+    tool_dir = os.path.join(root, tool)
+    if not os.path.isdir(tool_dir):
+        return {}
+
+    with _index_lock:
+        cached = _index_cache.get(tool_dir)
+        if not refresh and cached is not None and _fresh(tool_dir, cached[0]):
+            return cached[1]
+
+        index: Optional[_Index] = None
+        if not refresh:
+            try:
+                with open(_index_path(root, tool)) as f:
+                    data = json.load(f)
+                if _fresh(tool_dir, data["stamp"]):
+                    index = (data["stamp"], data["versions"])
+            except (OSError, ValueError, KeyError, TypeError, AttributeError):
+                pass
+        if index is None:
+            index = _scan_tool(tool_dir)
+            _write_index(root, tool, *index)
+        _index_cache[tool_dir] = index
+        return index[1]
+
+
+def find_all_versions(tool: str, arch: Optional[str] = None) -> List[str]:
+    """
+    Return every cached version of ``tool`` for ``arch``, highest first.
+
+    Args:
+        tool (str): Tool name, e.g. ``node``.
+        arch (str | None): Architecture; defaults to ``default_arch()``.
+
+    Returns:
+        List[str]: Cached versions.
+    """
+    arch = arch or default_arch()
+    versions = [v for v, arches in _index(tool).items() if arch in arches]
+    valid = [v for v in versions if _parse(v) is not None]
+    return sorted(valid, key=lambda v: _key(*_parse(v)), reverse=True)  # type: ignore[misc]
+
+
+def find(tool: str, version_spec: str, arch: Optional[str] = None) -> Optional[str]:
+    """
+    Find a cached tool directory matching a version range.
+
+    Lookups read a small per-tool index (a ``stat`` per cached version plus an
+    in-memory dictionary once loaded) instead of scanning the cache. Directories created
+    by other tool-cache implementations are picked up automatically.
+
+    Example:
+        node = find("node", "20.x") or cache_dir(extract_tar(download_tool(url)), "node", "20.11.1")
+
+    Args:
+        tool (str): Tool name.
+        version_spec (str): Exact version or semver range (see ``satisfies``).
+        arch (str | None): Architecture; defaults to ``default_arch()``.
+
+    Returns:
+        str | None: Path of the cached tool, or None if no version matches.
+    """
+    arch = arch or default_arch()
+    for refresh in (False, True):
+        versions = [v for v, arches in _index(tool, refresh).items() if arch in arches]
+        version = evaluate_versions(versions, version_spec)
+        if version is None:
+            return None
+        path = os.path.join(tool_cache_root(), tool, version, arch)
+        if os.path.exists(path + ".complete"):
+            return path
+    return None
+
+
+# ---------- caching ----------
+
+
+def _store_path(root: str, digest: str, mode: int) -> str:
+    # Hardlinks share permissions, so the mode is part of the store key.
+    return os.path.join(root, ".store", digest[:2], f"{digest}-{mode:o}")
+
+
+def _sha256(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _place_file(root: str, src: str, dst: str, dedupe: bool) -> bool:
+    """Copy ``src`` to ``dst``, hardlinking through the content store when possible.
+
+    Returns True if ``dst`` shares its data with an already cached file.
+    """
+    if not dedupe:
+        shutil.copy2(src, dst)
+        return False
+    mode = stat.S_IMODE(os.stat(src).st_mode)
+    store = _store_path(root, _sha256(src), mode)
+    existed = os.path.exists(store)
+    try:
+        if not existed:
+            os.makedirs(os.path.dirname(store), exist_ok=True)
+            tmp = f"{store}.{uuid.uuid4().hex}.tmp"
+            shutil.copy2(src, tmp)
+            os.replace(tmp, store)
+        os.link(store, dst)
+    except OSError:
+        # Cross-device store, link limits or no hardlink support: plain copy.
+        shutil.copy2(src, dst)
+        return False
+    return existed
+
+
+def cache_dir(
+    source_dir: str,
+    tool: str,
+    version: str,
+    arch: Optional[str] = None,
+    *,
+    dedupe: bool = True,
+    workers: Optional[int] = None,
+) -> str:
+    """
+    Copy a directory into the tool cache and register it in the index.
+
+    With ``dedupe`` (the default), every file is stored once in a content store
+    under the tool-cache root and hardlinked into place, so files identical
+    across versions or architectures take disk space only once. Cached tools
+    must therefore be treated as read-only. Files are hashed and placed on a
+    thread pool.
+
+    Args:
+        source_dir (str): Directory to cache (e.g. the output of ``extract_tar``).
+        tool (str): Tool name.
+        version (str): Exact version (a leading ``v`` is dropped).
+        arch (str | None): Architecture; defaults to ``default_arch()``.
+        dedupe (bool): Hardlink identical files through the content store.
+        workers (int | None): Thread-pool size; defaults to ``min(32, cpu + 4)``.
+
+    Returns:
+        str: The cached tool directory.
+
+    Raises:
+        ValueError: If ``version`` is not a valid version.
+    """
+    parsed = _parse(version)
+    if parsed is None or None in parsed[0]:
+        raise ValueError(f"Invalid tool version: {version!r}")
+    version = version.strip().lstrip("v=")
+    arch = arch or default_arch()
+    root = tool_cache_root()
+    dest = os.path.join(root, tool, version, arch)
+    marker = dest + ".complete"
+
+    if os.path.exists(marker):
+        os.remove(marker)
+    shutil.rmtree(dest, ignore_errors=True)
+    os.makedirs(dest)
+
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="tool-cache") as pool:
+        futures: List[Future] = []
+        for current, dirnames, filenames in os.walk(source_dir):
+            rel = os.path.relpath(current, source_dir)
+            target_dir = dest if rel == "." else os.path.join(dest, rel)
+            for name in dirnames + filenames:
+                src = os.path.join(current, name)
+                dst = os.path.join(target_dir, name)
+                if os.path.islink(src):
+                    os.symlink(os.readlink(src), dst)
+                elif os.path.isdir(src):
+                    os.makedirs(dst, exist_ok=True)
+                else:
+                    futures.append(pool.submit(_place_file, root, src, dst, dedupe))
+        for future in futures:
+            future.result()
+
+    with open(marker, "w"):
+        pass
+    _index(tool, refresh=True)
+    return dest
+
+
+def cache_file(
+    source_file: str,
+    target_name: str,
+    tool: str,
+    version: str,
+    arch: Optional[str] = None,
+) -> str:
+    """
+    Cache a single file (e.g. a standalone binary) as ``<tool dir>/<target_name>``.
+
+    Args:
+        source_file (str): File to cache.
+        target_name (str): File name inside the cached tool directory.
+        tool (str): Tool name.
+        version (str): Exact version.
+        arch (str | None): Architecture; defaults to ``default_arch()``.
+
+    Returns:
+        str: The cached tool directory.
+    """
+    staging = tempfile.mkdtemp(dir=_temp_dir())
+    try:
+        shutil.copy2(source_file, os.path.join(staging, target_name))
+        return cache_dir(staging, tool, version, arch)
+    finally:
+        shutil.rmtree(staging, ignore_errors=True)
+
+
+# ---------- extraction ----------
+
+
+def _safe_join(dest: str, name: str, strip_components: int = 0) -> Optional[str]:
+    """Resolve an archive member name under ``dest``; None if stripped away."""
+    parts = [p for p in name.replace("\\", "/").split("/") if p not in ("", ".")]
+    if name.startswith(("/", "\\")) or re.match(r"^[A-Za-z]:", name) or ".." in parts:
+        raise ValueError(f"Refusing to extract unsafe path {name!r}")
+    parts = parts[strip_components:]
+    return os.path.join(dest, *parts) if parts else None
+
+
+def _inside(root: str, path: str) -> bool:
+    return path == root or path.startswith(root.rstrip(os.sep) + os.sep)
+
+
+def _check_parent(root: str, path: str, checked: Set[str]) -> None:
+    """
+    Refuse ``path`` if its directory resolves, through symlinks already on disk, outside ``root``.
+
+    ``root`` is the real path of the destination. Checked directories are
+    remembered: they exist as real directories afterwards, so a later member
+    cannot turn them into links.
+    """
+    parent = os.path.dirname(path)
+    if parent in checked:
+        return
+    if not _inside(root, os.path.realpath(parent)):
+        raise ValueError(f"Refusing to extract {path!r} through a symlink leaving the destination")
+    checked.add(parent)
+
+
+def _check_link(root: str, path: str, target: str) -> None:
+    resolved = os.path.realpath(os.path.join(os.path.dirname(path), target))
+    if os.path.isabs(target) or not _inside(root, resolved):
+        raise ValueError(f"Refusing to extract link escaping the destination: {target!r}")
+
+
+def _check_symlink(root: str, path: str, target: str, checked: Set[str]) -> None:
+    _check_parent(root, path, checked)
+    _check_link(root, path, target)
+    if os.path.isdir(path) and not os.path.islink(path):
+        raise ValueError(f"Refusing to replace directory {path!r} with a symlink")
+
+
+def _make_link(root: str, path: str, target: str) -> None:
+    _check_symlink(root, path, target, set())
+    if os.path.lexists(path):
+        os.remove(path)
+    os.symlink(target, path)
+
+
+def _unlink_symlink(path: str) -> None:
+    # Regular members replace a link of the same name instead of writing through it.
+    if os.path.islink(path):
+        os.remove(path)
+
+
+def _checked_members(
+    tar: tarfile.TarFile, dest: str, strip_components: int
+) -> Iterator[tarfile.TarInfo]:
+    """
+    Yield the members of ``tar`` to extract, renamed for ``strip_components``.
+
+    Consumed lazily by ``extractall``, so every check sees the members
+    extracted before it. Devices and fifos are skipped; ownership is left to
+    the extracting user.
+    """
+    root = os.path.realpath(dest)
+    checked: Set[str] = set()
+    for member in tar:
+        if not (member.isdir() or member.isreg() or member.issym() or member.islnk()):
+            continue
+        target = _safe_join(dest, member.name, strip_components)
+        if target is None:
+            continue
+        _check_parent(root, target, checked)
+        member = copy.copy(member)
+        member.name = os.path.relpath(target, dest).replace(os.sep, "/")
+        member.uid = member.gid = -1
+        member.uname = member.gname = ""
+        if member.isdir():
+            member.mode |= stat.S_IWUSR | stat.S_IXUSR
+        elif member.issym():
+            _check_symlink(root, target, member.linkname, checked)
+        elif member.islnk():
+            source = _safe_join(dest, member.linkname, strip_components)
+            if source is None:
+                raise ValueError(f"Hard link target stripped away: {member.linkname!r}")
+            _check_parent(root, source, checked)
+            member.linkname = os.path.relpath(source, dest).replace(os.sep, "/")
+            if os.path.lexists(target):
+                os.remove(target)
+        else:
+            _unlink_symlink(target)
+        yield member
+
+
+def extract_tar(path: str, dest: Optional[str] = None, *, strip_components: int = 0) -> str:
+    """
+    Extract a tar archive (plain, gzip, bzip2 or xz) in a single streaming pass.
+
+    The archive is read sequentially, never seeked, by ``tarfile.extractall``.
+    Absolute paths, ``..`` components, links pointing outside ``dest`` and
+    members whose directory resolves outside ``dest`` through links already
+    extracted are rejected.
+
+    Args:
+        path (str): Archive path.
+        dest (str | None): Destination; defaults to a new directory under ``RUNNER_TEMP``.
+        strip_components (int): Leading path components to drop, as in ``tar --strip-components``.
+
+    Returns:
+        str: The destination directory.
+
+    Raises:
+        ValueError: If a member would be written outside ``dest``.
+    """
+    dest = dest or os.path.join(_temp_dir(), str(uuid.uuid4()))
+    os.makedirs(dest, exist_ok=True)
+    # Members are checked above; the default filter of newer Pythons would
+    # also rewrite their modes.
+    options: Dict[str, Any] = {"filter": "fully_trusted"} if hasattr(tarfile, "fully_trusted_filter") else {}
+    with tarfile.open(path, "r|*") as tar:
+        tar.extractall(dest, members=_checked_members(tar, dest, strip_components), **options)
+    return dest
+
+
+def _zip_members(archive: str, members: List[Tuple[zipfile.ZipInfo, str]]) -> None:
+    """Extract a slice of members through one archive handle (one per worker)."""
+    with zipfile.ZipFile(archive) as zf:
+        for info, target in members:
+            with zf.open(info) as src, open(target, "wb") as f:
+                shutil.copyfileobj(src, f, 1024 * 1024)
+            mode = (info.external_attr >> 16) & 0o7777
+            if mode:
+                os.chmod(target, mode)
+            mtime = time.mktime(info.date_time + (0, 0, -1))
+            os.utime(target, (mtime, mtime))
+
+
+def extract_zip(
+    path: str,
+    dest: Optional[str] = None,
+    *,
+    strip_components: int = 0,
+    workers: Optional[int] = None,
+) -> str:
+    """
+    Extract a zip archive, decompressing members in parallel.
+
+    Members are spread over the worker threads, each with its own handle on
+    the archive, so they are inflated and written concurrently. Unix permissions and symlinks stored
+    in the archive are restored. Unsafe paths are rejected as in ``extract_tar``.
+
+    Args:
+        path (str): Archive path.
+        dest (str | None): Destination; defaults to a new directory under ``RUNNER_TEMP``.
+        strip_components (int): Leading path components to drop.
+        workers (int | None): Writer threads; defaults to ``min(32, cpu + 4)``.
+
+    Returns:
+        str: The destination directory.
+
+    Raises:
+        ValueError: If a member would be written outside ``dest``.
+    """
+    dest = dest or os.path.join(_temp_dir(), str(uuid.uuid4()))
+    os.makedirs(dest, exist_ok=True)
+    root = os.path.realpath(dest)
+    checked: Set[str] = set()
+    links: List[Tuple[str, str]] = []
+    with zipfile.ZipFile(path) as zf:
+        infos = zf.infolist()
+        files: List[Tuple[zipfile.ZipInfo, str]] = []
+        for info in infos:
+            target = _safe_join(dest, info.filename, strip_components)
+            if target is None:
+                continue
+            _check_parent(root, target, checked)
+            if info.is_dir():
+                os.makedirs(target, exist_ok=True)
+                continue
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            if stat.S_ISLNK(info.external_attr >> 16):
+                links.append((target, zf.read(info).decode("utf-8")))
+            else:
+                _unlink_symlink(target)
+                files.append((info, target))
+
+    workers = workers or min(32, (os.cpu_count() or 1) + 4)
+    files.sort(key=lambda item: item[0].file_size, reverse=True)
+    slices = [files[i::workers] for i in range(workers) if files[i::workers]]
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="extract") as pool:
+        for future in [pool.submit(_zip_members, path, members) for members in slices]:
+            future.result()
+    # Links go last so no member is written through one; each is checked
+    # against the links created before it.
+    for target, link in links:
+        _make_link(root, target, link)
+    return dest
+
+
+# ---------- download ----------
+
+
+def _fetch_range(
+    session: requests.Session,
+    url: str,
+    target: str,
+    start: int,
+    end: int,
+    headers: Dict[str, str],
+    retries: int,
+) -> None:
+    for attempt in range(retries + 1):
+        try:
+            response = session.get(
+                url, headers={**headers, "Range": f"bytes={start}-{end}"}, stream=True, timeout=60
+            )
+            response.raise_for_status()
+            if response.status_code != 206:
+                raise requests.HTTPError(f"Range request ignored for {url}", response=response)
+            with open(target, "r+b") as f:
+                f.seek(start)
+                for block in response.iter_content(1024 * 1024):
+                    f.write(block)
+            return
+        except requests.RequestException:
+            if attempt >= retries:
+                raise
+            time.sleep(min(10.0, 2**attempt))
+
+
+def download_tool(
+    url: str,
+    dest: Optional[str] = None,
+    *,
+    auth: Optional[str] = None,
+    headers: Optional[Dict[str, str]] = None,
+    part_size: int = DEFAULT_PART_SIZE,
+    workers: int = 4,
+    retries: int = 3,
+) -> str:
+    """
+    Download a file, fetching byte ranges in parallel when the server allows it.
+
+    The first request asks for the first ``part_size`` bytes. If the server
+    answers ``206 Partial Content``, the rest of the file is fetched as
+    ``workers`` concurrent range requests written at their offsets; otherwise
+    the full response is streamed to disk. Redirects (e.g. release assets) are
+    followed once and the final URL is reused for the ranges.
+
+    Args:
+        url (str): File URL.
+        dest (str | None): Target path; defaults to a new file under ``RUNNER_TEMP``.
+        auth (str | None): Value of the ``Authorization`` header (e.g. ``token ghp_...``).
+        headers (Dict[str, str] | None): Extra request headers.
+        part_size (int): Minimum bytes per range request.
+        workers (int): Concurrent range requests.
+        retries (int): Retries per range on network or HTTP errors.
+
+    Returns:
+        str: Path of the downloaded file.
+
+    Raises:
+        requests.HTTPError: If the server answers with an error status.
+    """
+    dest = dest or os.path.join(_temp_dir(), str(uuid.uuid4()))
+    os.makedirs(os.path.dirname(dest) or ".", exist_ok=True)
+    request_headers = dict(headers or {})
+    if auth:
+        request_headers["Authorization"] = auth
+
+    with requests.Session() as session:
+        response = session.get(
+            url,
+            headers={**request_headers, "Range": f"bytes=0-{part_size - 1}"},
+            stream=True,
+            timeout=60,
+        )
+        if response.status_code == 416:  # empty file
+            open(dest, "wb").close()
+            return dest
+        response.raise_for_status()
+        total = None
+        if response.status_code == 206:
+            match = re.match(r"bytes \d+-\d+/(\d+)", response.headers.get("Content-Range", ""))
+            total = int(match.group(1)) if match else None
+
+        with open(dest, "wb") as f:
+            for block in response.iter_content(1024 * 1024):
+                f.write(block)
+            if total is not None:
+                f.truncate(total)
+        if total is None or total <= part_size:
+            return dest
+
+        # Authorization is not forwarded to a redirect target on another host.
+        final_url = response.url
+        if urlparse(final_url).netloc != urlparse(url).netloc:
+            request_headers.pop("Authorization", None)
+        remaining = total - part_size
+        size = max(part_size, -(-remaining // max(1, workers)))
+        ranges = [(s, min(s + size, total) - 1) for s in range(part_size, total, size)]
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="download") as pool:
+            futures = [
+                pool.submit(
+                    _fetch_range, session, final_url, dest, start, end, request_headers, retries
+                )
+                for start, end in ranges
+            ]
+            for future in futures:
+                future.result()
+    return dest
@@ -0,0 +1,114 @@
+import weakref
+from typing import Any, Callable, List, Tuple, cast
+
+from github import Github
+from requests import PreparedRequest, Response, Session
+from requests.adapters import BaseAdapter
+
+_CREATE_CONNECTION = "_Requester__createConnection"
+
+
+class DelegatingAdapter(BaseAdapter):
+    """
+    A requests transport adapter that forwards to another adapter.
+
+    Subclasses override ``send`` to add behaviour (caching, throttling, ...)
+    around ``self.inner.send``; wrappers can be stacked in any order.
+
+    Attributes:
+        inner (BaseAdapter): The adapter requests are forwarded to.
+    """
+
+    def __init__(self, inner: BaseAdapter) -> None:
+        super().__init__()
+        self.inner = inner
+
+    def send(self, request: PreparedRequest, **kwargs: Any) -> Response:  # type: ignore[override]
+        return self.inner.send(request, **kwargs)
+
+    def close(self) -> None:
+        self.inner.close()
+
+
+class _ConnectionHook:
+    """
+    Stands in for ``Requester.__createConnection`` on one requester and applies
+    the installed wrappers to every connection it creates, so they survive
+    ``close()`` and connections to other hosts.
+    """
+
+    def __init__(self, create: Callable[..., Any]) -> None:
+        self.create = create
+        self.wraps: List[Callable[[BaseAdapter], BaseAdapter]] = []
+        # Number of wrappers already mounted on each session.
+        self._applied: "weakref.WeakKeyDictionary[Session, int]" = weakref.WeakKeyDictionary()
+
+    def __call__(self, *args: Any, **kwargs: Any) -> Any:
+        connection = self.create(*args, **kwargs)
+        session = connection.session
+        prefix = f"{connection.protocol}://"
+        for wrap in self.wraps[self._applied.get(session, 0):]:
+            session.mount(prefix, wrap(session.get_adapter(f"{prefix}{connection.host}")))
+        self._applied[session] = len(self.wraps)
+        return connection
+
+    def __reduce__(self) -> Tuple[Any, ...]:
+        # Wrappers hold locks and closures; an unpickled client must not
+        # quietly run without them.
+        return (_UnpickledHook, ())
+
+
+class _UnpickledHook:
+    """Takes the place of a ``_ConnectionHook`` in an unpickled client."""
+
+    def __call__(self, *args: Any, **kwargs: Any) -> Any:
+        raise RuntimeError(
+            "transport adapters do not survive pickling; create the client "
+            "with get_github_client() in the process that uses it"
+        )
+
+
+def install_adapter(
+    client: Github, wrap: Callable[[BaseAdapter], BaseAdapter]
+) -> BaseAdapter:
+    """
+    Wrap the transport adapter underneath a PyGithub client.
+
+    PyGithub keeps one ``requests.Session`` per connection behind its
+    ``Requester``; this creates that connection eagerly and replaces the
+    adapter mounted for the API host with ``wrap(current_adapter)``. Every
+    connection the client creates later (after ``close()``, or for another
+    host) is wrapped the same way.
+
+    Note:
+        This replaces PyGithub's private ``Requester.__createConnection`` on
+        the client, which is why the PyGithub dependency is pinned to the
+        tested range (2.2 to 2.8). Requesters PyGithub derives from the client
+        (``withLazy``) are not wrapped, and an unpickled client raises
+        ``RuntimeError`` instead of silently dropping its adapters.
+
+    Args:
+        client (Github): Client whose transport should be wrapped.
+        wrap (Callable[[BaseAdapter], BaseAdapter]): Factory receiving the current adapter.
+
+    Returns:
+        BaseAdapter: The installed adapter.
+
+    Raises:
+        RuntimeError: If the installed PyGithub has no such private hook.
+    """
+    requester = client.requester
+    hook = vars(requester).get(_CREATE_CONNECTION)
+    if not isinstance(hook, _ConnectionHook):
+        create = getattr(requester, _CREATE_CONNECTION, None)
+        if create is None:
+            raise RuntimeError(
+                "install_adapter does not support this PyGithub version "
+                "(tested with PyGithub>=2.2.0,<2.8.1)"
+            )
+        hook = _ConnectionHook(create)
+        setattr(requester, _CREATE_CONNECTION, hook)
+    hook.wraps.append(wrap)
+    connection = hook()
+    prefix = f"{connection.protocol}://"
+    return cast(BaseAdapter, connection.session.get_adapter(f"{prefix}{connection.host}"))
@@ -0,0 +1,80 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, List, Tuple
+
+import pytest
+
+Handler = Callable[["StubRequest"], Tuple[int, Dict[str, str], Any]]
+
+
+class StubRequest:
+    def __init__(self, method: str, path: str, headers: Dict[str, str], body: bytes) -> None:
+        self.method = method
+        self.path = path
+        self.headers = headers
+        self.body = body
+
+    def json(self) -> Any:
+        return json.loads(self.body or b"null")
+
+
+class StubServer:
+    """Local stand-in for the GitHub API. Routes map (method, path) to handlers."""
+
+    def __init__(self) -> None:
+        self.routes: Dict[Tuple[str, str], Handler] = {}
+        self.requests: List[StubRequest] = []
+        self.lock = threading.Lock()
+        stub = self
+
+        class _Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def _dispatch(self) -> None:
+                length = int(self.headers.get("Content-Length") or 0)
+                request = StubRequest(
+                    self.command, self.path, dict(self.headers.items()), self.rfile.read(length)
+                )
+                with stub.lock:
+                    stub.requests.append(request)
+                handler = stub.routes.get((self.command, self.path.split("?")[0]))
+                if handler is None:
+                    status, headers, body = 404, {}, {"message": "Not Found"}
+                else:
+                    status, headers, body = handler(request)
+                data = body if isinstance(body, bytes) else json.dumps(body).encode()
+                if status == 304:
+                    data = b""
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json; charset=utf-8")
+                for key, value in headers.items():
+                    self.send_header(key, value)
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            do_GET = do_POST = do_PATCH = do_PUT = do_DELETE = _dispatch
+
+            def log_message(self, format: str, *args: Any) -> None:
+                pass
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+        self.httpd.daemon_threads = True
+        self.url = f"http://127.0.0.1:{self.httpd.server_address[1]}"
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    def route(self, method: str, path: str, handler: Handler) -> None:
+        self.routes[(method, path)] = handler
+
+    def calls(self, method: str, path: str) -> List[StubRequest]:
+        return [r for r in self.requests if r.method == method and r.path.split("?")[0] == path]
+
+
+@pytest.fixture
+def stub_server():
+    server = StubServer()
+    server.thread.start()
+    yield server
+    server.httpd.shutdown()
+    server.httpd.server_close()
@@ -89,6 +89,16 @@ def test_set_secret_masks_in_logs(capsys: pytest.CaptureFixture[str]) -> None:
     out = capsys.readouterr().out
     assert "::add-mask::supersecret" in out
 
+
+def test_set_secret_is_not_buffered_by_task_log(capsys: pytest.CaptureFixture[str]) -> None:
+    with core.task_log("deploy"):
+        core.set_secret("s3cr3t-token")
+        assert capsys.readouterr().out == "::add-mask::s3cr3t-token\n"
+        core.info("token=s3cr3t-token")
+    out = capsys.readouterr().out
+    assert "::add-mask::" not in out and "::group::deploy" in out
+
+
 def test_set_failed_no_exit():
     # set_failed(exit=False) logs but does not exit
     core.set_failed("Logged error only", fail=False)
@@ -97,3 +107,81 @@ def test_fail_now():
     with pytest.raises(SystemExit) as ex:
         core.fail_action("Immediate fail")
     assert ex.value.code == 1
+
+
+def test_task_log_keeps_parallel_output_contiguous(capsys: pytest.CaptureFixture[str]) -> None:
+    import asyncio
+
+    async def task(name: str) -> None:
+        with core.task_log(name):
+            for i in range(3):
+                core.info(f"{name} step {i}")
+                await asyncio.sleep(0)
+            with core.group("details"):
+                core.notice(f"{name} done")
+
+    async def main() -> None:
+        await asyncio.gather(task("a"), task("b"))
+
+    asyncio.run(main())
+    out = capsys.readouterr().out
+    assert out.count("::group::") == 2
+    for name in ("a", "b"):
+        start = out.index(f"::group::{name}\n")
+        block = out[start : out.index("::endgroup::", start)]
+        assert block == (
+            f"::group::{name}\n{name} step 0\n{name} step 1\n{name} step 2\n"
+            f"▶ details\n::notice::{name} done\n"
+        )
+
+
+def test_task_log_spills_and_nests(capsys: pytest.CaptureFixture[str], monkeypatch: pytest.MonkeyPatch) -> None:
+    import threading
+
+    monkeypatch.setattr(core, "_debug_enabled", True)
+
+    def worker(i: int) -> None:
+        with core.task_log(f"worker {i}", max_memory=64):
+            core.info("x" * 100)
+            with core.task_log("inner"):
+                core.debug(f"inner {i}")
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    out = capsys.readouterr().out
+    for i in range(4):
+        assert f"::group::worker {i}\n{'x' * 100}\n\u25b6 inner\n::debug::inner {i}\n::endgroup::\n" in out
+
+
+def test_debug_is_lazy_and_gated(capsys: pytest.CaptureFixture[str], monkeypatch: pytest.MonkeyPatch) -> None:
+    calls = []
+
+    def expensive() -> str:
+        calls.append(1)
+        return "built"
+
+    monkeypatch.setattr(core, "_debug_enabled", False)
+    core.debug(expensive)
+    core.debug("%s items", [1, 2])
+    assert not core.is_debug() and calls == [] and capsys.readouterr().out == ""
+
+    monkeypatch.setattr(core, "_debug_enabled", True)
+    core.debug(expensive)
+    core.debug("%d%% of %s", 50, "a\nb")
+    assert calls == [1]
+    assert capsys.readouterr().out == "::debug::built\n::debug::50%25 of a%0Ab\n"
+
+
+def test_debug_flag_reads_runner_environment(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("GITHUB_ACTIONS", "true")
+    monkeypatch.delenv("RUNNER_DEBUG", raising=False)
+    assert core._read_debug_flag() is False
+    monkeypatch.setenv("RUNNER_DEBUG", "1")
+    assert core._read_debug_flag() is True
+    monkeypatch.delenv("GITHUB_ACTIONS")
+    monkeypatch.delenv("RUNNER_DEBUG")
+    assert core._read_debug_flag() is True
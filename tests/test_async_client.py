@@ -0,0 +1,98 @@
+import asyncio
+import threading
+import time
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+from github import GithubException
+
+from actions_tool_kit.async_client import get_async_github_client
+
+PATH = "/repos/octocat/repo/pulls/1/files"
+
+
+def _paged_route(server, total, per_page, stats, link_last=True, last_param="page"):
+    lock = threading.Lock()
+    pages = (total + per_page - 1) // per_page
+
+    def route(request):
+        page = int(parse_qs(urlparse(request.path).query).get("page", ["1"])[0])
+        with lock:
+            stats["active"] += 1
+            stats["peak"] = max(stats["peak"], stats["active"])
+        time.sleep(0.02)
+        with lock:
+            stats["active"] -= 1
+        start = (page - 1) * per_page
+        items = [{"filename": f"f{n}"} for n in range(start, min(start + per_page, total))]
+        links = []
+        if page < pages:
+            links.append(f'<{server.url}{PATH}?per_page={per_page}&page={page + 1}>; rel="next"')
+            if link_last:
+                links.append(f'<{server.url}{PATH}?per_page={per_page}&{last_param}={pages}>; rel="last"')
+        return 200, {"Link": ", ".join(links)} if links else {}, items
+
+    return route
+
+
+async def _collect(client, **kwargs):
+    async with client:
+        return [item["filename"] async for item in client.paginate(PATH, **kwargs)]
+
+
+def test_paginate_fetches_pages_concurrently_in_order(stub_server):
+    stats = {"active": 0, "peak": 0}
+    stub_server.route("GET", PATH, _paged_route(stub_server, total=95, per_page=10, stats=stats))
+    client = get_async_github_client("ghp_test", base_url=stub_server.url, per_page=10, max_concurrency=4)
+
+    names = asyncio.run(_collect(client))
+
+    assert names == [f"f{n}" for n in range(95)]
+    assert len(stub_server.calls("GET", PATH)) == 10
+    assert 1 < stats["peak"] <= 4
+    assert stub_server.requests[0].headers["Authorization"] == "token ghp_test"
+
+
+def test_paginate_follows_next_links_without_last(stub_server):
+    stats = {"active": 0, "peak": 0}
+    stub_server.route(
+        "GET", PATH, _paged_route(stub_server, total=25, per_page=10, stats=stats, link_last=False)
+    )
+    client = get_async_github_client("ghp_test", base_url=stub_server.url, per_page=10)
+
+    assert asyncio.run(_collect(client)) == [f"f{n}" for n in range(25)]
+    assert stats["peak"] == 1
+
+
+def test_paginate_walks_next_links_when_last_has_no_page_number(stub_server):
+    stats = {"active": 0, "peak": 0}
+    stub_server.route(
+        "GET", PATH, _paged_route(stub_server, total=25, per_page=10, stats=stats, last_param="before")
+    )
+    client = get_async_github_client("ghp_test", base_url=stub_server.url, per_page=10)
+
+    assert asyncio.run(_collect(client)) == [f"f{n}" for n in range(25)]
+
+
+def test_client_can_be_reused_across_event_loops(stub_server):
+    stats = {"active": 0, "peak": 0}
+    stub_server.route("GET", PATH, _paged_route(stub_server, total=50, per_page=10, stats=stats))
+    client = get_async_github_client("ghp_test", base_url=stub_server.url, per_page=10, max_concurrency=2)
+
+    async def names():
+        return [item["filename"] async for item in client.paginate(PATH)]
+
+    assert asyncio.run(names()) == asyncio.run(names()) == [f"f{n}" for n in range(50)]
+    asyncio.run(client.close())
+
+
+def test_errors_raise_github_exception(stub_server):
+    client = get_async_github_client("ghp_test", base_url=stub_server.url)
+
+    async def fetch():
+        async with client:
+            await client.get("/repos/octocat/missing")
+
+    with pytest.raises(GithubException) as exc:
+        asyncio.run(fetch())
+    assert exc.value.status == 404
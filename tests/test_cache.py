@@ -0,0 +1,113 @@
+import os
+import shutil
+
+import pytest
+from actions_tool_kit.cache import (
+    LocalDirectoryBackend,
+    _decode_manifest,
+    _encode_manifest,
+    restore_cache,
+    save_cache,
+)
+
+
+@pytest.fixture
+def workspace(tmp_path, monkeypatch):
+    monkeypatch.setenv("RUNNER_TEMP", str(tmp_path / "temp"))
+    monkeypatch.chdir(tmp_path)
+    deps = tmp_path / "deps"
+    (deps / "pkg" / "empty").mkdir(parents=True)
+    (deps / "pkg" / "mod.py").write_text("print('hi')\n")
+    (deps / "big.bin").write_bytes(os.urandom(10_000))
+    (deps / "zero").write_bytes(b"")
+    os.symlink("pkg/mod.py", deps / "link.py")
+    return LocalDirectoryBackend(str(tmp_path / "store"))
+
+
+@pytest.mark.parametrize("codec,workers", [("gzip", 0), ("lzma", 2), ("none", 0)])
+def test_save_and_restore_round_trip(workspace, tmp_path, codec, workers):
+    original = (tmp_path / "deps" / "big.bin").read_bytes()
+    stats = save_cache(["deps"], "deps-1", backend=workspace, codec=codec,
+                       workers=workers, chunk_size=4096)
+    assert stats.files == 3 and stats.bytes == 10_000 + 12
+    # Saving an existing key is a no-op, as with actions/cache.
+    assert save_cache(["deps"], "deps-1", backend=workspace) is None
+
+    (tmp_path / "deps").rename(tmp_path / "old")
+    restored = restore_cache(["deps"], "deps-1", backend=workspace, workers=workers)
+
+    assert restored.key == "deps-1" and restored.files == 3
+    assert (tmp_path / "deps" / "big.bin").read_bytes() == original
+    assert (tmp_path / "deps" / "pkg" / "mod.py").read_text() == "print('hi')\n"
+    assert (tmp_path / "deps" / "pkg" / "empty").is_dir()
+    assert (tmp_path / "deps" / "zero").read_bytes() == b""
+    assert os.readlink(tmp_path / "deps" / "link.py") == "pkg/mod.py"
+    assert os.stat(tmp_path / "deps" / "big.bin").st_mtime_ns == os.stat(tmp_path / "old" / "big.bin").st_mtime_ns
+
+
+def test_unchanged_files_are_skipped(workspace, tmp_path):
+    first = save_cache(["deps"], "deps-1", backend=workspace, workers=0)
+    assert first.reused_files == 0 and first.transferred_bytes > 0
+
+    (tmp_path / "deps" / "new.txt").write_text("new")
+    second = save_cache(["deps"], "deps-2", backend=workspace, workers=0)
+    assert second.files == 4 and second.reused_files == 3
+
+    (tmp_path / "deps" / "pkg" / "mod.py").write_text("changed")
+    restored = restore_cache(["deps"], "deps-2", backend=workspace, workers=0)
+    assert restored.reused_files == 3
+    assert (tmp_path / "deps" / "pkg" / "mod.py").read_text() == "print('hi')\n"
+
+
+def test_restore_keys_pick_newest_prefix_match(workspace, tmp_path):
+    save_cache(["deps"], "deps-linux-aaa", backend=workspace, workers=0)
+    (tmp_path / "deps" / "zero").write_text("second")
+    save_cache(["deps"], "deps-linux-bbb", backend=workspace, workers=0)
+    for name in os.listdir(tmp_path / "store" / "manifests"):
+        path = tmp_path / "store" / "manifests" / name
+        if path.read_bytes().endswith(b"/deps-linux-aaa"):
+            os.utime(path, (1, 1))
+
+    assert restore_cache(["deps"], "deps-linux-ccc", backend=workspace) is None
+    hit = restore_cache(["deps"], "deps-linux-ccc", ["deps-mac-", "deps-linux-"], backend=workspace, workers=0)
+    assert hit.key == "deps-linux-bbb"
+    # Keys are scoped by the cached paths.
+    assert restore_cache(["other"], "deps-linux-bbb", backend=workspace) is None
+
+
+def test_restore_never_writes_through_symlinks(workspace, tmp_path):
+    save_cache(["deps"], "deps-1", backend=workspace, workers=0)
+    scoped = workspace.list_keys("")[0]
+    manifest = _decode_manifest(workspace.read_manifest(scoped))
+    file_entry = next(e for e in manifest["entries"] if e["path"] == "pkg/mod.py")
+    manifest["entries"][1:1] = [
+        {"root": 0, "path": "d", "type": "dir"},
+        {"root": 0, "path": "d/l", "type": "symlink", "target": ".."},
+        {"root": 0, "path": "d/l/up", "type": "symlink", "target": ".."},
+        {**file_entry, "path": "d/l/up/escaped.txt"},
+    ]
+    workspace.write_manifest(scoped, _encode_manifest(manifest))
+    (tmp_path / "deps").rename(tmp_path / "old")
+
+    with pytest.raises(ValueError, match="Refusing"):
+        restore_cache(["deps"], "deps-1", backend=workspace, workers=0)
+    assert not (tmp_path / "escaped.txt").exists()
+    assert (tmp_path / "deps" / "d" / "l" / "up" / "escaped.txt").is_file()
+
+    # Chained links are checked against the links created before them.
+    shutil.rmtree(tmp_path / "deps")
+    manifest["entries"][4] = {"root": 0, "path": "d/l/up/escaped.txt", "type": "symlink", "target": "x"}
+    workspace.write_manifest(scoped, _encode_manifest(manifest))
+    with pytest.raises(ValueError, match="through a symlink"):
+        restore_cache(["deps"], "deps-1", backend=workspace, workers=0)
+    assert not os.path.lexists(tmp_path / "escaped.txt")
+
+    # A link already on disk is not followed either.
+    shutil.rmtree(tmp_path / "deps")
+    (tmp_path / "deps").mkdir()
+    os.symlink(str(tmp_path), tmp_path / "deps" / "pkg")
+    manifest["entries"] = [e for e in manifest["entries"] if not e["path"].startswith("d")]
+    workspace.write_manifest(scoped, _encode_manifest(manifest))
+    with pytest.raises(ValueError, match="symlink"):
+        restore_cache(["deps"], "deps-1", backend=workspace, workers=0)
+    assert not (tmp_path / "mod.py").exists()
@@ -0,0 +1,64 @@
+import pytest
+
+from actions_tool_kit.changed_files import ChangedFiles, compile_pattern
+from actions_tool_kit.payload_parser import parse_payload
+
+
+@pytest.fixture
+def files():
+    payload = parse_payload(
+        {
+            "commits": [
+                {"added": ["src/app/main.py", "README.md"], "modified": ["docs/index.md"], "removed": []},
+                {"added": [], "modified": ["src/app/main.py", "src/lib/util.js"], "removed": ["old.js"]},
+                {"added": ["tests/test_main.py", "src/app/templates/base.html"]},
+            ]
+        }
+    )
+    return ChangedFiles.from_payload(payload)
+
+
+def test_from_payload_deduplicates(files):
+    assert len(files) == 7
+    assert "src/app/main.py" in files
+    assert files.added == {"src/app/main.py", "README.md", "tests/test_main.py", "src/app/templates/base.html"}
+    assert files.removed == {"old.js"}
+
+
+def test_match_groups_by_pattern(files):
+    result = files.match(["src/**", "*.js", "**.js", "src/*/main.py", "**/*.md", "nothing/**"])
+    assert result == {
+        "src/**": ["src/app/main.py", "src/app/templates/base.html", "src/lib/util.js"],
+        "*.js": ["old.js"],
+        "**.js": ["old.js", "src/lib/util.js"],
+        "src/*/main.py": ["src/app/main.py"],
+        "**/*.md": ["README.md", "docs/index.md"],
+        "nothing/**": [],
+    }
+
+
+def test_filter_applies_negations_in_order(files):
+    assert files.filter(["**.py", "!tests/**"]) == ["src/app/main.py"]
+    assert files.filter(["**.py", "!tests/**", "tests/test_main.py"]) == [
+        "src/app/main.py",
+        "tests/test_main.py",
+    ]
+    assert files.any_match(["docs/**"])
+    assert not files.any_match(["docs/**", "!docs/*.md"])
+
+
+def test_gitignore_syntax(files):
+    result = files.match(["*.md", "/src/app/", "templates"], syntax="gitignore")
+    assert result["*.md"] == ["README.md", "docs/index.md"]
+    assert result["/src/app/"] == ["src/app/main.py", "src/app/templates/base.html"]
+    assert result["templates"] == ["src/app/templates/base.html"]
+
+
+def test_compiled_patterns_are_cached():
+    assert compile_pattern("src/**") is compile_pattern("src/**")
+    with pytest.raises(ValueError):
+        compile_pattern("")
+
+
+def test_pull_request_payload_has_no_file_list():
+    assert len(ChangedFiles.from_payload(parse_payload({"pull_request": {"number": 1}}))) == 0
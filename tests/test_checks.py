@@ -0,0 +1,101 @@
+import threading
+
+import pytest
+from github import GithubException
+
+from actions_tool_kit.checks import Annotation, CheckRunPublisher
+from actions_tool_kit.github_client import get_github_client
+from actions_tool_kit.models import RepoIdentifier
+
+RUNS = "/repos/octocat/repo/check-runs"
+
+
+@pytest.fixture
+def checks_api(stub_server):
+    state = {"fail_next": 0, "fail_after_apply": 0, "annotations": []}
+    lock = threading.Lock()
+
+    def update(request):
+        with lock:
+            if state["fail_next"]:
+                state["fail_next"] -= 1
+                return 502, {}, {"message": "Bad Gateway"}
+            state["annotations"].extend(request.json()["output"].get("annotations", []))
+            if state["fail_after_apply"]:
+                state["fail_after_apply"] -= 1
+                return 504, {}, {"message": "Gateway Timeout"}
+        return 200, {}, {"id": 7}
+
+    stub_server.route("POST", RUNS, lambda r: (201, {}, {"id": 7}))
+    stub_server.route("PATCH", f"{RUNS}/7", update)
+    stub_server.route("GET", f"{RUNS}/7/annotations", lambda r: (200, {}, state["annotations"]))
+    return state
+
+
+def _publisher(stub_server, **kwargs):
+    gh = get_github_client("ghp_test", base_url=stub_server.url, retry=None)
+    return CheckRunPublisher(
+        gh, "lint", repo=RepoIdentifier("octocat", "repo"), head_sha="abc123", sleep=lambda s: None, **kwargs
+    )
+
+
+def _annotations(n, level="warning"):
+    return (Annotation(path=f"src/f{i}.py", start_line=i + 1, message=f"issue {i}", annotation_level=level) for i in range(n))
+
+
+def test_annotations_are_uploaded_in_chunks_of_50(stub_server, checks_api):
+    with _publisher(stub_server) as run:
+        run.add_many(_annotations(120))
+        run.add(Annotation(path="src/x.py", start_line=3, annotation_level="failure", message="boom"))
+
+    create = stub_server.calls("POST", RUNS)
+    assert create[0].json() == {"name": "lint", "head_sha": "abc123", "status": "in_progress"}
+
+    updates = [r.json() for r in stub_server.calls("PATCH", f"{RUNS}/7")]
+    chunks = [u["output"]["annotations"] for u in updates if "annotations" in u["output"]]
+    assert sorted(len(c) for c in chunks) == [21, 50, 50]
+    assert chunks[0][0]["end_line"] == chunks[0][0]["start_line"]
+    final = updates[-1]
+    assert final["status"] == "completed"
+    assert final["conclusion"] == "failure"
+    assert final["output"]["summary"] == "0 notice, 120 warning, 1 failure"
+
+
+def test_failed_chunks_are_retried(stub_server, checks_api):
+    run = _publisher(stub_server)
+    run.start()
+    checks_api["fail_next"] = 2
+    run.add_many(_annotations(50))
+    run.finish()
+
+    assert len(stub_server.calls("PATCH", f"{RUNS}/7")) == 4  # 2 failures + chunk + final
+
+
+def test_finish_raises_after_retries_are_exhausted(stub_server, checks_api):
+    run = _publisher(stub_server, max_retries=1)
+    run.start()
+    checks_api["fail_next"] = 2
+    run.add_many(_annotations(50))
+
+    with pytest.raises(GithubException):
+        run.finish()
+    assert stub_server.calls("PATCH", f"{RUNS}/7")[-1].json()["status"] == "completed"
+
+
+def test_chunks_applied_before_an_error_are_not_duplicated(stub_server, checks_api):
+    run = _publisher(stub_server)
+    run.start()
+    checks_api["fail_after_apply"] = 1
+    run.add_many(_annotations(50))
+    run.finish()
+
+    assert len(checks_api["annotations"]) == 50
+    assert len(stub_server.calls("GET", f"{RUNS}/7/annotations")) == 1
+    assert len(stub_server.calls("PATCH", f"{RUNS}/7")) == 2  # chunk + final
+
+
+def test_create_is_not_retried_after_a_server_error(stub_server, checks_api):
+    stub_server.route("POST", RUNS, lambda r: (502, {}, {"message": "Bad Gateway"}))
+    with pytest.raises(GithubException):
+        _publisher(stub_server).start()
+    assert len(stub_server.calls("POST", RUNS)) == 1
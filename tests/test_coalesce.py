@@ -0,0 +1,120 @@
+import threading
+import time
+
+from requests import PreparedRequest, Response
+
+from actions_tool_kit.coalesce import RequestMemo
+from actions_tool_kit.github_client import get_github_client
+
+REPO = {"name": "repo", "full_name": "octocat/repo", "url": "/repos/octocat/repo"}
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_concurrent_identical_gets_share_one_request(stub_server):
+    release = threading.Event()
+
+    def slow_repo(request):
+        release.wait(5)
+        return 200, {}, REPO
+
+    stub_server.route("GET", "/repos/octocat/repo", slow_repo)
+    memo = RequestMemo()
+    gh = get_github_client("ghp_test", base_url=stub_server.url, memoize=memo)
+
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(gh.get_repo("octocat/repo").full_name))
+        for _ in range(5)
+    ]
+    for t in threads:
+        t.start()
+    while memo.misses + memo.coalesced < 5:
+        time.sleep(0.01)
+    release.set()
+    for t in threads:
+        t.join()
+
+    assert results == ["octocat/repo"] * 5
+    assert len(stub_server.calls("GET", "/repos/octocat/repo")) == 1
+    assert (memo.misses, memo.coalesced) == (1, 4)
+
+
+def test_memo_ttl_and_write_invalidation(stub_server):
+    stub_server.route("GET", "/repos/octocat/repo", lambda r: (200, {}, REPO))
+    stub_server.route("PATCH", "/repos/octocat/repo", lambda r: (200, {}, REPO))
+    clock = FakeClock()
+    memo = RequestMemo(ttl=60, clock=clock)
+    gh = get_github_client("ghp_test", base_url=stub_server.url, memoize=memo)
+
+    gh.get_repo("octocat/repo")
+    gh.get_repo("octocat/repo")
+    assert len(stub_server.calls("GET", "/repos/octocat/repo")) == 1
+    assert memo.hits == 1
+
+    clock.now = 61
+    gh.get_repo("octocat/repo")
+    assert len(stub_server.calls("GET", "/repos/octocat/repo")) == 2
+
+    gh.requester.requestJsonAndCheck("PATCH", "/repos/octocat/repo", input={"description": "x"})
+    assert len(memo) == 0
+    gh.get_repo("octocat/repo")
+    assert len(stub_server.calls("GET", "/repos/octocat/repo")) == 3
+
+
+def _get(url):
+    request = PreparedRequest()
+    request.prepare(method="GET", url=url)
+    return request
+
+
+def _ok(body):
+    response = Response()
+    response.status_code, response._content = 200, body
+    return response
+
+
+def test_invalidation_spares_siblings_and_in_flight_reads():
+    memo = RequestMemo()
+    base = "https://api.github.com/repos/o/r/issues"
+    for n in (1, 10, 11):
+        memo.fetch(_get(f"{base}/{n}"), lambda: _ok(b"old"))
+    memo.fetch(_get(f"{base}/1/comments"), lambda: _ok(b"old"))
+
+    memo.invalidate(f"{base}/1")
+    assert sorted(k[0] for k in memo._entries) == [f"{base}/10", f"{base}/11"]
+
+    # A write lands while an identical GET is in flight: its answer is not memoized.
+    def read_then_write():
+        memo.invalidate(f"{base}/1")
+        return _ok(b"before write")
+
+    assert memo.fetch(_get(f"{base}/1"), read_then_write).content == b"before write"
+    assert memo.fetch(_get(f"{base}/1"), lambda: _ok(b"after write")).content == b"after write"
+
+
+def test_errors_are_not_memoized(stub_server):
+    gh = get_github_client("ghp_test", base_url=stub_server.url, memoize=RequestMemo(), retry=None)
+    for _ in range(2):
+        try:
+            gh.get_repo("octocat/missing")
+        except Exception:
+            pass
+    assert len(stub_server.calls("GET", "/repos/octocat/missing")) == 2
+
+
+def test_summary_markdown(tmp_path, monkeypatch):
+    summary = tmp_path / "summary.md"
+    monkeypatch.setenv("GITHUB_STEP_SUMMARY", str(summary))
+    memo = RequestMemo()
+    memo.hits, memo.misses, memo.coalesced = 6, 2, 2
+
+    memo.write_summary()
+
+    assert "| 10 | 2 | 6 | 2 | 80% |" in summary.read_text()
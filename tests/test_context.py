@@ -168,6 +168,9 @@ def test_context_sender_fallback_to_actor(mock_parse, monkeypatch):
     ctx = Context()
     assert ctx.sender.login == "fallback-user"
 
+    monkeypatch.delenv("GITHUB_ACTOR")
+    assert Context().sender.login is None
+
 
 @patch("actions_tool_kit.context.parse_payload")
 def test_context_branches(mock_parse, fake_payload, monkeypatch):
@@ -176,3 +179,71 @@ def test_context_branches(mock_parse, fake_payload, monkeypatch):
     ctx = Context()
     assert ctx.head_branch == "feature-branch"
     assert ctx.base_branch == "main"
+
+
+def test_context_changed_files_is_cached(tmp_path, monkeypatch):
+    event = tmp_path / "event.json"
+    event.write_text(json.dumps({"commits": [{"added": ["a.py"], "modified": ["b/c.py"], "removed": []}]}))
+    monkeypatch.setenv("GITHUB_EVENT_PATH", str(event))
+
+    ctx = Context()
+    changed = ctx.changed_files()
+    assert changed is ctx.changed_files()
+    assert changed.match(["**.py"]) == {"**.py": ["a.py", "b/c.py"]}
+
+
+def _worker_view(_):
+    from actions_tool_kit.context import context
+
+    return context.repo.repo, context.payload.extra.get("marker")
+
+
+def test_context_pickles_without_payload(tmp_path, monkeypatch):
+    import pickle
+
+    event = tmp_path / "event.json"
+    event.write_text(json.dumps({"commits": [{"id": str(i), "added": ["x" * 50]} for i in range(2000)]}))
+    monkeypatch.setenv("GITHUB_EVENT_PATH", str(event))
+    monkeypatch.setenv("GITHUB_REPOSITORY", "octocat/my-repo")
+    monkeypatch.setenv("RUNNER_TEMP", str(tmp_path))
+
+    ctx = Context()
+    assert len(ctx.payload.extra["commits"]) == 2000
+    data = pickle.dumps(ctx)
+    assert len(data) < 2000
+    clone = pickle.loads(data)
+    assert clone.repo.repo == "my-repo" and clone.payload.extra == ctx.payload.extra
+
+    ctx.payload = ctx.payload.__class__(extra={"marker": "replaced"})
+    clone = pickle.loads(pickle.dumps(ctx))
+    assert len(pickle.dumps(ctx)) < 2000
+    assert clone.payload.extra == {"marker": "replaced"}
+    assert [p.name for p in tmp_path.glob("context-payload-*.pickle")]
+
+
+def test_context_copies_stay_in_memory(tmp_path, monkeypatch):
+    import copy
+
+    monkeypatch.setenv("RUNNER_TEMP", str(tmp_path))
+    ctx = Context()
+    ctx.payload = ctx.payload.__class__(extra={"marker": "replaced"})
+
+    shallow, deep = copy.copy(ctx), copy.deepcopy(ctx)
+    assert shallow.payload is ctx.payload
+    assert deep.payload is not ctx.payload and deep.payload.extra == {"marker": "replaced"}
+    assert deep.env == ctx.env and not list(tmp_path.iterdir())
+
+
+def test_share_context_with_process_pool(tmp_path, monkeypatch):
+    from concurrent.futures import ProcessPoolExecutor
+
+    from actions_tool_kit.context import share_context
+    from actions_tool_kit.models import WebhookPayload
+
+    monkeypatch.setenv("GITHUB_REPOSITORY", "octocat/shared")
+    monkeypatch.setenv("RUNNER_TEMP", str(tmp_path))
+    ctx = Context()
+    ctx.payload = WebhookPayload(extra={"marker": "from-parent"})
+
+    with ProcessPoolExecutor(max_workers=1, **share_context(ctx)) as pool:
+        assert list(pool.map(_worker_view, range(2))) == [("shared", "from-parent")] * 2
@@ -0,0 +1,66 @@
+import sys
+import time
+
+import pytest
+
+from actions_tool_kit import actions_core as core
+from actions_tool_kit.exec import run_command, run_commands
+
+
+def _py(code):
+    return [sys.executable, "-c", code]
+
+
+CHATTY = "import sys, time\nfor i in range(3):\n    print('{0}', i, flush=True)\n    time.sleep(0.02)\nsys.exit({1})"
+
+
+def test_group_output_is_contiguous(capsys):
+    results = run_commands(
+        {"a": _py(CHATTY.format("a", 0)), "b": _py(CHATTY.format("b", 3))},
+        max_concurrency=2,
+    )
+    out = capsys.readouterr().out
+
+    assert [r.returncode for r in results] == [0, 3]
+    assert not results[1].ok and results[0].duration > 0
+    for name in ("a", "b"):
+        start = out.index(f"::group::{name} (exit")
+        block = out[start : out.index("::endgroup::", start)]
+        assert block.count(f"{name} ") == 4  # title + three lines, none from the other process
+
+
+def test_prefix_mode_masks_secrets_and_captures(capsys):
+    core.set_secret("hunter2")
+    result = run_command(_py("print('password=hunter2'); print('partial', end='')"),
+                         name="login", output="prefix", capture=True)
+    out = capsys.readouterr().out
+
+    assert "[login] password=***\n" in out and "[login] partial\n" in out
+    assert "hunter2" not in out.replace("::add-mask::hunter2", "")
+    assert result.output == "password=***\npartial"
+
+
+def test_group_mode_streams_large_output(capsys, monkeypatch):
+    monkeypatch.setattr(core, "_secrets", set())
+    core.set_secret("hunter2")
+    code = "for i in range(20000): print(f'line {i} token=hunter2 \u00e9')\nprint('tail', end='')"
+    [result] = run_commands([_py(code)])
+    out = capsys.readouterr().out
+
+    assert result.ok and result.output is None
+    body = out[out.index("\n", out.index("::group::")) : out.index("::endgroup::")]
+    assert body.count("token=*** \u00e9\n") == 20000 and "hunter2" not in body
+    assert body.endswith("line 19999 token=*** \u00e9\ntail\n")
+
+
+def test_concurrency_limit():
+    started = time.monotonic()
+    results = run_commands([_py("import time; time.sleep(0.3)")] * 4, max_concurrency=2, output="silent")
+    elapsed = time.monotonic() - started
+    assert all(r.ok for r in results)
+    assert 0.6 <= elapsed < 1.2
+
+
+def test_invalid_output_mode():
+    with pytest.raises(ValueError):
+        run_commands(["true"], output="tee")
@@ -1,6 +1,11 @@
 import pytest
-from github import Github
-from actions_tool_kit.github_client import get_github_client
+from github import Consts, Github
+from actions_tool_kit.github_client import (
+    _freeze,
+    close_shared_github_clients,
+    get_github_client,
+    get_shared_github_client,
+)
 
 
 def test_get_github_client_basic():
@@ -29,3 +34,25 @@ def test_get_github_client_with_options():
 def test_get_github_client_invalid_token():
     with pytest.raises(AssertionError):  # was TypeError; now correct
         get_github_client(12345)  # type: ignore
+
+
+def test_get_shared_github_client_reuses_instances():
+    try:
+        first = get_shared_github_client("ghp_shared")
+        assert get_shared_github_client("ghp_shared") is first
+        assert get_shared_github_client("ghp_shared", base_url=Consts.DEFAULT_BASE_URL) is first
+        assert get_shared_github_client("ghp_other") is not first
+        assert get_shared_github_client("ghp_shared", per_page=50) is not first
+    finally:
+        close_shared_github_clients()
+
+    assert get_shared_github_client("ghp_shared") is not first
+    close_shared_github_clients()
+
+
+def test_freeze_keys_unhashable_options_by_content():
+    assert _freeze({"a": [1, {2}]}) == _freeze({"a": [1, {2}]})
+    assert _freeze({"a": [1]}) != _freeze({"a": [2]})
+    assert _freeze([1]) != _freeze((1,))
+    with pytest.raises(TypeError):
+        _freeze(bytearray(b"ca"))
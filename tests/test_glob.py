@@ -0,0 +1,68 @@
+import os
+
+import pytest
+from actions_tool_kit.glob import Globber, glob
+
+
+@pytest.fixture
+def tree(tmp_path):
+    files = [
+        "setup.py",
+        "src/app/main.py",
+        "src/app/test_main.py",
+        "src/lib/util.py",
+        "src/lib/data.json",
+        "build/out.py",
+        "node_modules/pkg/index.py",
+        "docs/conf.py",
+        "logs/a.log",
+        "logs/keep.log",
+        ".git/config.py",
+    ]
+    for rel in files:
+        path = tmp_path / rel
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text("")
+    (tmp_path / ".gitignore").write_text("build/\n*.log\n!keep.log\n")
+    (tmp_path / "src" / "lib" / ".gitignore").write_text("/data.json\n")
+    return tmp_path
+
+
+@pytest.mark.parametrize("workers", [1, 4])
+def test_includes_negation_and_gitignore(tree, workers):
+    found = set(glob(["**/*.py", "!**/test_*.py", "logs/*", "src/lib/*"], str(tree),
+                     exclude=["node_modules/"], gitignore=True, relative=True, workers=workers))
+    assert found == {
+        "setup.py",
+        "src/app/main.py",
+        "src/lib/util.py",
+        "src/lib/.gitignore",
+        "docs/conf.py",
+        "logs/keep.log",
+    }
+
+
+def test_paths_are_joined_onto_root_and_dirs_optional(tree):
+    found = sorted(glob("src/*", str(tree), include_directories=True))
+    assert found == [os.path.join(str(tree), "src", "app"), os.path.join(str(tree), "src", "lib")]
+
+
+def test_pruning_skips_unrelated_directories(tree, monkeypatch):
+    listed = []
+    real_scandir = os.scandir
+
+    def spy(path):
+        listed.append(os.path.relpath(path, tree))
+        return real_scandir(path)
+
+    monkeypatch.setattr(os, "scandir", spy)
+    assert sorted(Globber("src/app/*.py", workers=1).walk(str(tree), relative=True)) == [
+        "src/app/main.py",
+        "src/app/test_main.py",
+    ]
+    assert sorted(listed) == [".", "src", "src/app"]
+
+
+def test_requires_an_include_pattern():
+    with pytest.raises(ValueError):
+        glob(["# only a comment", ""])
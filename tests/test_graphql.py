@@ -0,0 +1,93 @@
+import re
+
+import pytest
+from github import GithubException
+
+from actions_tool_kit.github_client import get_github_client
+from actions_tool_kit.graphql import (
+    IssueNode,
+    PullRequestNode,
+    build_lookup_query,
+    lookup_issues,
+    lookup_pull_requests,
+)
+from actions_tool_kit.models import IssueIdentifier, PullRequestIdentifier
+
+_REPO = re.compile(r'(r\d+): repository\(owner: "([^"]+)", name: "([^"]+)"\)')
+_NODE = re.compile(r"(n\d+): (issue|pullRequest)\(number: (\d+)\)")
+
+
+def _graphql_route(request):
+    query = request.json()["query"]
+    data = {}
+    repos = list(_REPO.finditer(query))
+    for i, repo in enumerate(repos):
+        section = query[repo.end() : repos[i + 1].start() if i + 1 < len(repos) else len(query)]
+        if repo.group(3) == "missing":
+            data[repo.group(1)] = None
+            continue
+        nodes = {}
+        for node in _NODE.finditer(section):
+            number = int(node.group(3))
+            nodes[node.group(1)] = None if number == 404 else {
+                "number": number,
+                "title": f"{repo.group(2)}/{repo.group(3)}#{number}",
+                "state": "OPEN",
+                "author": {"login": "octocat"},
+                "headRefName": "feature",
+                "labels": {"nodes": []},
+            }
+        data[repo.group(1)] = nodes
+    return 200, {}, {"data": data}
+
+
+@pytest.fixture
+def client(stub_server):
+    stub_server.route("POST", "/graphql", _graphql_route)
+    return get_github_client("ghp_test", base_url=stub_server.url)
+
+
+def test_lookup_issues_batches_across_repositories(stub_server, client):
+    idents = [IssueIdentifier("octo", f"repo{n % 3}", n) for n in range(1, 251)]
+    idents += [IssueIdentifier("octo", "repo1", 404), IssueIdentifier("octo", "missing", 1)]
+
+    results = lookup_issues(client, idents + idents[:10], graphql_url=f"{stub_server.url}/graphql")
+
+    assert len(stub_server.calls("POST", "/graphql")) == 3
+    assert len(results) == 252
+    node = results[IssueIdentifier("octo", "repo2", 5)]
+    assert isinstance(node, IssueNode)
+    assert (node.number, node.title, node.author) == (5, "octo/repo2#5", "octocat")
+    assert results[IssueIdentifier("octo", "repo1", 404)] is None
+    assert results[IssueIdentifier("octo", "missing", 1)] is None
+
+
+def test_lookup_pull_requests_respects_node_budget(stub_server, client):
+    idents = [PullRequestIdentifier("octo", "repo", n) for n in range(1, 11)]
+
+    results = lookup_pull_requests(
+        client,
+        idents,
+        fields="number title headRefName labels(first: 20) { nodes { name } }",
+        nodes_per_lookup=21,
+        max_nodes=100,
+        graphql_url=f"{stub_server.url}/graphql",
+    )
+
+    assert len(stub_server.calls("POST", "/graphql")) == 3  # 4 + 4 + 2 lookups
+    node = results[PullRequestIdentifier("octo", "repo", 7)]
+    assert isinstance(node, PullRequestNode)
+    assert node.head_ref == "feature"
+    assert node.extra == {"labels": {"nodes": []}}
+
+
+def test_build_lookup_query_escapes_names():
+    query, aliases = build_lookup_query([IssueIdentifier('o"wner', "repo", 3)], "issue", "number")
+    assert 'owner: "o\\"wner"' in query
+    assert aliases == {"r0.n0": IssueIdentifier('o"wner', "repo", 3)}
+
+
+def test_lookup_raises_when_query_rejected(stub_server, client):
+    stub_server.route("POST", "/graphql", lambda r: (200, {}, {"errors": [{"message": "bad"}]}))
+    with pytest.raises(GithubException):
+        lookup_issues(client, [IssueIdentifier("o", "r", 1)], graphql_url=f"{stub_server.url}/graphql")
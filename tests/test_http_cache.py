@@ -0,0 +1,51 @@
+from actions_tool_kit.github_client import get_github_client
+from actions_tool_kit.http_cache import CacheEntry, DiskCache
+
+REPO = {"name": "repo", "full_name": "octocat/repo", "url": "/repos/octocat/repo"}
+
+
+def _etag_route(request):
+    if request.headers.get("If-None-Match") == '"v1"':
+        return 304, {"ETag": '"v1"', "X-RateLimit-Remaining": "4999"}, b""
+    return 200, {"ETag": '"v1"'}, REPO
+
+
+def test_conditional_requests_served_from_cache(stub_server, tmp_path):
+    stub_server.route("GET", "/repos/octocat/repo", _etag_route)
+    cache = DiskCache(str(tmp_path))
+
+    gh = get_github_client("ghp_test", base_url=stub_server.url, http_cache=cache)
+    assert gh.get_repo("octocat/repo").full_name == "octocat/repo"
+    assert gh.get_repo("octocat/repo").full_name == "octocat/repo"
+
+    first, second = stub_server.calls("GET", "/repos/octocat/repo")
+    assert "If-None-Match" not in first.headers
+    assert second.headers["If-None-Match"] == '"v1"'
+
+    # A new client (e.g. the next step) reuses the on-disk entries.
+    gh = get_github_client("ghp_test", base_url=stub_server.url, http_cache=str(tmp_path))
+    assert gh.get_repo("octocat/repo").name == "repo"
+    assert stub_server.calls("GET", "/repos/octocat/repo")[-1].headers["If-None-Match"] == '"v1"'
+
+
+def test_cache_is_keyed_by_token(stub_server, tmp_path):
+    stub_server.route("GET", "/repos/octocat/repo", _etag_route)
+
+    get_github_client("ghp_one", base_url=stub_server.url, http_cache=str(tmp_path)).get_repo("octocat/repo")
+    get_github_client("ghp_two", base_url=stub_server.url, http_cache=str(tmp_path)).get_repo("octocat/repo")
+
+    assert all("If-None-Match" not in r.headers for r in stub_server.requests)
+
+
+def test_disk_cache_evicts_least_recently_used(tmp_path):
+    cache = DiskCache(str(tmp_path), max_bytes=350)
+    for key in ("a", "b", "c"):
+        cache.put(key, CacheEntry(200, {"etag": key}, b"x" * 60))
+    assert cache.get("a") is not None  # "a" becomes most recently used
+
+    cache.put("d", CacheEntry(200, {"etag": "d"}, b"x" * 60))
+
+    assert cache.size <= 350
+    assert cache.get("b") is None
+    assert cache.get("a").body == b"x" * 60
+    assert DiskCache(str(tmp_path), max_bytes=350).get("d").headers == {"etag": "d"}
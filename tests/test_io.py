@@ -0,0 +1,83 @@
+import errno
+import os
+
+import pytest
+from actions_tool_kit import io
+
+
+@pytest.fixture
+def tree(tmp_path):
+    src = tmp_path / "src"
+    (src / "sub" / "deep").mkdir(parents=True)
+    (src / "a.txt").write_text("alpha")
+    (src / "sub" / "deep" / "b.bin").write_bytes(os.urandom(300_000))
+    (src / "tool").write_text("#!/bin/sh\n")
+    os.chmod(src / "tool", 0o755)
+    os.symlink("a.txt", src / "link")
+    return src
+
+
+def test_cp_recursive_into_existing_directory(tree, tmp_path):
+    (tmp_path / "out").mkdir()
+    io.cp(str(tree), str(tmp_path / "out"), recursive=True, workers=4)
+    copied = tmp_path / "out" / "src"
+    assert (copied / "sub" / "deep" / "b.bin").read_bytes() == (tree / "sub" / "deep" / "b.bin").read_bytes()
+    assert os.stat(copied / "tool").st_mode & 0o777 == 0o755
+    assert os.readlink(copied / "link") == "a.txt"
+    assert os.stat(copied / "a.txt").st_mtime == os.stat(tree / "a.txt").st_mtime
+
+    with pytest.raises(IsADirectoryError):
+        io.cp(str(tree), str(tmp_path / "nope"))
+    with pytest.raises(FileExistsError):
+        io.cp(str(tree / "a.txt"), str(copied / "a.txt"), force=False)
+
+
+def test_copy_file_falls_back_when_kernel_methods_are_unsupported(tree, tmp_path, monkeypatch):
+    def unsupported(*args, **kwargs):
+        raise OSError(errno.EXDEV, "cross-device")
+
+    monkeypatch.setattr(io, "_disabled", set())
+    monkeypatch.setattr(io.os, "copy_file_range", unsupported, raising=False)
+    monkeypatch.setattr(io.os, "sendfile", unsupported, raising=False)
+    monkeypatch.setattr(io, "fcntl", None)
+
+    method = io.copy_file(str(tree / "sub" / "deep" / "b.bin"), str(tmp_path / "b.bin"))
+    assert method == "read/write"
+    assert (tmp_path / "b.bin").read_bytes() == (tree / "sub" / "deep" / "b.bin").read_bytes()
+    assert all(m != "reflink" for m, _ in io._disabled)
+
+
+def test_mv_across_devices_and_rm_rf(tree, tmp_path, monkeypatch):
+    real_rename = os.rename
+
+    def cross_device(src, dst):
+        raise OSError(errno.EXDEV, "cross-device")
+
+    monkeypatch.setattr(io.os, "rename", cross_device)
+    io.mv(str(tree), str(tmp_path / "moved"))
+    monkeypatch.setattr(io.os, "rename", real_rename)
+
+    assert not tree.exists()
+    assert (tmp_path / "moved" / "a.txt").read_text() == "alpha"
+    os.chmod(tmp_path / "moved" / "sub" / "deep", 0o555)
+    io.rm_rf(str(tmp_path / "moved"), workers=4)
+    assert not (tmp_path / "moved").exists()
+    io.rm_rf(str(tmp_path / "missing"))
+
+
+def test_which_finds_tools_installed_later(tmp_path, monkeypatch):
+    bin_dir = tmp_path / "bin"
+    bin_dir.mkdir()
+    monkeypatch.setenv("PATH", str(tmp_path))
+    assert io.which("mytool") is None
+    with pytest.raises(FileNotFoundError):
+        io.which("mytool", check=True)
+
+    (tmp_path / "mytool").write_text("#!/bin/sh\n")
+    os.chmod(tmp_path / "mytool", 0o755)
+    assert io.which("mytool") == str(tmp_path / "mytool")
+
+    (bin_dir / "mytool").write_text("#!/bin/sh\n")
+    os.chmod(bin_dir / "mytool", 0o755)
+    monkeypatch.setenv("PATH", f"{bin_dir}{os.pathsep}{tmp_path}")
+    assert io.which("mytool") == str(bin_dir / "mytool")
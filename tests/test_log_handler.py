@@ -0,0 +1,77 @@
+import logging
+import os
+import sys
+import threading
+
+import pytest
+
+from actions_tool_kit import actions_core as core
+from actions_tool_kit.log_handler import WorkflowCommandHandler, install_logging_bridge
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+
+@pytest.fixture
+def logger():
+    log = logging.getLogger("bridge-test")
+    log.propagate = False
+    log.setLevel(logging.DEBUG)
+    yield log
+    log.handlers.clear()
+
+
+def test_levels_and_locations(logger, capsys, monkeypatch):
+    monkeypatch.setattr(core, "_debug_enabled", True)
+    logger.addHandler(WorkflowCommandHandler(levels={logging.CRITICAL: "notice"}, workspace=os.path.dirname(HERE)))
+    logger.debug("d %d", 1)
+    logger.info("plain")
+    line = sys._getframe().f_lineno + 1
+    logger.warning("careful")
+    logger.error("bad", extra={"file": "src/x.py", "line": 7, "title": "Lint"})
+    logger.critical("fyi")
+    out = capsys.readouterr().out.splitlines()
+
+    assert out == [
+        "::debug::d 1",
+        "plain",
+        f"::warning file=tests/test_log_handler.py,line={line}::careful",
+        "::error title=Lint,file=src/x.py,line=7::bad",
+        f"::notice file=tests/test_log_handler.py,line={line + 2}::fyi",
+    ]
+
+
+def test_files_outside_the_workspace_are_not_annotated(logger, capsys, tmp_path):
+    logger.addHandler(WorkflowCommandHandler(workspace=str(tmp_path)))
+    logger.warning("elsewhere")
+    assert capsys.readouterr().out == "::warning::elsewhere\n"
+
+
+def test_bridge_writes_from_a_listener_thread(logger, capsys, monkeypatch):
+    monkeypatch.setattr(core, "_debug_enabled", False)
+    writers = []
+    real_write = core._write
+    monkeypatch.setattr(core, "_write", lambda text: (writers.append(threading.current_thread().name), real_write(text)))
+
+    bridge = install_logging_bridge(logger, annotate_location=False, fmt="%(levelname)s %(message)s")
+    assert bridge.queue_handler.level == logging.INFO  # debug off: not even queued
+
+    def work(i):
+        for j in range(50):
+            logger.warning("w%d-%d", i, j)
+        logger.debug("dropped")
+
+    threads = [threading.Thread(target=work, args=(i,)) for i in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    bridge.close()
+    bridge.close()
+
+    out = capsys.readouterr().out.splitlines()
+    assert len(out) == 200 and all(line.startswith("::warning::WARNING w") for line in out)
+    assert [line for line in out if line.startswith("::warning::WARNING w0-")] == [
+        f"::warning::WARNING w0-{j}" for j in range(50)
+    ]
+    assert threading.current_thread().name not in writers
+    assert bridge.queue_handler not in logger.handlers
@@ -0,0 +1,92 @@
+import pytest
+
+from actions_tool_kit import actions_core as core
+from actions_tool_kit.log_limits import LogLimiter, LogPolicy, install_log_limits, uninstall_log_limits
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture(autouse=True)
+def _uninstall():
+    yield
+    uninstall_log_limits()
+
+
+def test_first_n_then_one_in_m_through_emitters(capsys, tmp_path, monkeypatch):
+    summary = tmp_path / "summary.md"
+    monkeypatch.setenv("GITHUB_STEP_SUMMARY", str(summary))
+    limiter = install_log_limits({"warning": LogPolicy(first=3, every=5)})
+    with core.group("lint"):
+        for i in range(20):
+            core.warning(f"w{i}")
+    assert limiter.report() == (7, 13)
+
+    out = capsys.readouterr().out
+    warnings = [line.split("::")[-1] for line in out.splitlines() if line.startswith("::warning::")]
+    assert warnings == ["w0", "w1", "w2", "w3", "w8", "w13", "w18"]
+    assert "::group::lint" in out and "::endgroup::" in out
+    assert out.count("further 'warning' messages") == 1
+    assert "| warning | warning | 7 | 0 | 13 | 0 |" in summary.read_text()
+
+
+def test_token_bucket_refills_over_time():
+    clock = Clock()
+    limiter = LogLimiter({"debug": LogPolicy(rate=2, burst=3)}, clock=clock)
+    assert [limiter.allow("debug", "m", {}) for _ in range(5)] == [True, True, True, False, False]
+    clock.now = 1.0
+    assert [limiter.allow("debug", "m", {}) for _ in range(3)] == [True, True, False]
+    assert limiter.stats()[0].rate_limited == 3
+
+
+def test_duplicates_are_dropped_within_the_window():
+    clock = Clock()
+    limiter = LogLimiter({"notice": LogPolicy(dedupe_window=10)}, clock=clock)
+    assert limiter.allow("notice", "same", {"file": "a.py"})
+    assert not limiter.allow("notice", "same", {"file": "a.py"})
+    assert limiter.allow("notice", "same", {"file": "b.py"})
+    clock.now = 11
+    assert limiter.allow("notice", "same", {"file": "a.py"})
+    assert limiter.stats()[0].duplicates == 1
+
+
+def test_dedupe_memory_is_bounded_across_keys_and_by_age():
+    clock = Clock()
+    limiter = LogLimiter({"debug": LogPolicy(dedupe_window=10, key="message")}, max_keys=3, clock=clock)
+    for i in range(10):
+        assert limiter.allow("debug", f"m{i}", {})
+    assert list(limiter._recent["debug"]) == [(f"m{i}", ()) for i in (7, 8, 9)]
+    assert not limiter.allow("debug", "m9", {})
+
+    clock.now = 10
+    assert limiter.allow("debug", "new", {})
+    assert list(limiter._recent["debug"]) == [("new", ())]
+
+
+def test_limits_are_counted_per_key_with_bounded_state():
+    limiter = LogLimiter({"error": LogPolicy(first=1, every=0, key="title")}, max_keys=2)
+    for title in ("a", "a", "b", "c", "d", None):
+        limiter.allow("error", "x", {"title": title})
+    assert [(s.key, s.emitted, s.sampled) for s in limiter.stats()] == [
+        ("a", 1, 1),
+        ("b", 1, 0),
+        ("(other keys)", 1, 2),
+    ]
+    # Commands without a policy are never limited.
+    assert all(limiter.allow("group", "g", {}) for _ in range(5))
+    with pytest.raises(ValueError):
+        LogLimiter({"info": LogPolicy(key="line")}).allow("info", "x", {})
+
+
+def test_uninstall_restores_unlimited_output(capsys):
+    install_log_limits({"info": LogPolicy(first=0, every=0)})
+    core.info("hidden")
+    uninstall_log_limits()
+    core.info("shown")
+    out = capsys.readouterr().out
+    assert "hidden" not in out and "shown\n" in out
@@ -117,3 +117,10 @@ def test_webhook_payload_with_fields():
     assert payload.installation["id"] == 123
     assert payload.comment["body"] == "Looks good"
     assert payload.extra["custom"] == "value"
+
+
+def test_identifiers_are_hashable_and_immutable():
+    issue = IssueIdentifier(owner="octocat", repo="hello-world", number=42)
+    assert {issue: 1}[IssueIdentifier("octocat", "hello-world", 42)] == 1
+    with pytest.raises(AttributeError):
+        issue.number = 43
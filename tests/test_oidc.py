@@ -0,0 +1,83 @@
+import base64
+import json
+import threading
+import time
+
+import pytest
+
+from actions_tool_kit import oidc
+
+PATH = "/_apis/token"
+
+
+def _jwt(audience, ttl):
+    claims = base64.urlsafe_b64encode(json.dumps({"aud": audience, "exp": int(time.time() + ttl)}).encode())
+    return f"eyJhbGciOiJSUzI1NiJ9.{claims.decode().rstrip('=')}.sig"
+
+
+@pytest.fixture
+def token_endpoint(stub_server, monkeypatch, tmp_path):
+    state = {"ttl": 600, "delay": 0.0}
+
+    def issue(request):
+        assert request.headers["Authorization"] == "Bearer request-token"
+        time.sleep(state["delay"])
+        audience = request.path.partition("audience=")[2]
+        return 200, {}, {"value": _jwt(audience, state["ttl"])}
+
+    stub_server.route("GET", PATH, issue)
+    monkeypatch.setenv("ACTIONS_ID_TOKEN_REQUEST_URL", f"{stub_server.url}{PATH}?api-version=2.0")
+    monkeypatch.setenv("ACTIONS_ID_TOKEN_REQUEST_TOKEN", "request-token")
+    monkeypatch.setenv("RUNNER_TEMP", str(tmp_path))
+    oidc.clear_id_token_cache()
+    yield state
+    oidc.clear_id_token_cache()
+
+
+def _calls(stub_server):
+    return [r.path.partition("audience=")[2] for r in stub_server.calls("GET", PATH)]
+
+
+def test_tokens_are_cached_per_audience_and_masked(stub_server, token_endpoint, capsys):
+    aws = oidc.get_id_token("sts.amazonaws.com")
+    assert oidc.get_id_token("sts.amazonaws.com") == aws
+    gcp = oidc.get_id_token("//iam.googleapis.com/x")
+
+    assert _calls(stub_server) == ["sts.amazonaws.com", "%2F%2Fiam.googleapis.com%2Fx"]
+    assert json.loads(base64.urlsafe_b64decode(gcp.split(".")[1] + "==="))["aud"] == "%2F%2Fiam.googleapis.com%2Fx"
+    assert capsys.readouterr().out.count("::add-mask::") == 2
+
+
+def test_concurrent_requests_share_one_fetch(stub_server, token_endpoint):
+    token_endpoint["delay"] = 0.2
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(oidc.get_id_token("api"))) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert len(set(results)) == 1 and _calls(stub_server) == ["api"]
+
+
+def test_tokens_close_to_expiry_are_refreshed(stub_server, token_endpoint):
+    token_endpoint["ttl"] = 30
+    oidc.get_id_token("api")
+    oidc.get_id_token("api")
+    oidc.get_id_token("api", min_ttl=10)
+    assert len(_calls(stub_server)) == 2
+
+
+def test_file_cache_is_shared_across_steps(stub_server, token_endpoint, tmp_path, capsys):
+    first = oidc.get_id_token("api", share_across_steps=True)
+    oidc.clear_id_token_cache()  # a later step starts with an empty memory cache
+    assert oidc.get_id_token("api", share_across_steps=True) == first
+    assert len(_calls(stub_server)) == 1
+    (cache_file,) = (tmp_path / "oidc-token-cache").iterdir()
+    assert cache_file.stat().st_mode & 0o077 == 0
+    assert capsys.readouterr().out.count(f"::add-mask::{first}") == 2
+
+
+def test_missing_permission_is_reported(monkeypatch):
+    monkeypatch.delenv("ACTIONS_ID_TOKEN_REQUEST_URL", raising=False)
+    with pytest.raises(RuntimeError, match="id-token: write"):
+        oidc.get_id_token()
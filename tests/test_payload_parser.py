@@ -1,6 +1,9 @@
+import gzip
+import json
+
 import pytest
 from actions_tool_kit.models import WebhookPayload, PayloadRepository, RepoOwner, Sender
-from actions_tool_kit.payload_parser import parse_payload
+from actions_tool_kit.payload_parser import iter_payload_archive, parse_payload
 
 
 def test_parse_payload_full():
@@ -103,3 +106,62 @@ def test_parse_payload_partial_owner_data():
     assert result.repository.owner.login == "demo-user"
     assert result.repository.owner.name is None
     assert result.repository.owner.extra == {}
+
+
+def _write_archive(path, records, compress=False):
+    body = "\n".join(json.dumps(r) for r in records).encode() + b"\n"
+    if compress:
+        body = gzip.compress(body)
+    path.write_bytes(body)
+    return path
+
+
+def test_iter_payload_archive_serial_with_filters(tmp_path):
+    records = [
+        {"event": "pull_request", "payload": {"action": "opened", "pull_request": {"number": 1}}},
+        {"event": "pull_request", "payload": {"action": "closed", "pull_request": {"number": 2}}},
+        {"event": "issues", "payload": {"action": "opened", "issue": {"number": 3}}},
+    ]
+    archive = _write_archive(tmp_path / "events.ndjson", records)
+
+    result = list(
+        iter_payload_archive(
+            str(archive), event_types=["pull_request"], actions=["opened"], workers=0
+        )
+    )
+
+    assert len(result) == 1
+    assert isinstance(result[0], WebhookPayload)
+    assert result[0].pull_request["number"] == 1
+
+
+@pytest.mark.parametrize("ordered", [True, False])
+def test_iter_payload_archive_gzip_process_pool(tmp_path, ordered):
+    records = [{"action": "opened", "issue": {"number": n}} for n in range(50)]
+    archive = _write_archive(tmp_path / "events.ndjson.gz", records, compress=True)
+
+    result = list(
+        iter_payload_archive(str(archive), workers=2, chunk_size=7, ordered=ordered)
+    )
+
+    numbers = [p.issue["number"] for p in result]
+    if ordered:
+        assert numbers == list(range(50))
+    else:
+        assert sorted(numbers) == list(range(50))
+
+
+def test_iter_payload_archive_reports_bad_line(tmp_path):
+    archive = tmp_path / "events.ndjson"
+    archive.write_text('{"action": "opened"}\n\n{not json}\n')
+
+    with pytest.raises(ValueError, match="line 3"):
+        list(iter_payload_archive(str(archive), workers=1))
+
+
+def test_iter_payload_archive_rejects_non_object_record(tmp_path):
+    archive = tmp_path / "events.ndjson"
+    archive.write_text('{"action": "opened"}\n[1, 2]\n')
+
+    with pytest.raises(ValueError, match="line 2 is not a JSON object"):
+        list(iter_payload_archive(str(archive), workers=1))
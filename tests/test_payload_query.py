@@ -0,0 +1,64 @@
+import pytest
+
+from actions_tool_kit.payload_parser import parse_payload
+from actions_tool_kit.payload_query import compile_path, compile_paths, select_many
+
+
+@pytest.fixture
+def payload():
+    return parse_payload(
+        {
+            "repository": {"name": "repo", "owner": {"login": "octocat"}, "private": True},
+            "pull_request": {
+                "number": 7,
+                "head": {"sha": "abc", "repo": {"full_name": "fork/repo"}},
+            },
+            "commits": [
+                {"id": "c1", "author": {"email": "a@example.com"}},
+                {"id": "c2", "author": {"email": "b@example.com"}},
+                {"id": "c3"},
+            ],
+        }
+    )
+
+
+def test_select_nested_values(payload):
+    assert payload.select("pull_request.head.sha") == "abc"
+    assert payload.select("pull_request.head.repo.full_name") == "fork/repo"
+    # dataclass fields first, then their `extra`
+    assert payload.select("repository.owner.login") == "octocat"
+    assert payload.select("repository.private") is True
+    assert payload.select("commits[-1].id") == "c3"
+
+
+def test_select_wildcard_and_missing(payload):
+    assert payload.select("commits[*].author.email") == ["a@example.com", "b@example.com"]
+    assert payload.select("issue.number") is None
+    assert payload.select("issue.number", default=0) == 0
+    assert payload.select("issue[*].labels") == []
+
+
+def test_select_many_matches_individual_selects(payload):
+    paths = [
+        "pull_request.head.sha",
+        "pull_request.head.repo.full_name",
+        "pull_request.number",
+        "commits[*].id",
+        "commits[*].author.email",
+        "missing.key",
+    ]
+    results = payload.select_many(paths, default="n/a")
+    assert results == {path: payload.select(path, default="n/a") for path in paths}
+    assert select_many({"a": {"b": 1}}, ["a.b"]) == {"a.b": 1}
+
+
+def test_compiled_queries_are_cached():
+    assert compile_path("a.b[*].c") is compile_path("a.b[*].c")
+    assert compile_paths(["a", "b"]) is compile_paths(("a", "b"))
+    assert compile_path("a.b[*].c").multi is True
+
+
+@pytest.mark.parametrize("path", ["", "a..b", "a[x]", "a[*"])
+def test_invalid_paths(path):
+    with pytest.raises(ValueError):
+        compile_path(path)
@@ -0,0 +1,108 @@
+import io
+
+import pytest
+
+from actions_tool_kit.problem_matcher import MatcherSet, Problem, add_matcher, load_matchers, publish, remove_matcher
+
+GCC = {
+    "owner": "gcc",
+    "pattern": [
+        {
+            "regexp": r"^(.+):(\d+):(\d+):\s+(?:fatal\s+)?(warning|error):\s+(.*)$",
+            "file": 1, "line": 2, "column": 3, "severity": 4, "message": 5,
+        }
+    ],
+}
+ESLINT = {
+    "owner": "eslint-stylish",
+    "severity": "warning",
+    "pattern": [
+        {"regexp": r"^([^\s].*)$", "file": 1},
+        {"regexp": r"^\s+(\d+):(\d+)\s+(error|warning)\s+(.*?)\s\s+(\S+)$",
+         "line": 1, "column": 2, "severity": 3, "message": 4, "code": 5, "loop": True},
+    ],
+}
+
+
+def _matchers(workspace="/work"):
+    return MatcherSet(load_matchers({"problemMatcher": [GCC, ESLINT]}), workspace=workspace)
+
+
+def test_single_and_looping_multiline_patterns():
+    log = (
+        "make: building\n"
+        "/work/src/a.c:10:5: warning: unused variable 'x'\r\n"
+        "web/app.js\n"
+        "  1:10  error    Missing semicolon  semi\n"
+        "  4:2   warning  Unexpected console  no-console\n"
+        "\n"
+        "src/b.c:3:1: fatal error: stdio.h: No such file\n"
+    )
+    problems = list(_matchers().scan_stream(io.StringIO(log)))
+
+    assert problems == [
+        Problem("gcc", "unused variable 'x'", "warning", "src/a.c", 10, 5),
+        Problem("eslint-stylish", "Missing semicolon", "error", "web/app.js", 1, 10, code="semi"),
+        Problem("eslint-stylish", "Unexpected console", "warning", "web/app.js", 4, 2, code="no-console"),
+        Problem("gcc", "stdio.h: No such file", "error", "src/b.c", 3, 1),
+    ]
+
+
+def test_chunk_boundaries_do_not_split_lines():
+    log = "".join(f"noise {i}\nsrc/m.c:{i}:1: error: bad\n" for i in range(200))
+    matchers = _matchers()
+    problems = []
+    for start in range(0, len(log), 7):
+        problems += matchers.feed(log[start : start + 7])
+    problems += matchers.close()
+    assert [p.line for p in problems] == list(range(200))
+
+
+def test_matchers_sharing_group_names_are_prefiltered_together():
+    specs = [
+        {"owner": owner, "pattern": [{"regexp": rf"^(?<file>\S+): {owner} (?<msg>.+)$", "file": 1, "message": 2}]}
+        for owner in ("lint", "types")
+    ]
+    matchers = MatcherSet(load_matchers({"problemMatcher": specs}))
+    assert matchers._prefilter is not None
+    problems = matchers.feed("noise\na.py: types bad type\nb.py: lint too long\n")
+    assert [(p.owner, p.file, p.message) for p in problems] == [("types", "a.py", "bad type"), ("lint", "b.py", "too long")]
+
+
+def test_patterns_matching_empty_lines_do_not_stall():
+    matchers = MatcherSet(load_matchers({"problemMatcher": [{"owner": "x", "pattern": [{"regexp": "^(x*)$", "message": 1}]}]}))
+    assert [p.message for p in matchers.feed("abc\nxx\n\n")] == ["xx"]
+    assert matchers.close() == []
+
+
+def test_failed_continuation_restarts_on_the_same_line():
+    matchers = _matchers()
+    assert matchers.feed_line("lib/x.js") is None
+    problem = matchers.feed_line("lib/y.c:2:3: error: oops")
+    assert (problem.owner, problem.file) == ("gcc", "lib/y.c")
+
+
+def test_invalid_definitions_are_rejected(tmp_path):
+    with pytest.raises(ValueError, match="missing group"):
+        load_matchers({"problemMatcher": [{"owner": "x", "pattern": [{"regexp": "(a)", "message": 2}]}]})
+    with pytest.raises(ValueError, match="loop"):
+        load_matchers({"problemMatcher": [{"owner": "x", "pattern": [{"regexp": "(a)", "message": 1, "loop": True}]}]})
+    path = tmp_path / "m.json"
+    path.write_text('{"problemMatcher": [{"owner": "n", "pattern": [{"regexp": "(?<msg>.+)", "message": 1}]}]}')
+    assert load_matchers(path)[0].patterns[0].regex.groupindex == {"msg": 1}
+
+
+def test_publish_and_matcher_commands(capsys):
+    problems = [Problem("gcc", "bad", "warning", "src/a.c", 10, 5), Problem("gcc", "global", "error")]
+    assert publish(problems) == 2
+    add_matcher("/tmp/gcc.json")
+    remove_matcher("gcc")
+    out = capsys.readouterr().out.splitlines()
+    assert out == [
+        "::warning file=src/a.c,line=10,col=5::bad",
+        "::error::global",
+        "::add-matcher::/tmp/gcc.json",
+        "::remove-matcher owner=gcc::",
+    ]
+    annotation = problems[0].to_annotation()
+    assert (annotation.annotation_level, annotation.start_column) == ("warning", 5)
@@ -0,0 +1,154 @@
+import threading
+import time
+
+from requests import Response
+from requests.structures import CaseInsensitiveDict
+
+from actions_tool_kit.github_client import get_github_client
+from actions_tool_kit.rate_limit import RateLimitScheduler, TokenBucket, resource_for
+
+REPO = {"name": "repo", "full_name": "octocat/repo", "url": "/repos/octocat/repo"}
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1_000.0
+        self.sleeps = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+def _response(status=200, content=b"", **headers):
+    response = Response()
+    response.status_code = status
+    response.headers = CaseInsensitiveDict(headers)
+    response._content = content
+    return response
+
+
+def test_token_bucket_reservations():
+    clock = FakeClock()
+    bucket = TokenBucket(rate=1.0, capacity=2, clock=clock)
+    assert [bucket.reserve() for _ in range(4)] == [0.0, 0.0, 1.0, 2.0]
+    clock.now += 10
+    assert bucket.reserve() == 0.0
+
+
+def test_scheduler_waits_for_reset_when_budget_is_spent():
+    clock = FakeClock()
+    scheduler = RateLimitScheduler(clock=clock, sleep=clock.sleep)
+    scheduler.observe(
+        _response(**{"X-RateLimit-Remaining": "1", "X-RateLimit-Reset": str(clock.now + 30)})
+    )
+
+    with scheduler.slot():
+        pass
+    assert clock.sleeps == []
+    with scheduler.slot():
+        pass
+    assert clock.sleeps == [30.0]
+    assert scheduler.remaining is None
+
+
+def test_budgets_are_tracked_per_resource():
+    clock = FakeClock()
+    scheduler = RateLimitScheduler(clock=clock, sleep=clock.sleep)
+    exhausted = _response(
+        403,
+        **{"X-RateLimit-Resource": "search", "X-RateLimit-Remaining": "0", "X-RateLimit-Reset": str(clock.now + 40)},
+    )
+    assert scheduler.observe(exhausted, resource="search") == 41.0
+    scheduler.observe(_response(**{"X-RateLimit-Resource": "core", "X-RateLimit-Remaining": "4000"}))
+
+    with scheduler.slot(resource="core"):
+        pass
+    assert clock.sleeps == [] and scheduler.remaining == 3999
+    with scheduler.slot(resource=resource_for("https://api.github.com/search/issues?q=x")):
+        pass
+    assert clock.sleeps == [40.0] and scheduler.remaining_for("search") is None
+    assert resource_for("https://api.github.com/graphql") == "graphql"
+    assert resource_for("https://api.github.com/repos/o/r") == "core"
+
+
+def test_scheduler_spaces_writes():
+    clock = FakeClock()
+    scheduler = RateLimitScheduler(clock=clock, sleep=clock.sleep)
+    for _ in range(3):
+        with scheduler.slot(write=True):
+            pass
+    assert clock.sleeps == [1.0, 1.0]
+
+
+def test_observe_classifies_responses():
+    clock = FakeClock()
+    scheduler = RateLimitScheduler(clock=clock, sleep=clock.sleep, backoff_base=2.0)
+    assert scheduler.observe(_response(403, b'{"message": "Resource not accessible"}')) is None
+    assert scheduler.observe(_response(403, **{"Retry-After": "5"})) == 5.0
+    delay = scheduler.observe(_response(403, b"You have exceeded a secondary rate limit"), attempt=2)
+    assert 0 <= delay <= 8.0
+
+
+def test_adapter_retries_after_retry_after(stub_server):
+    clock = FakeClock()
+    calls = []
+
+    def route(request):
+        calls.append(request)
+        if len(calls) == 1:
+            return 429, {"Retry-After": "2"}, {"message": "slow down"}
+        return 200, {"X-RateLimit-Remaining": "4000"}, REPO
+
+    stub_server.route("GET", "/repos/octocat/repo", route)
+    scheduler = RateLimitScheduler(clock=clock, sleep=clock.sleep)
+    gh = get_github_client("ghp_test", base_url=stub_server.url, rate_limit=scheduler)
+
+    assert gh.get_repo("octocat/repo").full_name == "octocat/repo"
+    assert len(calls) == 2
+    assert clock.sleeps == [2.0]
+    assert scheduler.remaining == 4000
+
+
+def test_adapter_keeps_retrying_server_errors(stub_server):
+    calls = []
+
+    def route(request):
+        calls.append(request)
+        return (502, {}, {"message": "Bad Gateway"}) if len(calls) == 1 else (200, {}, REPO)
+
+    stub_server.route("GET", "/repos/octocat/repo", route)
+    gh = get_github_client("ghp_test", base_url=stub_server.url, rate_limit=RateLimitScheduler())
+
+    assert gh.get_repo("octocat/repo").full_name == "octocat/repo"
+    assert len(calls) == 2
+
+
+def test_adapter_caps_concurrency(stub_server):
+    lock = threading.Lock()
+    active = {"now": 0, "peak": 0}
+
+    def route(request):
+        with lock:
+            active["now"] += 1
+            active["peak"] = max(active["peak"], active["now"])
+        time.sleep(0.05)
+        with lock:
+            active["now"] -= 1
+        return 200, {}, REPO
+
+    stub_server.route("GET", "/repos/octocat/repo", route)
+    gh = get_github_client(
+        "ghp_test", base_url=stub_server.url, rate_limit=RateLimitScheduler(max_concurrency=2)
+    )
+    threads = [threading.Thread(target=gh.get_repo, args=("octocat/repo",)) for _ in range(6)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert len(stub_server.calls("GET", "/repos/octocat/repo")) == 6
+    assert active["peak"] == 2
@@ -0,0 +1,79 @@
+import json
+import subprocess
+import sys
+import time
+
+import pytest
+
+from actions_tool_kit import actions_core as core
+from actions_tool_kit import resource_sampler
+from actions_tool_kit.resource_sampler import ResourceSampler
+
+pytestmark = pytest.mark.skipif(not resource_sampler.available(), reason="requires /proc")
+
+
+def _burn(seconds):
+    end = time.monotonic() + seconds
+    while time.monotonic() < end:
+        pass
+
+
+def test_samples_are_tagged_with_the_open_group(capsys):
+    sampler = ResourceSampler(children=False)
+    sampler.sample()
+    with core.group("Build"):
+        _burn(0.05)
+        sampler.sample()
+        _burn(0.05)
+        sampler.sample()
+    time.sleep(0.05)
+    sampler.sample()
+    capsys.readouterr()
+
+    stats = {s.name: s for s in sampler.group_stats()}
+    assert list(stats) == ["Build", "(outside groups)"]
+    assert stats["Build"].cpu_peak > stats["(outside groups)"].cpu_peak
+    assert stats["Build"].rss_peak > 0 and stats["Build"].duration > 0.05
+
+
+def test_live_children_are_included():
+    child = subprocess.Popen(
+        [sys.executable, "-c", "import time; b = bytearray(64 << 20); b[::4096] = b'x' * (16 << 10); time.sleep(5)"]
+    )
+    try:
+        time.sleep(0.5)
+        alone = ResourceSampler(children=False)
+        tree = ResourceSampler(rescan_every=1)
+        for sampler in (alone, tree):
+            sampler.sample()
+            sampler.sample()
+        assert child.pid in tree._descendants
+        assert tree.group_stats()[0].rss_peak - alone.group_stats()[0].rss_peak > 48 << 20
+    finally:
+        child.kill()
+        child.wait()
+
+
+def test_background_thread_downsamples(capsys):
+    with ResourceSampler(interval=0.005, max_samples=8, max_overhead=1.0) as sampler:
+        time.sleep(0.3)
+    assert 0 < len(sampler) <= 8
+    assert sampler.interval > 0.005
+
+
+def test_publish_writes_summary_and_json(tmp_path, monkeypatch):
+    summary = tmp_path / "summary.md"
+    monkeypatch.setenv("GITHUB_STEP_SUMMARY", str(summary))
+    monkeypatch.setenv("RUNNER_TEMP", str(tmp_path))
+    sampler = ResourceSampler(children=False)
+    for _ in range(3):
+        sampler.sample()
+
+    path = sampler.publish()
+    report = summary.read_text()
+    data = json.loads(open(path).read())
+
+    assert "| (outside groups) |" in report and "RSS `" in report
+    assert path.startswith(str(tmp_path))
+    assert len(data["series"]["t"]) == 2 and data["groups"] == ["(outside groups)"]
+    assert data["stats"][0]["rss_peak"] == max(data["series"]["rss"])
@@ -0,0 +1,78 @@
+import pickle
+
+import pytest
+
+from actions_tool_kit import actions_core as core
+from actions_tool_kit import runner_env as renv
+from actions_tool_kit.context import Context
+from actions_tool_kit.github_client import get_github_client
+from actions_tool_kit.runner_env import RunnerEnvironment
+
+
+ENVIRON = {
+    "GITHUB_ACTIONS": "true",
+    "CI": "true",
+    "GITHUB_EVENT_NAME": "push",
+    "GITHUB_SHA": "abc123",
+    "GITHUB_REF": "refs/heads/main",
+    "GITHUB_REF_NAME": "main",
+    "GITHUB_HEAD_REF": "",
+    "GITHUB_REPOSITORY": "octocat/hello",
+    "GITHUB_RUN_ID": "1001",
+    "GITHUB_RUN_ATTEMPT": "x",
+    "GITHUB_API_URL": "https://ghe.example.com/api/v3",
+    "RUNNER_OS": "Linux",
+    "RUNNER_TEMP": "/tmp/runner",
+    "ACTIONS_ID_TOKEN_REQUEST_TOKEN": "secret-token",
+    "HOME": "/home/runner",
+}
+
+
+def test_snapshot_parses_typed_fields():
+    env = RunnerEnvironment.from_environ(ENVIRON)
+    assert env.is_actions and env.ci and not env.debug
+    assert (env.event_name, env.sha, env.ref_name, env.repository) == ("push", "abc123", "main", "octocat/hello")
+    assert env.head_ref is None
+    assert (env.run_id, env.run_attempt, env.run_number) == (1001, 0, 0)
+    assert env.api_url == "https://ghe.example.com/api/v3"
+    assert env.server_url == "https://github.com"
+    assert (env.runner_os, env.temp) == ("Linux", "/tmp/runner")
+    assert env.get("ACTIONS_ID_TOKEN_REQUEST_TOKEN") == "secret-token"
+    assert env.get("HOME") is None
+    assert "secret-token" not in repr(env)
+
+
+def test_snapshot_pickles_only_captured_variables():
+    env = RunnerEnvironment.from_environ(ENVIRON)
+    data = pickle.dumps(env)
+    assert b"/home/runner" not in data
+    restored = pickle.loads(data)
+    assert restored == env and dict(restored.variables) == dict(env.variables)
+
+
+def test_snapshot_with_explicit_fields_round_trips():
+    env = RunnerEnvironment(repository="octocat/hello", run_id=7, variables={"GITHUB_SHA": "abc"})
+    restored = pickle.loads(pickle.dumps(env))
+    assert restored == env and restored.get("GITHUB_SHA") == "abc"
+    with pytest.raises(TypeError):
+        env.variables["GITHUB_SHA"] = "def"  # type: ignore[index]
+
+
+def test_refresh_and_consumers_read_the_snapshot(monkeypatch):
+    monkeypatch.setattr(renv, "_current", None)
+    monkeypatch.setenv("GITHUB_API_URL", "https://ghe.example.com/api/v3")
+    first = renv.runner_env()
+    assert renv.runner_env() is first
+
+    monkeypatch.setenv("GITHUB_API_URL", "https://other.example.com/api/v3")
+    assert renv.runner_env().api_url == "https://ghe.example.com/api/v3"
+    assert renv.refresh_runner_env().api_url == "https://other.example.com/api/v3"
+
+    gh = get_github_client("ghp_test")
+    assert gh.requester.base_url == "https://other.example.com/api/v3"
+
+    env = RunnerEnvironment.from_environ({**ENVIRON, "GITHUB_REPOSITORY": "octocat/snap"})
+    ctx = Context(env)
+    assert ctx.env is env and ctx.repo.repo == "snap" and ctx.run_id == 1001
+    assert core._read_debug_flag(env) is False
+    assert core._read_debug_flag(RunnerEnvironment.from_environ({"RUNNER_DEBUG": "1", "GITHUB_ACTIONS": "true"}))
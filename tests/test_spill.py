@@ -0,0 +1,71 @@
+import gzip
+import json
+
+import pytest
+
+from actions_tool_kit import actions_core as core
+from actions_tool_kit import spill as sp
+
+
+@pytest.fixture
+def runner_files(tmp_path, monkeypatch):
+    monkeypatch.setenv("RUNNER_TEMP", str(tmp_path / "temp"))
+    monkeypatch.setenv("GITHUB_OUTPUT", str(tmp_path / "output"))
+    monkeypatch.setenv("GITHUB_STEP_SUMMARY", str(tmp_path / "summary"))
+    yield tmp_path
+    sp.uninstall_spill()
+
+
+def _outputs(tmp_path):
+    lines = (tmp_path / "output").read_text(encoding="utf-8").splitlines()
+    return dict(line.split("=", 1) for line in lines)
+
+
+@pytest.mark.parametrize("compress", [False, True])
+def test_large_outputs_become_pointer_records(runner_files, compress):
+    sp.install_spill(output_threshold=100, compress=compress)
+    big = "é" * 60  # 120 bytes in UTF-8
+    core.set_output("small", "x" * 100)
+    core.set_output("big", big)
+
+    outputs = _outputs(runner_files)
+    assert outputs["small"] == "x" * 100
+    record = json.loads(outputs["big"])
+    assert record["spill"] == 1 and record["size"] == 120 and record["compression"] == ("gzip" if compress else "none")
+    assert record["path"].startswith(str(runner_files / "temp" / "spill"))
+    raw = open(record["path"], "rb").read()
+    assert (gzip.decompress(raw) if compress else raw) == big.encode()
+    assert sp.resolve_output(outputs["big"]) == big
+    assert sp.resolve_output(outputs["small"]) == "x" * 100
+
+
+def test_tampered_or_missing_files_are_rejected(runner_files):
+    record = sp.spill("hello world")
+    with open(record.path, "wb") as f:
+        f.write(b"hello there")
+    with pytest.raises(ValueError):
+        sp.resolve_output(record.to_json())
+    assert sp.resolve_output(record.to_json(), verify=False) == "hello there"
+
+    missing = sp.SpillRecord(str(runner_files / "gone"), 1, "00")
+    with pytest.raises(FileNotFoundError):
+        sp.resolve_output(missing.to_json())
+
+
+def test_spill_output_streams_chunks(runner_files):
+    chunks = (f"line {i}\n" for i in range(1000))
+    record = sp.spill_output("log", chunks, compress=True)
+    assert _outputs(runner_files)["log"] == record.to_json()
+    assert b"".join(sp.iter_spilled(record)) == "".join(f"line {i}\n" for i in range(1000)).encode()
+    assert sp.spill(b"".join(sp.iter_spilled(record))).sha256 == record.sha256
+
+
+def test_summary_spills_past_the_step_limit(runner_files):
+    sp.install_spill(summary_threshold=1000)
+    core.append_summary("a" * 600)
+    core.append_summary("b" * 600)
+
+    summary = (runner_files / "summary").read_text(encoding="utf-8")
+    assert summary.startswith("a" * 600) and "b" * 600 not in summary
+    record = summary.split("<!-- ", 1)[1].split(" -->", 1)[0]
+    assert sp.resolve_output(record) == "b" * 600
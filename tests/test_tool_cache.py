@@ -0,0 +1,186 @@
+import io
+import os
+import stat
+import tarfile
+import zipfile
+
+import pytest
+from actions_tool_kit import tool_cache
+from actions_tool_kit.tool_cache import (
+    cache_dir,
+    download_tool,
+    evaluate_versions,
+    extract_tar,
+    extract_zip,
+    find,
+    find_all_versions,
+    satisfies,
+)
+
+
+@pytest.fixture(autouse=True)
+def runner_dirs(tmp_path, monkeypatch):
+    monkeypatch.setenv("RUNNER_TOOL_CACHE", str(tmp_path / "toolcache"))
+    monkeypatch.setenv("RUNNER_TEMP", str(tmp_path / "temp"))
+    monkeypatch.setenv("RUNNER_ARCH", "X64")
+    monkeypatch.setattr(tool_cache, "_index_cache", {})
+
+
+def test_version_ranges():
+    versions = ["18.19.0", "20.10.0", "20.11.1", "21.0.0-rc.1", "22.1.0"]
+    assert evaluate_versions(versions, "20.x") == "20.11.1"
+    assert evaluate_versions(versions, "^20.10") == "20.11.1"
+    assert evaluate_versions(versions, "~20.10.0") == "20.10.0"
+    assert evaluate_versions(versions, ">=18 <21 || 22") == "22.1.0"
+    assert evaluate_versions(versions, "*") == "22.1.0"
+    assert evaluate_versions(versions, "19") is None
+    assert satisfies("21.0.0-rc.1", "21.0.0-rc.1")
+    assert not satisfies("21.0.0-rc.1", ">=20")
+    assert satisfies("0.2.5", "^0.2.1") and not satisfies("0.3.0", "^0.2.1")
+    assert satisfies("1.2.7", "=1.2") and not satisfies("1.5.0", "=1.2")
+    assert satisfies("1.2.0", "=1.2.0") and not satisfies("1.2.1", "=1.2.0")
+
+
+def _tool_tree(base, version):
+    (base / "bin").mkdir(parents=True)
+    (base / "bin" / "tool").write_text("#!/bin/sh\necho shared\n")
+    os.chmod(base / "bin" / "tool", 0o755)
+    (base / "VERSION").write_text(version)
+    os.symlink("bin/tool", base / "tool")
+    return str(base)
+
+
+def test_cache_dir_find_and_hardlink_dedupe(tmp_path):
+    first = cache_dir(_tool_tree(tmp_path / "a", "1.2.0"), "mytool", "v1.2.0")
+    second = cache_dir(_tool_tree(tmp_path / "b", "1.3.0"), "mytool", "1.3.0")
+
+    assert find("mytool", "1.x") == second
+    assert find("mytool", "~1.2") == first
+    assert find("mytool", "2.x") is None
+    assert find("mytool", "1.x", arch="arm64") is None
+    assert find_all_versions("mytool") == ["1.3.0", "1.2.0"]
+
+    # Identical files share an inode; differing ones do not.
+    shared = [os.stat(os.path.join(d, "bin", "tool")) for d in (first, second)]
+    assert shared[0].st_ino == shared[1].st_ino and shared[0].st_mode & 0o111
+    assert os.stat(os.path.join(first, "VERSION")).st_ino != os.stat(os.path.join(second, "VERSION")).st_ino
+    assert os.readlink(os.path.join(second, "tool")) == "bin/tool"
+
+    # The index is consulted instead of scanning; removing the marker is detected.
+    os.remove(second + ".complete")
+    assert find("mytool", "1.x") == first
+
+
+def test_index_sees_architectures_added_to_a_cached_version(tmp_path):
+    cache_dir(_tool_tree(tmp_path / "a", "1.2.0"), "mytool", "1.2.0")
+    assert find("mytool", "1.x", arch="arm64") is None
+
+    # Another implementation adds an architecture; the tool directory's mtime is unchanged.
+    version_dir = os.path.join(os.environ["RUNNER_TOOL_CACHE"], "mytool", "1.2.0")
+    os.mkdir(os.path.join(version_dir, "arm64"))
+    open(os.path.join(version_dir, "arm64.complete"), "w").close()
+    assert find("mytool", "1.x", arch="arm64") == os.path.join(version_dir, "arm64")
+
+    tool_cache._index_cache.clear()  # a new process reads the saved index
+    assert find_all_versions("mytool", arch="arm64") == ["1.2.0"]
+
+
+def _tar(path, members):
+    with tarfile.open(path, "w:gz") as tar:
+        for name, data in members:
+            info = tarfile.TarInfo(name)
+            info.size = len(data)
+            info.mode = 0o755
+            tar.addfile(info, io.BytesIO(data))
+
+
+def test_extract_tar_and_zip(tmp_path):
+    big = os.urandom(200_000)
+    _tar(tmp_path / "t.tgz", [("node-v20/bin/node", big), ("node-v20/README", b"hi")])
+    out = extract_tar(str(tmp_path / "t.tgz"), strip_components=1)
+    assert open(os.path.join(out, "bin", "node"), "rb").read() == big
+    assert os.stat(os.path.join(out, "bin", "node")).st_mode & 0o777 == 0o755
+    assert out.startswith(str(tmp_path / "temp"))
+
+    with zipfile.ZipFile(tmp_path / "t.zip", "w", zipfile.ZIP_DEFLATED) as zf:
+        for i in range(20):
+            zf.writestr(f"pkg/file{i}.txt", f"content {i}" * 100)
+    out = extract_zip(str(tmp_path / "t.zip"), str(tmp_path / "z"), workers=4)
+    assert sorted(os.listdir(os.path.join(out, "pkg"))) == sorted(f"file{i}.txt" for i in range(20))
+    assert open(os.path.join(out, "pkg", "file7.txt")).read() == "content 7" * 100
+
+
+def test_extract_rejects_unsafe_paths(tmp_path):
+    _tar(tmp_path / "evil.tgz", [("../escape", b"x")])
+    with pytest.raises(ValueError, match="unsafe path"):
+        extract_tar(str(tmp_path / "evil.tgz"), str(tmp_path / "out"))
+    assert not (tmp_path / "escape").exists()
+
+
+def _chained_links(tmp_path):
+    # Each link stays inside lexically, but d/l/up resolves to the parent of the destination.
+    with tarfile.open(tmp_path / "links.tar", "w") as tar:
+        for name, link in [("d/l", ".."), ("d/l/up", "..")]:
+            info = tarfile.TarInfo(name)
+            info.type, info.linkname = tarfile.SYMTYPE, link
+            tar.addfile(info)
+        info = tarfile.TarInfo("d/l/up/escaped.txt")
+        info.size = 1
+        tar.addfile(info, io.BytesIO(b"x"))
+
+    with zipfile.ZipFile(tmp_path / "links.zip", "w") as zf:
+        for name, link in [("d/l", ".."), ("d/l/up", "..")]:
+            info = zipfile.ZipInfo(name)
+            info.external_attr = (stat.S_IFLNK | 0o777) << 16
+            zf.writestr(info, link)
+        zf.writestr("d/l/up/escaped.txt", "x")
+
+
+def test_extract_never_writes_through_chained_symlinks(tmp_path):
+    _chained_links(tmp_path)
+    for extract, archive in [(extract_tar, "links.tar"), (extract_zip, "links.zip")]:
+        dest = tmp_path / "out" / archive
+        with pytest.raises(ValueError):
+            extract(str(tmp_path / archive), str(dest))
+        assert not (tmp_path / "out" / "escaped.txt").exists()
+        assert not (tmp_path / "escaped.txt").exists()
+
+    # Links already in the destination are not followed out of it either.
+    dest = tmp_path / "existing"
+    dest.mkdir()
+    os.symlink(str(tmp_path), dest / "d")
+    with pytest.raises(ValueError, match="through a symlink"):
+        extract_tar(str(tmp_path / "links.tar"), str(dest))
+
+
+def _serve_ranges(data):
+    def handler(request):
+        range_header = request.headers.get("Range")
+        if not range_header:
+            return 200, {}, data
+        start, end = (int(x) for x in range_header.split("=")[1].split("-"))
+        end = min(end, len(data) - 1)
+        return 206, {"Content-Range": f"bytes {start}-{end}/{len(data)}"}, data[start : end + 1]
+
+    return handler
+
+
+def test_download_tool_uses_parallel_ranges(stub_server, tmp_path):
+    data = os.urandom(50_000)
+    stub_server.route("GET", "/tool.tgz", _serve_ranges(data))
+    path = download_tool(f"{stub_server.url}/tool.tgz", part_size=10_000, workers=3)
+
+    assert open(path, "rb").read() == data
+    ranges = sorted(r.headers["Range"] for r in stub_server.calls("GET", "/tool.tgz"))
+    assert len(ranges) == 4 and "bytes=0-9999" in ranges
+
+
+def test_download_tool_keeps_auth_across_same_host_redirects(stub_server):
+    data = os.urandom(30_000)
+    stub_server.route("GET", "/latest", lambda r: (302, {"Location": f"{stub_server.url}/tool.tgz"}, b""))
+    stub_server.route("GET", "/tool.tgz", _serve_ranges(data))
+    path = download_tool(f"{stub_server.url}/latest", auth="token ghp_test", part_size=10_000, workers=2)
+
+    assert open(path, "rb").read() == data
+    calls = stub_server.calls("GET", "/tool.tgz")
+    assert len(calls) == 3 and all(r.headers.get("Authorization") == "token ghp_test" for r in calls)
@@ -0,0 +1,38 @@
+import pickle
+
+import pytest
+
+from actions_tool_kit.coalesce import CoalescingAdapter, RequestMemo
+from actions_tool_kit.github_client import get_github_client
+
+REPO = {"name": "repo", "full_name": "octocat/repo", "url": "/repos/octocat/repo"}
+
+
+def test_adapters_survive_new_connections(stub_server):
+    stub_server.route("GET", "/repos/octocat/repo", lambda r: (200, {}, REPO))
+    memo = RequestMemo()
+    gh = get_github_client("ghp_test", base_url=stub_server.url, memoize=memo)
+
+    gh.get_repo("octocat/repo")
+    gh.close()
+    gh.get_repo("octocat/repo")
+    assert memo.hits == 1
+    assert len(stub_server.calls("GET", "/repos/octocat/repo")) == 1
+
+    connection = gh.requester._Requester__createConnection()
+    adapter = connection.session.get_adapter(stub_server.url)
+    assert isinstance(adapter, CoalescingAdapter)
+    assert not isinstance(adapter.inner, CoalescingAdapter)
+
+
+def test_unpickled_client_fails_loudly(stub_server):
+    gh = get_github_client("ghp_test", base_url=stub_server.url, memoize=RequestMemo())
+    clone = pickle.loads(pickle.dumps(gh))
+    with pytest.raises(RuntimeError, match="pickling"):
+        clone.get_repo("octocat/repo")
+
+
+def test_plain_client_still_pickles(stub_server):
+    stub_server.route("GET", "/repos/octocat/repo", lambda r: (200, {}, REPO))
+    gh = pickle.loads(pickle.dumps(get_github_client("ghp_test", base_url=stub_server.url)))
+    assert gh.get_repo("octocat/repo").full_name == "octocat/repo"